@@ -1,13 +1,38 @@
 # VERSION: 4.0 (Dec 28, 2025) - Fixes Priorities (Raises > NT) and Negative Constraints (<3 Hearts)
 import os
 import re
-from ruamel.yaml import YAML
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from time import perf_counter, monotonic
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+from bid_codec import decode_auction
+from system_compiler import load_tree
+from auction_trie import AuctionTrie, BidPriority, UNRANKED
+from bridge_model import node_fingerprint
 
 class BidResult:
+    """Immutable result of one find_bid call (safe to share between threads)."""
+    __slots__ = ("bid", "explanation", "alert")
+
     def __init__(self, bid, explanation=None, alert=None):
-        self.bid = bid
-        self.explanation = explanation
-        self.alert = alert
+        object.__setattr__(self, "bid", bid)
+        object.__setattr__(self, "explanation", explanation)
+        object.__setattr__(self, "alert", alert)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("BidResult is immutable")
+
+    def __reduce__(self):
+        return (BidResult, (self.bid, self.explanation, self.alert))
+
+    def __eq__(self, other):
+        if not isinstance(other, BidResult): return NotImplemented
+        return (self.bid, self.explanation, self.alert) == (other.bid, other.explanation, other.alert)
+
+    def __hash__(self): return hash((self.bid, self.explanation, self.alert))
+    def __repr__(self): return f"BidResult({self.bid!r}, {self.explanation!r}, {self.alert!r})"
     def __str__(self): return self.bid
 
 class BridgeHand:
@@ -36,58 +61,137 @@ class BridgeHand:
     def length_of(self, suit): return self.distribution.get(suit, 0)
 
 class BiddingEngine:
-    def __init__(self, system_path):
-        self.yaml = YAML()
-        with open(system_path, 'r', encoding='utf-8') as f:
-            self.system = self.yaml.load(f)
+    def __init__(self, system_path, stats=None, watch=False, poll_interval=1.0):
+        # Compiled artifact (systems/compiled/); the YAML is only re-parsed when it has changed
+        self.system_path = system_path
+        compiled = load_tree(system_path)
+        self.system = compiled["system"]
+        self.index = compiled["index"]   # auction codes (passes stripped) -> candidate nodes
+        # Bid priority ("Bid_Priority" in the system file) is ranked into each trie node up front
+        self.priority = BidPriority.from_system(self.system)
+        self.trie = AuctionTrie(self.index, self.priority)
+        # Optional RuleStats (src/rule_stats.py); None keeps find_bid uninstrumented
+        self.stats = stats
+        self.system_name = os.path.splitext(os.path.basename(system_path))[0]
+
+        # Hot reload: when watching, find_bid stats the file at most once per poll_interval
+        self.watch = watch
+        self.poll_interval = poll_interval
+        self._stamp = self._file_stamp()
+        self._next_check = monotonic() + poll_interval
+        self._fingerprints = {key: node_fingerprint(c) for key, c in self.index.items()} if watch else None
+        self._reload_lock = threading.Lock()
+
+    def _file_stamp(self):
+        try:
+            st = os.stat(self.system_path)
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def reload_if_changed(self):
+        """
+        Reloads the system file if it changed on disk. Auction nodes whose candidates are unchanged
+        keep their existing objects; the new index is swapped in as one reference.
+        Returns the set of changed auction keys.
+        """
+        self._next_check = monotonic() + self.poll_interval
+        stamp = self._file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return set()
+        try:
+            compiled = load_tree(self.system_path)
+        except Exception as e:
+            print(f"⚠️ Reload failed, keeping previous system: {e}")
+            return set()
+
+        old_index = self.index
+        old_prints = self._fingerprints or {key: node_fingerprint(c) for key, c in old_index.items()}
+        new_index, new_prints = {}, {}
+        for key, candidates in compiled["index"].items():
+            new_prints[key] = node_fingerprint(candidates)
+            new_index[key] = old_index[key] if old_prints.get(key) == new_prints[key] else candidates
+
+        changed = {k for k in set(old_prints) | set(new_prints) if old_prints.get(k) != new_prints.get(k)}
+        self.system = compiled["system"]
+        self.index = new_index
+        self.priority = BidPriority.from_system(self.system)
+        self.trie = AuctionTrie(new_index, self.priority, previous=self.trie)
+        self._fingerprints = new_prints
+        self._stamp = stamp
+        return changed
 
     def find_bid(self, hand, auction):
-        if not auction: candidates = self.system.get("Dealer", [])
-        else:
-            full_key = " - ".join([b for b in auction if b != "Pass"]) or "Dealer"
-            candidates = self.system.get(full_key, [])
-            if not candidates and auction:
-                candidates = self.system.get(auction[-1], [])
-
-        valid_bids = []
-        for node in candidates:
-            fit, alert = self._does_hand_fit(hand, node.get('constraints', {}))
+        """
+        Side-effect free: the loaded system is never written to, so one engine can serve many threads.
+        """
+        if self.watch and monotonic() >= self._next_check:
+            # Only one thread reloads; the others carry on with the current snapshot
+            if self._reload_lock.acquire(blocking=False):
+                try:
+                    self.reload_if_changed()
+                finally:
+                    self._reload_lock.release()
+
+        position = self.trie.lookup(auction)  # One snapshot for the whole call
+        return self._bid_from_node(hand, position)
+
+    def cursor(self):
+        """A cursor at the start of the auction; advance it with cursor.advance(bid)."""
+        return self.trie.cursor()
+
+    def find_bid_at(self, hand, cursor):
+        """Like find_bid, but for a position already reached with an AuctionCursor."""
+        return self._bid_from_node(hand, cursor.node)
+
+    def _bid_from_node(self, hand, position):
+        candidates, ranks, minors = position.candidates, position.ranks, position.minors
+        best = None
+        minor_fits = {}  # 'C'/'D' -> index of the fitting 1C/1D opening
+        alerts = {}      # candidate index -> teaching alert, kept per call instead of on the shared node
+        stats = self.stats
+        for i, node in enumerate(candidates):
+            if stats is None:
+                fit, alert = self._does_hand_fit(hand, node.get('constraints', {}))
+            else:
+                start = perf_counter()
+                fit, alert = self._does_hand_fit(hand, node.get('constraints', {}))
+                stats.record(self.system_name, decode_auction(position.path or ()), node.get('bid'), fit, perf_counter() - start)
             if fit:
-                node['_temp_alert'] = alert
-                valid_bids.append(node)
-
-        if not valid_bids: return BidResult("Pass", "No suitable bid.")
-        
-        best = self._pick_best_node(hand, valid_bids)
-        return BidResult(best['bid'], best.get('explanation'), best.get('_temp_alert'))
-
-    def _pick_best_node(self, hand, nodes):
-        choices = {n['bid']: n for n in nodes}
-        bids = list(choices.keys())
-
-        # 1. SPECIAL CONVENTIONS
-        if "3C" in bids and "Second Negative" in choices["3C"].get("convention",""): return choices["3C"]
-        if "2NT" in bids and "Jacoby" in choices["2NT"].get("convention",""): return choices["2NT"]
-
-        # 2. RAISES (SUPPORT) > NT
-        # If we can raise partner (2H/3H/4H/2S/3S/4S), do that before 1NT
-        for raise_bid in ["2H", "3H", "4H", "2S", "3S", "4S"]:
-            if raise_bid in bids: return choices[raise_bid]
-
-        # 3. NATURAL SUITS > NT
-        if "1S" in bids: return choices["1S"]
-        if "1H" in bids: return choices["1H"]
-        
-        # 4. NT IS LAST RESORT FOR MAJORS
-        if "1NT" in bids: return choices["1NT"]
-
-        # 5. MINORS
-        if "1C" in bids and "1D" in bids:
-            if hand.length_of('D') >= 4 and hand.length_of('C') >= 4: return choices["1D"]
-            if hand.length_of('D') == 3 and hand.length_of('C') == 3: return choices["1C"]
-            return choices["1D"] if hand.length_of('D') > hand.length_of('C') else choices["1C"]
-            
-        return nodes[0]
+                alerts[i] = alert
+                if best is None or ranks[i] < ranks[best]: best = i
+                if minors[i]: minor_fits[minors[i]] = i
+
+        if best is None: return BidResult("Pass", "No suitable bid.")
+
+        # Nothing from the priority list fits: choose between 1C and 1D by the hand
+        if ranks[best][0] == UNRANKED and len(minor_fits) == 2:
+            best = self._better_minor(hand, minor_fits)
+
+        node = candidates[best]
+        return BidResult(node['bid'], node.get('explanation'), alerts[best])
+
+    def find_bids_concurrent(self, requests, max_workers=None, use_processes=False, chunksize=64):
+        """
+        Bids a batch of (hand, auction) pairs and returns the BidResults in the same order.
+        Threads share this engine; processes each load their own copy from the compiled artifact
+        (worth it for large batches, since find_bid is CPU bound).
+        """
+        requests = list(requests)
+        if use_processes:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(self.system_path,)) as pool:
+                return list(pool.map(_worker_find_bid, requests, chunksize=chunksize))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(lambda req: self.find_bid(req[0], req[1]), requests))
+
+    def _better_minor(self, hand, minor_fits):
+        # The one hand-dependent step of the priority: 4-4 opens 1D, 3-3 opens 1C, else the longer
+        clubs, diamonds = hand.length_of('C'), hand.length_of('D')
+        if diamonds >= 4 and clubs >= 4: return minor_fits['D']
+        if diamonds == 3 and clubs == 3: return minor_fits['C']
+        return minor_fits['D'] if diamonds > clubs else minor_fits['C']
 
     def _does_hand_fit(self, hand, constraints):
         min_hcp = constraints.get('min_hcp', 0)
@@ -118,4 +222,15 @@ class BiddingEngine:
         if "Balanced" in shape_req and not hand.is_balanced: return False, None
         if "No 5-card Major" in shape_req and (hand.length_of('H')>=5 or hand.length_of('S')>=5): return False, None
 
-        return True, alert
\ No newline at end of file
+        return True, alert
+
+# --- PROCESS POOL WORKERS (module level so they can be pickled) ---
+_WORKER_ENGINE = None
+
+def _init_worker(system_path):
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = BiddingEngine(system_path)
+
+def _worker_find_bid(request):
+    hand, auction = request
+    return _WORKER_ENGINE.find_bid(hand, auction)
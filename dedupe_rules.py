@@ -6,7 +6,7 @@ from pathlib import Path
 current_dir = Path(__file__).resolve().parent
 sys.path.append(str(current_dir / "src"))
 
-from bridge_model import load_rules, save_rules
+from bridge_model import load_rules, save_rules, rule_signature
 
 # --- SETUP LOGGING ---
 # format='%(message)s' keeps it clean (no timestamps needed for this utility)
@@ -30,14 +30,9 @@ def scan_and_fix_duplicates():
     duplicates_found = 0
     
     for r in rules:
-        # 1. Create Unique Signature
-        # Tuple allows it to be a dict key. 
-        # We normalize case for Bid to catch '2d' vs '2D' duplicates.
-        auction_sig = tuple(r.get('auction', []))
-        sys_sig = r.get('system', 'ALL')
-        bid_sig = str(r.get('bid', '')).strip().upper()
-        
-        signature = (sys_sig, auction_sig, bid_sig)
+        # 1. Create Unique Signature (system, auction, BID) - see bridge_model.rule_signature
+        signature = rule_signature(r)
+        sys_sig, auction_sig, bid_sig = signature
         
         # 2. Check for collision
         if signature in unique_map:
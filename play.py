@@ -41,7 +41,11 @@ def main():
         auction_input = input("Enter previous bids (e.g. 'Pass 1C') [Enter for None]: ").strip()
         auction_history = auction_input.split() if auction_input else []
         
-        result = engine.find_bid(hand, auction_history)
+        try:
+            result = engine.find_bid(hand, auction_history)
+        except ValueError as e:
+            print(f"❌ {e}")
+            continue
         
         print(f"\n🤖 BOT RECOMMENDS: {result.bid}")
         if result.alert:
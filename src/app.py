@@ -1,15 +1,20 @@
+import sys
 import streamlit as st
-from ruamel.yaml import YAML
 import pandas as pd
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent))
+from system_compiler import load_rule_index
+from rule_search import load_search_index
+from bid_codec import try_encode_bid, is_contract
+
 # --- Configuration ---
 st.set_page_config(page_title="BridgeMaster AI", layout="wide")
 
 # --- Helper Functions ---
 def load_all_rules():
     """
-    Loads ALL rules from the flat YAML database.
+    Loads ALL rules from the flat YAML database (via the compiled artifacts).
     """
     rules_path = Path("systems/flat_rules.yaml")
     
@@ -17,26 +22,25 @@ def load_all_rules():
         st.error(f"⚠️ Rules file not found at: {rules_path}")
         return pd.DataFrame()
 
-    yaml = YAML(typ='safe') 
-    with open(rules_path, "r", encoding="utf-8") as f:
-        data = yaml.load(f)
+    index = load_rule_index(rules_path)
     
-    if not data:
+    if not len(index):
         return pd.DataFrame()
 
     # Flatten logic
     rows = []
-    for rule in data:
+    for rule in index:
+        c = rule.constraints
         row = {
-            "System": rule.get("system"),
-            "Auction": " - ".join(rule.get("auction", [])),
-            "Bid": rule.get("bid"),
-            "Min HCP": rule["constraints"].get("min_hcp"),
-            "Max HCP": rule["constraints"].get("max_hcp"),
-            "Shape": rule["constraints"].get("shape_requirements"),
-            "Nuance (Teaching)": rule["constraints"].get("explanation"),
-            "Deep Dive": rule["constraints"].get("nuance"),
-            "Source": rule["constraints"].get("source")
+            "System": rule.system,
+            "Auction": " - ".join(rule.auction_bids),
+            "Bid": rule.bid,
+            "Min HCP": c.min_hcp,
+            "Max HCP": c.max_hcp,
+            "Shape": c.shape_requirements,
+            "Nuance (Teaching)": c.explanation,
+            "Deep Dive": c.nuance,
+            "Source": c.source
         }
         rows.append(row)
 
@@ -88,6 +92,29 @@ with tab1:
 # --- TAB 2: The System Map ---
 with tab2:
     if not current_df.empty:
+        # Search runs on the prebuilt indexes (src/rule_search.py), not by scanning the table
+        search_col, convention_col = st.columns([3, 1])
+        search_index = load_search_index(Path("systems/flat_rules.yaml"))
+        with search_col:
+            query = st.text_input("Search", placeholder="Words from the teaching notes, a bid (2D), or a prefix (dust*)",
+                                  label_visibility="collapsed")
+        with convention_col:
+            convention = st.selectbox("Convention", ["(any convention)"] + list(search_index.conventions()),
+                                      label_visibility="collapsed")
+
+        if query.strip() or convention != "(any convention)":
+            words = query.split()
+            bids = [w for w in words if try_encode_bid(w) is not None and is_contract(try_encode_bid(w))]
+            text = " ".join(w for w in words if w not in bids)
+            hits = search_index.search(
+                text,
+                system=selected_system,
+                bid=bids[0] if bids else None,
+                convention=None if convention == "(any convention)" else convention
+            )
+            keys = {(" - ".join(row["auction"]), row["bid"]) for row in search_index.rules(hits)}
+            current_df = current_df[[(a, b) in keys for a, b in zip(current_df["Auction"], current_df["Bid"])]]
+
         st.dataframe(
             current_df,
             use_container_width=True,
@@ -0,0 +1,168 @@
+import sys
+import time
+import random
+import logging
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from rule_store import get_store
+from bid_codec import PASS, decode_bid, decode_auction, is_legal_call, is_complete
+from hand_factory import deal_hands, analyze_hand, load_flat_engine
+
+check_hand_compliance = load_flat_engine().check_hand_compliance
+
+logger = logging.getLogger("SIMULATOR")
+
+SEATS = ['N', 'E', 'S', 'W']
+MAX_CALLS = 64  # Safety stop; a real auction can't get near this with sufficient bids
+
+# --- DECISION CACHE ---
+# A seat's call depends only on its rule context and the parts of the hand the flat engine
+# reads (total HCP and suit lengths). Across a batch most deals share their first few calls,
+# so each (system, context) node keeps {hand key: rule} and the rule loop runs once per key.
+
+def hand_key(hand_stats):
+    suits = hand_stats['suits']
+    return (hand_stats.get('total_hcp', hand_stats.get('hcp', 0)),
+            suits['S']['count'], suits['H']['count'], suits['D']['count'], suits['C']['count'])
+
+class AuctionSimulator:
+    """
+    Bids whole deals, all four seats, with the flat rules (src/bridge_engine.py).
+
+    The flat rules only describe uncontested auctions, so the side that opens owns the auction:
+    its seats bid from the rules for their own sequence (passes stripped), and the other side passes.
+    A call the rules suggest that would be insufficient at the table is replaced by a pass.
+    """
+
+    def __init__(self, rules_file_path, stats=None, auto_reload=False):
+        # Shared with every other consumer in this process (see rule_store)
+        self.store = get_store(rules_file_path, auto_reload=auto_reload)
+        self.stats = stats  # Optional RuleStats; decisions served from the cache are not recorded
+        self._cache = {}    # (system, context codes) -> {hand key: Rule or None}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.store.reloader:
+            self.store.reloader.add_listener(self._on_reload)
+
+    def _on_reload(self, changed_keys):
+        # Drop only the contexts whose rules changed; an 'ALL' change touches every system
+        with self._lock:
+            for system, auction in changed_keys:
+                if system == 'ALL':
+                    for key in [k for k in self._cache if k[1] == auction]:
+                        del self._cache[key]
+                else:
+                    self._cache.pop((system, auction), None)
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+    def _decide(self, rules, system, context, hand_stats):
+        node = self._cache.get((system, context))
+        if node is None:
+            with self._lock:
+                node = self._cache.setdefault((system, context), {})
+        key = hand_key(hand_stats)
+        if key in node:
+            with self._lock:
+                self.hits += 1
+            return node[key]
+
+        with self._lock:
+            self.misses += 1
+        found = None
+        stats = self.stats
+        for rule in rules.candidates(system, context):
+            if stats is None:
+                matched = check_hand_compliance(hand_stats, rule.constraints)
+            else:
+                start = time.perf_counter()
+                matched = check_hand_compliance(hand_stats, rule.constraints)
+                stats.record(rule.system, decode_auction(context), rule.bid, matched, time.perf_counter() - start)
+            if matched:
+                found = rule
+                break
+        node[key] = found
+        return found
+
+    def simulate(self, hands, target_system="SAYC_2/1_GF", dealer="N", rules=None):
+        """
+        Bids one deal to completion (three passes after a bid, or four passes).
+        `hands` maps 'N'/'E'/'S'/'W' to hand stats (see hand_factory.analyze_hand).
+        Returns {'dealer', 'auction', 'calls': [{'seat', 'bid', 'explanation'}], 'explanations'}.
+        """
+        rules = rules or self.store.view(target_system)
+        first = SEATS.index(dealer)
+        codes = []
+        contexts = ([], [])  # Non-pass calls per partnership (N/S = 0, E/W = 1)
+        owner = None         # Partnership that opened
+        calls, explanations = [], []
+
+        while not is_complete(codes) and len(codes) < MAX_CALLS:
+            seat = SEATS[(first + len(codes)) % 4]
+            side = SEATS.index(seat) % 2
+            rule = None
+            if owner is None or owner == side:
+                rule = self._decide(rules, target_system, tuple(contexts[side]), hands[seat])
+
+            code = rule.bid_code if rule else PASS
+            # bid_code is None for a bid the codec can't encode: it can't be made at the table either
+            if code is None or not is_legal_call(codes, code):
+                logger.debug(f"{seat}: rule bid {rule.bid} is not legal after {decode_auction(codes)}; passing.")
+                rule, code = None, PASS
+
+            codes.append(code)
+            if code != PASS:
+                contexts[side].append(code)
+                if owner is None: owner = side
+
+            explanation = rule.constraints.explanation if rule else ""
+            calls.append({"seat": seat, "bid": decode_bid(code), "explanation": explanation})
+            if rule: explanations.append(f"{seat}: {explanation}")
+
+        return {
+            "dealer": dealer,
+            "auction": decode_auction(codes),
+            "calls": calls,
+            "explanations": explanations
+        }
+
+    def run_batch(self, count, target_system="SAYC_2/1_GF", rotate_dealer=True, seed=None):
+        """
+        Deals and bids `count` random deals, yielding {'hands': ..., plus simulate()'s result}.
+        The rules view is fetched once for the whole batch. `seed` makes the deals repeatable
+        without touching the global random state.
+        """
+        rng = random.Random(seed)
+        rules = self.store.view(target_system)
+        for i in range(count):
+            hands = {seat: analyze_hand(cards) for seat, cards in deal_hands(rng).items()}
+            dealer = SEATS[i % 4] if rotate_dealer else "N"
+            result = self.simulate(hands, target_system, dealer, rules)
+            result["hands"] = hands
+            yield result
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    rules_path = Path(__file__).resolve().parent.parent / "systems" / "flat_rules.yaml"
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    system = sys.argv[2] if len(sys.argv) > 2 else "SAYC"
+
+    sim = AuctionSimulator(rules_path)
+    start = time.perf_counter()
+    contracts = {}
+    for result in sim.run_batch(count, system):
+        bids = [b for b in result["auction"] if b != "Pass"]
+        contract = bids[-1] if bids else "Passed out"
+        contracts[contract] = contracts.get(contract, 0) + 1
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Bid {count} deals ({system}) in {elapsed:.2f}s ({count / elapsed * 60:,.0f} deals/min).")
+    print(f"   Decision cache: {sim.hits} hits, {sim.misses} misses.")
+    for contract, n in sorted(contracts.items(), key=lambda kv: -kv[1])[:10]:
+        print(f"   {contract:>10}: {n}")
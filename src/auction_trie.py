@@ -0,0 +1,194 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from bid_codec import PASS, encode_bid, try_encode_bid, strip_passes
+
+# --- AUCTION TRIE ---
+# The bidding tree, keyed by bid codes. Each edge is one non-pass call (passes don't
+# change the context, as in BiddingEngine); each node holds the candidate list for that
+# auction, worked out once at load time.
+
+def child_lists(node):
+    """Nested candidate lists of a tree node ('Responder', 'Opener_Rebid', ...)."""
+    for value in node.values():
+        if isinstance(value, list) and value and isinstance(value[0], dict) and 'bid' in value[0]:
+            yield value
+
+def build_tree_index(system):
+    """
+    Maps every auction reachable in a bidding tree to its candidate list.
+    Walks the nested "Dealer" tree, then adds any flat "1NT - 2C" style keys.
+    Nodes for the same bid at the same point (e.g. two 2NT variants for different systems)
+    have their nested lists merged in file order.
+    """
+    index = {}
+
+    def walk(path, candidates):
+        index.setdefault(path, []).extend(candidates)
+        by_bid = {}
+        for node in candidates:
+            code = try_encode_bid(node.get('bid'))
+            if code is None or code == PASS:
+                continue
+            for nested in child_lists(node):
+                by_bid.setdefault(code, []).extend(nested)
+        for code, nested in by_bid.items():
+            walk(path + (code,), nested)
+
+    walk((), system.get("Dealer") or [])
+
+    for key, candidates in system.items():
+        if key == "Dealer" or not isinstance(candidates, list):
+            continue
+        codes = tuple(try_encode_bid(b) for b in str(key).split(" - "))
+        if None not in codes:
+            index.setdefault(strip_passes(codes), []).extend(candidates)
+    return index
+
+# --- BID PRIORITY ---
+# When several candidates fit a hand, the engine bids the one with the lowest rank.
+# Ranks are worked out once per trie node from the system's "Bid_Priority" section
+# (or DEFAULT_PRIORITY), so choosing a bid is a single min() over the valid candidates.
+
+DEFAULT_PRIORITY = {
+    "order": [
+        {"bid": "3C", "convention": "Second Negative"},
+        {"bid": "2NT", "convention": "Jacoby"},
+        "2H", "3H", "4H", "2S", "3S", "4S",  # Raises before NT
+        "1S", "1H",                          # Natural suits before NT
+        "1NT",
+    ],
+    "better_minor": True,
+}
+
+UNRANKED = 1 << 16  # Bids not in the order fall back to file order, after every listed bid
+MINOR_CLUB, MINOR_DIAMOND = encode_bid("1C"), encode_bid("1D")
+
+class BidPriority:
+    __slots__ = ("order", "better_minor")
+
+    def __init__(self, spec=None):
+        spec = spec or DEFAULT_PRIORITY
+        order = []
+        for entry in spec.get("order", []):
+            if isinstance(entry, dict):
+                code, convention = encode_bid(entry["bid"]), entry.get("convention")
+            else:
+                code, convention = encode_bid(entry), None
+            order.append((code, convention))
+        self.order = tuple(order)
+        self.better_minor = bool(spec.get("better_minor", False))
+
+    @classmethod
+    def from_system(cls, system):
+        return cls(system.get("Bid_Priority"))
+
+    def __eq__(self, other):
+        if not isinstance(other, BidPriority): return NotImplemented
+        return (self.order, self.better_minor) == (other.order, other.better_minor)
+
+    def __hash__(self): return hash((self.order, self.better_minor))
+
+    def rank(self, node, position):
+        """
+        Sort key for one candidate. Among listed bids a later duplicate wins (as the old
+        bid-keyed cascade did); unlisted bids keep file order.
+        """
+        code = try_encode_bid(node.get('bid'))
+        for rank, (wanted, convention) in enumerate(self.order):
+            if code == wanted and (convention is None or convention in node.get('convention', "")):
+                return (rank, -position)
+        return (UNRANKED, position)
+
+    def minor(self, node):
+        """'C' or 'D' for the 1C/1D openings when the better-minor tie-break is on."""
+        if not self.better_minor:
+            return None
+        return {MINOR_CLUB: 'C', MINOR_DIAMOND: 'D'}.get(try_encode_bid(node.get('bid')))
+
+class TrieNode:
+    __slots__ = ("path", "candidates", "children", "ranks", "minors")
+
+    def __init__(self, path, candidates, priority=None, previous=None):
+        self.path = path              # tuple of bid codes, passes stripped
+        self.candidates = candidates  # candidate nodes from the tree, in file order
+        self.children = {}            # bid code -> TrieNode
+        if previous is not None and previous.candidates is candidates:
+            # Unchanged on reload: the ranks can't have changed either
+            self.ranks, self.minors = previous.ranks, previous.minors
+        else:
+            priority = priority or BidPriority()
+            self.ranks = tuple(priority.rank(node, i) for i, node in enumerate(candidates))
+            self.minors = tuple(priority.minor(node) for node in candidates)
+
+EMPTY_NODE = TrieNode(None, ())
+
+class AuctionTrie:
+    def __init__(self, index, priority=None, previous=None):
+        """
+        `previous` is the trie being replaced on reload; nodes whose candidate list is the
+        same object keep their ranks (unless the priority itself changed).
+        """
+        self.priority = priority or BidPriority()
+        if previous is not None and previous.priority != self.priority:
+            previous = None
+
+        self.root = TrieNode((), index.get((), []), self.priority, previous and previous.root)
+        for path in sorted(index, key=len):
+            if not path:
+                continue
+            parent = self.root
+            for depth, code in enumerate(path):
+                child = parent.children.get(code)
+                if child is None:
+                    sub_path = path[:depth + 1]
+                    old = previous.lookup(sub_path) if previous is not None else None
+                    child = parent.children[code] = TrieNode(sub_path, index.get(sub_path, []), self.priority, old)
+                parent = child
+
+    def lookup(self, auction):
+        """
+        Node for a whole auction (codes or strings). Off-tree auctions, and auctions with a call
+        that isn't one (a typo like 'XX2'), give an empty node, so the engine bids Pass.
+        """
+        node = self.root
+        for bid in auction:
+            code = try_encode_bid(bid)
+            if code is None:
+                return EMPTY_NODE
+            if code == PASS:
+                continue
+            node = node.children.get(code)
+            if node is None:
+                return EMPTY_NODE
+        return node
+
+    def cursor(self):
+        return AuctionCursor(self.root)
+
+class AuctionCursor:
+    """
+    An immutable position in the trie. advance() returns a new cursor, so a simulation can
+    keep one per table and step it one call at a time instead of re-walking from the root.
+    """
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def advance(self, bid):
+        code = try_encode_bid(bid)
+        if code is None:
+            return AuctionCursor(EMPTY_NODE)
+        if code == PASS:
+            return self
+        return AuctionCursor(self.node.children.get(code, EMPTY_NODE))
+
+    @property
+    def candidates(self):
+        return self.node.candidates
+
+    @property
+    def on_tree(self):
+        return self.node is not EMPTY_NODE
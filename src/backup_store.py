@@ -0,0 +1,153 @@
+import os
+import re
+import json
+import time
+import zlib
+import hashlib
+import datetime
+
+# The content-addressed backup store. tools/backup.py is its command line; readers such as
+# system_diff use this module directly.
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_FILE = os.path.join(PROJECT_ROOT, "systems", "bidding_tree.yaml")
+BACKUP_DIR = os.path.join(PROJECT_ROOT, "backups")
+STORE_DIR = os.path.join(BACKUP_DIR, "store")
+GC_GRACE_SECONDS = 3600  # Never collect a blob this young: a backup may be writing its manifest
+
+# --- STORE LAYOUT ---
+#   backups/store/objects/ab/abcdef...   one blob per distinct chunk, named by its sha256
+#   backups/store/manifests/<timestamp>__<label>.json
+# A file is cut into one chunk per tree node: a new chunk starts at every "- bid:" line
+# (bidding_tree.yaml) and every '"KEY": {' line (JSON trees). Editing one node changes one
+# chunk, so a backup only stores the chunks that are new; the rest are shared with older
+# backups. Chunks are raw text, so joining them restores the file byte for byte.
+# Blob format: 1 byte ("Z" zlib, "R" raw) + data.
+NODE_START = re.compile(rb'^\s*(- bid:|"[^"]+": \{\s*$)')
+
+def split_chunks(data):
+    chunks, current = [], []
+    for line in data.splitlines(keepends=True):
+        if current and NODE_START.match(line):
+            chunks.append(b"".join(current))
+            current = []
+        current.append(line)
+    if current:
+        chunks.append(b"".join(current))
+    return chunks
+
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+def _blob_path(store, digest):
+    return os.path.join(store, "objects", digest[:2], digest)
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _put_blob(store, chunk, compress):
+    digest = _sha(chunk)
+    path = _blob_path(store, digest)
+    try:
+        # Already stored: freshen it instead. gc() spares young blobs, so a concurrent gc can't
+        # delete a blob this backup is about to reference before its manifest is written.
+        os.utime(path)
+        return digest, 0
+    except FileNotFoundError:
+        pass
+    body = b"Z" + zlib.compress(chunk, 9) if compress else b"R" + chunk
+    _write_atomic(path, body)
+    return digest, len(body)
+
+def _get_blob(store, digest):
+    with open(_blob_path(store, digest), "rb") as f:
+        body = f.read()
+    return zlib.decompress(body[1:]) if body[:1] == b"Z" else body[1:]
+
+# --- BACKUP / RESTORE ---
+def backup(label, source=SOURCE_FILE, store=STORE_DIR, compress=True, when=None):
+    """Stores `source` and writes its manifest. Returns (manifest name, bytes of new blobs)."""
+    with open(source, "rb") as f:
+        data = f.read()
+
+    new_bytes = 0
+    blobs = []
+    for chunk in split_chunks(data):
+        digest, written = _put_blob(store, chunk, compress)
+        blobs.append(digest)
+        new_bytes += written
+
+    when = when or datetime.datetime.now()
+    # Clean the label to be filename-safe
+    safe_label = "".join([c if c.isalnum() else "_" for c in label])
+    # Format: 2025-12-28_14-30__Added_1H_Opening.json
+    base = f"{when.strftime('%Y-%m-%d_%H-%M')}__{safe_label}"
+    name, n = base, 1
+    while os.path.exists(os.path.join(store, "manifests", f"{name}.json")):
+        n += 1
+        name = f"{base}-{n}"
+
+    manifest = {
+        "label": label,
+        "created": when.isoformat(timespec="seconds"),
+        "source": os.path.relpath(os.path.abspath(source), PROJECT_ROOT),
+        "size": len(data),
+        "sha256": _sha(data),
+        "blobs": blobs
+    }
+    # Blobs first, manifest last: a crash in between leaves unreferenced blobs for gc(), never a broken backup
+    _write_atomic(os.path.join(store, "manifests", f"{name}.json"), json.dumps(manifest, indent=1).encode("utf-8"))
+    return name, new_bytes
+
+def list_backups(store=STORE_DIR):
+    folder = os.path.join(store, "manifests")
+    if not os.path.isdir(folder):
+        return []
+    return sorted(f[:-5] for f in os.listdir(folder) if f.endswith(".json"))
+
+def load_manifest(name, store=STORE_DIR):
+    with open(os.path.join(store, "manifests", f"{name}.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def read_backup(name, store=STORE_DIR):
+    """The original file bytes of a backup (checked against its sha256)."""
+    manifest = load_manifest(name, store)
+    data = b"".join(_get_blob(store, digest) for digest in manifest["blobs"])
+    if _sha(data) != manifest["sha256"]:
+        raise ValueError(f"Backup {name} is damaged (checksum mismatch)")
+    return data
+
+def restore(name, dest=None, store=STORE_DIR):
+    """Writes a backup back to `dest` (default: where it was taken from). Returns the path."""
+    if dest is None:
+        dest = os.path.join(PROJECT_ROOT, load_manifest(name, store)["source"])
+    _write_atomic(dest, read_backup(name, store))
+    return dest
+
+def gc(store=STORE_DIR, grace=GC_GRACE_SECONDS):
+    """Deletes blobs no manifest refers to. Returns (blobs removed, bytes freed)."""
+    live = set()
+    for name in list_backups(store):
+        live.update(load_manifest(name, store)["blobs"])
+
+    removed = freed = 0
+    cutoff = time.time() - grace
+    objects = os.path.join(store, "objects")
+    for root, _, files in os.walk(objects):
+        for f in files:
+            path = os.path.join(root, f)
+            if f in live or os.path.getmtime(path) > cutoff:
+                continue
+            freed += os.path.getsize(path)
+            os.remove(path)
+            removed += 1
+    return removed, freed
+
+def store_size(store=STORE_DIR):
+    total = 0
+    for root, _, files in os.walk(store):
+        total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total
@@ -0,0 +1,91 @@
+# BID CODEC: one small integer per call.
+#
+#   Pass = 0, X = 1, XX = 2, 1C = 3, 1D = 4 ... 1NT = 7, 2C = 8 ... 7NT = 37
+#
+# Contract bids are numbered in rank order, so sufficiency is a plain integer compare.
+# Auctions are immutable tuples of these codes. Strings only appear at the edges
+# (YAML files, user input, printed output).
+
+PASS = 0
+DOUBLE = 1
+REDOUBLE = 2
+FIRST_CONTRACT = 3
+
+STRAINS = ["C", "D", "H", "S", "NT"]
+
+# --- LOOKUP TABLES (built once at import) ---
+BIDS = ["Pass", "X", "XX"] + [f"{level}{strain}" for level in range(1, 8) for strain in STRAINS]
+_CODES = {bid.upper(): code for code, bid in enumerate(BIDS)}
+# Common spellings seen in input and older files
+_CODES.update({"P": PASS, "DBL": DOUBLE, "RDBL": REDOUBLE})
+_CODES.update({f"{level}N": FIRST_CONTRACT + (level - 1) * 5 + 4 for level in range(1, 8)})
+
+def try_encode_bid(bid):
+    """Returns the code for a bid string (or code), or None if it isn't a call."""
+    if isinstance(bid, int):
+        return bid if 0 <= bid < len(BIDS) else None
+    return _CODES.get(str(bid).strip().upper())
+
+def encode_bid(bid):
+    code = try_encode_bid(bid)
+    if code is None:
+        raise ValueError(f"Not a bridge call: {bid!r}")
+    return code
+
+def decode_bid(code):
+    return BIDS[code]
+
+def encode_auction(bids):
+    """['1NT', 'Pass', '2C'] -> (7, 0, 8). Codes pass through unchanged."""
+    return tuple(encode_bid(b) for b in bids)
+
+def decode_auction(codes):
+    return [BIDS[c] for c in codes]
+
+def strip_passes(codes):
+    return tuple(c for c in codes if c != PASS)
+
+# --- PROPERTIES OF A CODE ---
+def is_contract(code):
+    return code >= FIRST_CONTRACT
+
+def level_of(code):
+    return (code - FIRST_CONTRACT) // 5 + 1 if code >= FIRST_CONTRACT else 0
+
+def strain_of(code):
+    return STRAINS[(code - FIRST_CONTRACT) % 5] if code >= FIRST_CONTRACT else None
+
+def last_contract(codes):
+    for c in reversed(codes):
+        if c >= FIRST_CONTRACT: return c
+    return None
+
+# --- AUCTION RULES ---
+def is_sufficient(last_code, new_code):
+    """Checks if new_code may follow last_code (the last contract bid, or None)."""
+    if new_code < FIRST_CONTRACT: return True
+    if last_code is None: return True
+    return new_code > last_code
+
+def is_legal_call(codes, new_code):
+    """Full legality check of a call against the auction so far (codes)."""
+    if new_code == PASS:
+        return True
+
+    # Find the last non-pass call and how far back it was
+    for distance, c in enumerate(reversed(codes)):
+        if c != PASS: break
+    else:
+        return new_code >= FIRST_CONTRACT
+
+    # distance 0 is RHO, 1 is partner, 2 is LHO
+    opponents_call = distance % 2 == 0
+    if new_code == DOUBLE:
+        return opponents_call and c >= FIRST_CONTRACT
+    if new_code == REDOUBLE:
+        return opponents_call and c == DOUBLE
+    return is_sufficient(last_contract(codes), new_code)
+
+def is_complete(codes):
+    """Four passes, or three passes after any other call."""
+    return len(codes) >= 4 and codes[-1] == PASS and codes[-2] == PASS and codes[-3] == PASS
@@ -1,55 +1,90 @@
-from bridge_model import SUPPORTED_SYSTEMS
+from time import perf_counter
+from bridge_model import SUPPORTED_SYSTEMS, Rule, RuleIndex, compile_rules
+from bid_codec import encode_auction, decode_auction
 
 def check_hand_compliance(hand_stats, constraints):
     """
     Returns True if a hand matches the rule's requirements.
+    `constraints` is a Constraints record (see bridge_model).
     """
     # 1. Check Points (Updated to use 'total_hcp' to match Bridge Model)
     # We use .get() with a fallback to support both 'hcp' (legacy) and 'total_hcp'
     points = hand_stats.get('total_hcp', hand_stats.get('hcp', 0))
     
-    if points < constraints.get('min_hcp', 0): return False
-    if points > constraints.get('max_hcp', 37): return False
+    if points < constraints.min_hcp: return False
+    if points > constraints.max_hcp: return False
 
-    # 2. Check Shape
-    req = constraints.get('shape_requirements', "").lower()
-    if not req: return True
+    # 2. Check Shape (pre-parsed into (min spades, min hearts, balanced) when the rule was loaded)
+    shape = constraints.shape_check
+    if shape is None: return True
 
     suits = hand_stats['suits']
-    
+    min_spades, min_hearts, balanced = shape
+
     # Majors
-    if "spades" in req or "major" in req:
-        min_len = 5 if "5+" in req else 4
-        if suits['S']['count'] < min_len: return False
-        
-    if "hearts" in req or "major" in req:
-        min_len = 5 if "5+" in req else 4
-        if suits['H']['count'] < min_len: return False
+    if min_spades and suits['S']['count'] < min_spades: return False
+    if min_hearts and suits['H']['count'] < min_hearts: return False
 
     # Balanced
-    if "balanced" in req:
+    if balanced:
         dist = [suits[s]['count'] for s in ['S','H','D','C']]
         if 0 in dist or 1 in dist: return False
 
     return True
 
-def find_bid(hand_stats, rules, auction_history, target_system="SAYC_2/1_GF"):
+# Raw dict lists passed to find_bid are compiled once and reused while the caller keeps
+# passing the same list: (the list, its length, the Rule records).
+_LAST_COMPILED = (None, 0, ())
+
+def _records_for(rules):
+    global _LAST_COMPILED
+    last_rules, last_len, records = _LAST_COMPILED
+    if last_rules is rules and last_len == len(rules):
+        return records
+    records = compile_rules(rules)
+    _LAST_COMPILED = (rules, len(rules), records)
+    return records
+
+def find_bid(hand_stats, rules, auction_history, target_system="SAYC_2/1_GF", stats=None):
     """
     Finds the correct bid using the System Filter.
+    `rules` is a RuleIndex (fastest), a list of Rule records, or raw dicts (converted once per
+    list, see _records_for; load them with load_rule_records instead where you can).
+    `auction_history` may be bid strings or bid codes (see bid_codec).
+    Pass a RuleStats object as `stats` to record per-rule evaluations.
     """
-    # 1. Filter by Auction Path
-    candidates = [r for r in rules if r.get('auction') == auction_history]
-    
-    # 2. Filter by System
-    system_candidates = []
-    for r in candidates:
-        r_sys = r.get('system', 'ALL') 
-        if r_sys == 'ALL' or r_sys == target_system:
-            system_candidates.append(r)
-            
+    auction = encode_auction(auction_history)
+
+    if isinstance(rules, RuleIndex):
+        # Already grouped by system and auction
+        system_candidates = rules.candidates(target_system, auction)
+    else:
+        if rules and not isinstance(rules[0], Rule):
+            rules = _records_for(rules)
+
+        # 1. Filter by Auction Path
+        candidates = [r for r in rules if r.auction == auction]
+
+        # 2. Filter by System
+        system_candidates = []
+        for r in candidates:
+            r_sys = r.system
+            if r_sys == 'ALL' or r_sys == target_system:
+                system_candidates.append(r)
+
     # 3. Check Compliance
+    if stats is None:
+        for rule in system_candidates:
+            if check_hand_compliance(hand_stats, rule.constraints):
+                return rule
+        return None
+
+    # Instrumented path (kept separate so the default loop pays nothing)
     for rule in system_candidates:
-        if check_hand_compliance(hand_stats, rule.get('constraints', {})):
+        start = perf_counter()
+        matched = check_hand_compliance(hand_stats, rule.constraints)
+        stats.record(rule.system, decode_auction(auction), rule.bid, matched, perf_counter() - start)
+        if matched:
             return rule
             
-    return None
\ No newline at end of file
+    return None
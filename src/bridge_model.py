@@ -1,5 +1,13 @@
+import os
+import json
+import hashlib
+import logging
+import threading
 from pathlib import Path
 from ruamel.yaml import YAML
+from bid_codec import encode_auction, decode_auction, try_encode_bid
+
+logger = logging.getLogger("MODEL")
 
 # Initialize the YAML handler
 yaml = YAML()
@@ -33,6 +41,54 @@ def load_rules(file_path):
             print(f"Error loading rules: {e}")
             return []
 
+# --- READ-ONLY FAST PATH ---
+# load_rules keeps quotes and comments so the editors can write the file back. Readers
+# (compiler, reloader, importers) don't need that: they get plain dicts and lists from the
+# safe loader, which uses ruamel's C extension when it is installed.
+# Parsed files are cached by (size, mtime) and, when those move, by content hash, so an
+# unchanged file is never parsed twice in one process.
+_FAST_CACHE = {}  # resolved path -> (size, mtime_ns, sha256 digest, parsed data)
+_FAST_LOCK = threading.Lock()
+
+def load_yaml_fast(file_path):
+    """
+    Parses a YAML file for reading only. The result is shared with other callers: don't modify it.
+    Raises on a missing or malformed file (see load_rules_fast for the forgiving version).
+    """
+    key = Path(file_path).resolve()
+    st = os.stat(key)
+    with _FAST_LOCK:
+        cached = _FAST_CACHE.get(key)
+    if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        return cached[3]
+
+    data_bytes = key.read_bytes()
+    digest = hashlib.sha256(data_bytes).digest()
+    if cached and cached[2] == digest:
+        data = cached[3]  # Touched but not changed
+    else:
+        data = YAML(typ='safe', pure=False).load(data_bytes)
+    with _FAST_LOCK:
+        _FAST_CACHE[key] = (st.st_size, st.st_mtime_ns, digest, data)
+    return data
+
+def load_rules_fast(file_path):
+    """Read-only load_rules: same result as plain data, [] if the file is missing or unreadable."""
+    try:
+        return load_yaml_fast(file_path) or []
+    except FileNotFoundError:
+        return []
+    except Exception as e:
+        logger.error(f"Error loading rules: {e}")
+        return []
+
+def load_rule_records(file_path):
+    """
+    Read-only loader for the engines.
+    Converts the parsed rules into compact Rule records once, up front.
+    """
+    return compile_rules(load_rules_fast(file_path))
+
 def save_rules(file_path, rules):
     """
     Saves rules to a YAML file using ruamel.yaml.
@@ -41,4 +97,230 @@ def save_rules(file_path, rules):
         file_path = Path(file_path)
 
     with open(file_path, "w", encoding="utf-8") as f:
-        yaml.dump(rules, f)
\ No newline at end of file
+        yaml.dump(rules, f)
+
+def rule_signature(rule):
+    """
+    (system, auction, BID): two rules with the same signature define the same call, and the
+    later one wins (see dedupe_rules). The bid is upper-cased to catch '2d' vs '2D'.
+    """
+    return (rule.get('system', 'ALL'), tuple(rule.get('auction') or []), str(rule.get('bid', '')).strip().upper())
+
+# --- RUNTIME RECORDS ---
+# Round-trip CommentedMaps are for the editing tools. The engines work on these
+# slotted records instead: typed fields, defaults resolved, no per-check .get() chains.
+
+def _int_or(value, default):
+    if value is None: return default
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+def _text_or_empty(value):
+    return "" if value is None else str(value)
+
+def parse_shape_requirements(req):
+    """
+    Pre-parses a shape string into the checks the flat-rule engine applies:
+    (min spades, min hearts, balanced). Returns None when there is nothing to check.
+    """
+    req = req.lower()
+    if not req: return None
+    either_major = "major" in req
+    min_len = 5 if "5+" in req else 4
+    min_spades = min_len if ("spades" in req or either_major) else 0
+    min_hearts = min_len if ("hearts" in req or either_major) else 0
+    return (min_spades, min_hearts, "balanced" in req)
+
+class Constraints:
+    FIELDS = ("min_hcp", "max_hcp", "shape_requirements", "explanation", "nuance", "source")
+    __slots__ = FIELDS + ("shape_check",)
+
+    def __init__(self, min_hcp=0, max_hcp=37, shape_requirements="", explanation="", nuance="", source=""):
+        self.min_hcp = min_hcp
+        self.max_hcp = max_hcp
+        self.shape_requirements = shape_requirements
+        self.explanation = explanation
+        self.nuance = nuance
+        self.source = source
+        self.shape_check = parse_shape_requirements(shape_requirements)
+
+    @classmethod
+    def from_mapping(cls, data):
+        data = data or {}
+        return cls(
+            min_hcp=_int_or(data.get('min_hcp'), 0),
+            max_hcp=_int_or(data.get('max_hcp'), 37),
+            shape_requirements=_text_or_empty(data.get('shape_requirements')),
+            explanation=_text_or_empty(data.get('explanation')),
+            nuance=_text_or_empty(data.get('nuance')),
+            source=_text_or_empty(data.get('source'))
+        )
+
+    # Dict-style read access, so older callers (rule['constraints'].get(...)) keep working
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS: raise KeyError(key)
+        return getattr(self, key)
+
+    def to_dict(self):
+        return {k: getattr(self, k) for k in self.FIELDS}
+
+class Rule:
+    __slots__ = ("system", "auction", "bid", "bid_code", "type", "constraints")
+
+    def __init__(self, system, auction, bid, type, constraints):
+        self.system = system
+        self.auction = auction          # tuple of bid codes (the context before this bid)
+        self.bid = bid
+        self.bid_code = try_encode_bid(bid)  # None for non-standard bids
+        self.type = type
+        self.constraints = constraints  # Constraints record
+
+    @classmethod
+    def from_mapping(cls, data):
+        return cls(
+            system=data.get('system', 'ALL'),
+            auction=encode_auction(data.get('auction') or []),
+            bid=str(data.get('bid', '')),
+            type=data.get('type', 'Response'),
+            constraints=Constraints.from_mapping(data.get('constraints'))
+        )
+
+    @property
+    def auction_bids(self):
+        return decode_auction(self.auction)
+
+    # Dict-style reads return the YAML layout (auction as a list of strings)
+    def get(self, key, default=None):
+        if key == 'auction': return self.auction_bids
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def __getitem__(self, key):
+        if key not in self.__slots__: raise KeyError(key)
+        return self.get(key)
+
+    def to_dict(self):
+        """Plain dict in the flat_rules.yaml layout (for saving/exporting)."""
+        return {
+            "system": self.system,
+            "auction": self.auction_bids,
+            "bid": self.bid,
+            "type": self.type,
+            "constraints": self.constraints.to_dict()
+        }
+
+    def __repr__(self):
+        return f"Rule({self.system!r}, {self.auction_bids!r}, {self.bid!r})"
+
+def compile_rules(rules):
+    """
+    Converts raw rule dicts (or CommentedMaps) into Rule records. Records pass through unchanged.
+    Rules whose auction isn't made of real calls are skipped with a warning.
+    """
+    compiled = []
+    for r in rules or []:
+        if isinstance(r, Rule):
+            compiled.append(r)
+            continue
+        try:
+            compiled.append(Rule.from_mapping(r))
+        except ValueError as e:
+            logger.warning(f"Skipping rule {r.get('bid')!r} at {r.get('auction')}: {e}")
+    return compiled
+
+def node_fingerprint(group):
+    """Content hash of the source rules behind one (system, auction) node."""
+    payload = [r.to_dict() if isinstance(r, Rule) else r for r in group]
+    return hashlib.blake2b(json.dumps(payload, sort_keys=True, default=str).encode("utf-8"), digest_size=16).digest()
+
+class RuleIndex:
+    """
+    Rules grouped by (system, auction), keeping file order inside each group.
+    Rules tagged 'ALL' are folded into every system's groups, so a lookup is one dict hit.
+    Each node also keeps a fingerprint of its source rules, for incremental rebuilds.
+    """
+    __slots__ = ("nodes", "fingerprints", "rule_count")
+
+    def __init__(self, nodes, rule_count, fingerprints=None):
+        self.nodes = nodes                      # {(system, auction_codes): tuple of Rule}
+        self.rule_count = rule_count
+        self.fingerprints = fingerprints or {}  # {(system, auction_codes): digest}
+
+    @classmethod
+    def from_rules(cls, rules, previous=None):
+        """
+        Builds the index from raw rule dicts (or Rule records).
+        With `previous`, nodes whose source rules are unchanged reuse the previous compiled
+        tuples; only the changed nodes are compiled again.
+        """
+        rules = list(rules or [])
+        systems = {r.get('system', 'ALL') for r in rules}
+        grouped = {}
+        valid = 0
+        for r in rules:
+            try:
+                auction = r.auction if isinstance(r, Rule) else encode_auction(r.get('auction') or [])
+            except ValueError as e:
+                logger.warning(f"Skipping rule {r.get('bid')!r} at {r.get('auction')}: {e}")
+                continue
+            valid += 1
+            system = r.get('system', 'ALL')
+            for target in (systems if system == 'ALL' else (system,)):
+                grouped.setdefault((target, auction), []).append(r)
+
+        compiled = {}  # id(source) -> Rule, so 'ALL' rules are compiled once and shared
+        nodes, fingerprints = {}, {}
+        for key, group in grouped.items():
+            fingerprint = node_fingerprint(group)
+            fingerprints[key] = fingerprint
+            if previous is not None and previous.fingerprints.get(key) == fingerprint:
+                nodes[key] = previous.nodes[key]
+                continue
+            records = []
+            for r in group:
+                record = compiled.get(id(r))
+                if record is None:
+                    record = compiled[id(r)] = r if isinstance(r, Rule) else Rule.from_mapping(r)
+                records.append(record)
+            nodes[key] = tuple(records)
+        return cls(nodes, valid, fingerprints)
+
+    def changed_keys(self, previous):
+        """Node keys that were added, removed or edited relative to `previous`."""
+        keys = set(self.fingerprints) | set(previous.fingerprints)
+        return {k for k in keys if self.fingerprints.get(k) != previous.fingerprints.get(k)}
+
+    def candidates(self, system, auction):
+        found = self.nodes.get((system, auction))
+        if found is None:
+            found = self.nodes.get(('ALL', auction), ())
+        return found
+
+    def systems(self):
+        return sorted({system for system, _ in self.nodes})
+
+    def subset(self, systems, with_all=True):
+        """
+        A smaller index holding only the given systems' nodes (a per-system artifact stores one).
+        The 'ALL' nodes come along unless with_all=False, so candidates() keeps its fallback.
+        """
+        if with_all:
+            systems = set(systems) | {'ALL'}
+        nodes = {key: group for key, group in self.nodes.items() if key[0] in systems}
+        fingerprints = {key: self.fingerprints[key] for key in nodes if key in self.fingerprints}
+        return RuleIndex(nodes, len({id(r) for group in nodes.values() for r in group}), fingerprints)
+
+    def __iter__(self):
+        seen = set()
+        for group in self.nodes.values():
+            for r in group:
+                if id(r) not in seen:
+                    seen.add(id(r))
+                    yield r
+
+    def __len__(self):
+        return self.rule_count
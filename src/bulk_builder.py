@@ -1,5 +1,7 @@
-import time
 import sys
+import time
+import random
+import asyncio
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
@@ -8,10 +10,6 @@ import os
 # --- PATH FIX ---
 current_dir = Path(__file__).resolve().parent
 sys.path.append(str(current_dir))         # For system_architect (in src)
-sys.path.append(str(current_dir.parent))  # For dedupe_rules (in root)
-
-from system_architect import SystemArchitect
-from dedupe_rules import scan_and_fix_duplicates
 
 # --- SETUP LOGGING ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s', datefmt='%H:%M:%S')
@@ -26,10 +24,98 @@ BATCH_LIST = [
     "1H",
     "1S",
     "1NT",
-    "2C", 
+    "2C",
     "2NT"
 ]
 
+REQUESTS_PER_MINUTE = 15   # The provider's rate limit (the token bucket refills at this rate)
+BURST = 3                  # Requests allowed back to back before the rate applies
+MAX_CONCURRENCY = 4        # Requests in flight at once
+MAX_RETRIES = 4            # Per auction, after the first attempt
+BACKOFF_SECONDS = 2.0      # First retry delay; doubles each attempt (plus jitter)
+
+# --- RATE LIMITING ---
+class TokenBucket:
+    """
+    `rate` tokens per second, at most `capacity` saved up. acquire() waits for a token.
+    Used from one event loop only, so there is no await between the check and the take.
+    `clock` and `sleep` can be swapped for fakes in tests.
+    """
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic, sleep=asyncio.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await self.sleep((1 - self.tokens) / self.rate)
+
+# --- CONCURRENT GENERATION ---
+async def _generate(architect, auction_list, system, bucket, slots, retries, backoff):
+    """Rules for one auction, retried with exponential backoff. None if every attempt failed."""
+    prompt = architect.build_prompt(auction_list, system)
+    if prompt is None:
+        return None
+    for attempt in range(retries + 1):
+        async with slots:
+            await bucket.acquire()
+            try:
+                raw_text = await architect.request_rules_async(prompt)
+                return architect.parse_rules(raw_text, auction_list, system)
+            except Exception as e:
+                error = e
+        if attempt < retries:
+            delay = backoff * (2 ** attempt) * random.uniform(1.0, 1.5)
+            logger.warning(f"   ⏳ {' '.join(auction_list) or 'Opening'}: {error} - retry {attempt + 1}/{retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    logger.error(f"   ❌ {' '.join(auction_list) or 'Opening'}: giving up after {retries + 1} attempts ({error})")
+    return None
+
+async def build_all(architect, batch, system, requests_per_minute=REQUESTS_PER_MINUTE, burst=BURST,
+                    concurrency=MAX_CONCURRENCY, retries=MAX_RETRIES, backoff=BACKOFF_SECONDS):
+    """
+    Generates rules for every auction in `batch` concurrently (rate-limited, at most `concurrency`
+    in flight) and commits each result as soon as every auction before it has been committed,
+    so the rules file ends up in batch order whatever order the replies arrive in.
+    Returns {auction string: rules added}.
+    """
+    bucket = TokenBucket(requests_per_minute / 60.0, burst)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def job(index, auction_str):
+        # Convert "1C" -> ["1C"]
+        rules = await _generate(architect, [auction_str], system, bucket, slots, retries, backoff)
+        return index, rules
+
+    tasks = [asyncio.ensure_future(job(i, a)) for i, a in enumerate(batch)]
+    ready, next_index, added = {}, 0, {}
+    for finished in asyncio.as_completed(tasks):
+        index, rules = await finished
+        ready[index] = rules
+        while next_index in ready:
+            rules = ready.pop(next_index)
+            auction_str = batch[next_index]
+            added[auction_str] = architect.commit_rules(rules, system) if rules is not None else 0
+            if added[auction_str] > 0:
+                logger.info(f"   ✨ [{next_index + 1}/{len(batch)}] +{added[auction_str]} rules added for {auction_str}")
+            else:
+                logger.warning(f"   ⚠️ [{next_index + 1}/{len(batch)}] No new rules added for {auction_str}.")
+            next_index += 1
+    return added
+
 def run_batch():
     load_dotenv()
     key = os.getenv("GEMINI_API_KEY")
@@ -37,47 +123,35 @@ def run_batch():
         logger.error("❌ ERROR: No API Key found.")
         return
 
+    # Imported here: the rate limiting above doesn't need the AI client
+    from system_architect import SystemArchitect
+
     # Point to the rules file (parent of src is root)
     rules_path = current_dir.parent / "systems" / "flat_rules.yaml"
-    
+
     logger.info("=" * 60)
     logger.info(f"🚀 STARTING BATCH BUILDER")
     logger.info(f"🎯 Target System: {TARGET_SYSTEM}")
     logger.info(f"📋 Queue ({len(BATCH_LIST)} items): {BATCH_LIST}")
+    logger.info(f"🚦 {REQUESTS_PER_MINUTE} requests/min, {MAX_CONCURRENCY} in flight, {MAX_RETRIES} retries")
     logger.info("=" * 60)
 
-    architect = SystemArchitect(key, rules_path)
-    total_added = 0
+    # New rules go to the journal (one appended line each); compaction at the end dedupes
+    architect = SystemArchitect(key, rules_path, use_journal=True)
 
-    for index, auction_str in enumerate(BATCH_LIST):
-        step_num = index + 1
-        logger.info(f"\n🔨 [Step {step_num}/{len(BATCH_LIST)}] Architecting responses for: '{auction_str}'...")
-        
-        # Convert "1C" -> ["1C"]
-        auction_list = [auction_str]
-        
-        len_before = len(architect.current_rules)
-        architect.generate_system_rules(auction_list, TARGET_SYSTEM)
-        len_after = len(architect.current_rules)
-        
-        added = len_after - len_before
-        total_added += added
-        
-        if added > 0:
-            logger.info(f"   ✨ Result: +{added} rules added for {auction_str}")
-        else:
-            logger.warning(f"   ⚠️ Result: No new rules added.")
-
-        time.sleep(2)
+    start = time.perf_counter()
+    added = asyncio.run(build_all(architect, BATCH_LIST, TARGET_SYSTEM))
+    total_added = sum(added.values())
 
     logger.info("\n" + "=" * 60)
-    logger.info("🧹 BATCH COMPLETE. Running Auto-Dedupe cleanup...")
-    
-    scan_and_fix_duplicates()
-    
+    logger.info(f"🧹 BATCH COMPLETE in {time.perf_counter() - start:.1f}s. Compacting the rule journal (drops superseded duplicates)...")
+
+    architect.journal.wait()  # A background compaction may still be running
+    architect.journal.compact()
+
     logger.info("=" * 60)
     logger.info(f"✅ FINAL REPORT: Added approximately {total_added} new rules.")
     logger.info("   Your system is now ready for testing.")
 
 if __name__ == "__main__":
-    run_batch()
\ No newline at end of file
+    run_batch()
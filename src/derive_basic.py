@@ -1,54 +1,92 @@
 import json
-import copy
 from pathlib import Path
 
-def simplify_node(node, bid_key):
+# --- DERIVED VARIANTS ---
+# A variant is a source system plus two hooks:
+#   prune(parent_key, key)  -> True to drop the response `key` (and its whole subtree)
+#   rewrite(node)           -> dict of replaced fields for this node, or None to keep it as is
+# derive_tree() never modifies the source: untouched subtrees are SHARED with it, and only the
+# nodes on a path to a pruned or rewritten node are (shallowly) copied. Every node is still
+# visited to ask the hooks, but nothing is copied that didn't change.
+
+class Variant:
+    __slots__ = ("name", "source", "prune", "rewrite")
+
+    def __init__(self, name, source, prune=None, rewrite=None):
+        self.name = name        # e.g. "audrey_grant_basic" -> audrey_grant_basic_tree.json
+        self.source = source    # the system it is derived from
+        self.prune = prune
+        self.rewrite = rewrite
+
+def _derive_node(node, bid_key, variant):
+    new_node = node
+    responses = node.get("responses")
+    if isinstance(responses, dict):
+        kept = {}
+        dirty = False
+        for key, child in responses.items():
+            if variant.prune and variant.prune(bid_key, key):
+                dirty = True
+                continue
+            new_child = _derive_node(child, key, variant)
+            dirty = dirty or new_child is not child
+            kept[key] = new_child
+        if dirty:
+            new_node = dict(node)
+            new_node["responses"] = kept
+
+    changes = variant.rewrite(node) if variant.rewrite else None
+    if changes:
+        new_node = dict(new_node) if new_node is node else new_node
+        new_node.update(changes)
+    return new_node
+
+def derive_tree(source_data, variant):
     """
-    Recursively walks the tree and deletes 'Advanced' branches.
+    The variant's tree, built from `source_data` by structural sharing (see above).
+    The result shares subtrees with the source: treat both as read-only, or deepcopy first.
     """
-    # 1. Identify Complex Conventions to Prune
-    # (Adjust this list based on what you consider "Too Advanced" for Basic)
-    complex_conventions = [
-        "2NT", # Jacoby 2NT (as a response to Major)
-        "Splinter",
-        "4C", "4D", # Splinters or Gerber on first round
-        "3C", "3D", "3H", "3S" # Jump Shifts
-    ]
-    
-    # 2. Prune Responses
-    if "responses" in node:
-        responses = node["responses"]
-        keys_to_delete = []
-        
-        for key in list(responses.keys()):
-            # Delete if it matches our "Complex" list
-            if any(conv in key for conv in complex_conventions):
-                # Exception: Keep 2NT if it's a natural opening (the root 2NT bid)
-                if bid_key == "Root" and key == "2NT":
-                    pass 
-                # Exception: Keep 2NT if it is a standard response to 1NT (Inv)
-                elif bid_key == "1NT" and key == "2NT":
-                    pass
-                else:
-                    keys_to_delete.append(key)
-            
-            # Delete "4-Level Preemptive Raises" if you want Basic to be strictly 1-2-3
-            # (Optional: Comment this out if Basic allows 1H-4H)
-            # if "4" in key and ("H" in key or "S" in key): 
-            #    keys_to_delete.append(key)
-
-        for key in keys_to_delete:
-            del responses[key]
-            
-        # Recursively simplify the children that survived
-        for key, child in responses.items():
-            simplify_node(child, key)
+    return {key: _derive_node(node, key, variant) for key, node in source_data.items()}
+
+# --- BASIC ---
+# (Adjust this list based on what you consider "Too Advanced" for Basic)
+COMPLEX_CONVENTIONS = [
+    "2NT", # Jacoby 2NT (as a response to Major)
+    "Splinter",
+    "4C", "4D", # Splinters or Gerber on first round
+    "3C", "3D", "3H", "3S" # Jump Shifts
+]
+
+def basic_prune(bid_key, key):
+    """Deletes 'Advanced' responses."""
+    # Delete if it matches our "Complex" list
+    if not any(conv in key for conv in COMPLEX_CONVENTIONS):
+        return False
+    # Exception: Keep 2NT if it's a natural opening (the root 2NT bid)
+    if bid_key == "Root" and key == "2NT":
+        return False
+    # Exception: Keep 2NT if it is a standard response to 1NT (Inv)
+    if bid_key == "1NT" and key == "2NT":
+        return False
+    # Delete "4-Level Preemptive Raises" if you want Basic to be strictly 1-2-3
+    # (Optional: add `"4" in key and ("H" in key or "S" in key)` above if Basic forbids 1H-4H)
+    return True
+
+def basic_rewrite(node):
+    # Simplify Explanations, e.g. "Semi-Forcing Dustbin" -> "Weak Response"
+    teaching = node.get("teaching")
+    if teaching and "Dustbin" in (teaching.get("nuance") or ""):
+        return {"teaching": dict(teaching, nuance="Weak Response (6-9 HCP).")}
+    return None
 
-    # 3. Simplify Explanations (Optional Logic)
-    # Example: Simplify "Semi-Forcing Dustbin" to "Weak Response"
-    if "teaching" in node:
-        if "Dustbin" in node["teaching"].get("nuance", ""):
-             node["teaching"]["nuance"] = "Weak Response (6-9 HCP)."
+BASIC = Variant("audrey_grant_basic", "audrey_grant_standard", basic_prune, basic_rewrite)
+
+# Every derived system; system_build makes one derive step per entry
+VARIANTS = [BASIC]
+
+def derive_basic_tree(standard_data):
+    """Returns the Basic tree pruned from a Standard tree (the Standard tree is left untouched)."""
+    return derive_tree(standard_data, BASIC)
 
 def main():
     # Define Paths
@@ -66,12 +104,7 @@ def main():
     with open(standard_path, "r", encoding="utf-8") as f:
         data = json.load(f)
 
-    # Create a Deep Copy (so we don't accidentally edit Standard)
-    basic_data = copy.deepcopy(data)
-
-    # Start Pruning
-    for key, node in basic_data.items():
-        simplify_node(node, key)
+    basic_data = derive_basic_tree(data)
         
     # Save Basic
     with open(basic_path, "w", encoding="utf-8") as f:
@@ -2,6 +2,7 @@ import random
 import time
 import sys
 import logging
+import importlib.util
 from pathlib import Path
 
 # --- SETUP LOGGING ---
@@ -9,50 +10,81 @@ logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger("FACTORY")
 
 sys.path.append(str(Path(__file__).parent))
-from bridge_model import load_rules, SUPPORTED_SYSTEMS
-from bridge_engine import find_bid
+from bridge_model import SUPPORTED_SYSTEMS
+from rule_store import get_store
+from bid_codec import PASS, encode_auction, decode_auction
+
+def load_flat_engine():
+    """
+    src/bridge_engine.py, loaded by path (once per process). The root folder has a tree engine
+    with the same module name, so a plain import gets whichever is first on sys.path.
+    """
+    module = sys.modules.get("flat_bridge_engine")
+    if module is None:
+        spec = importlib.util.spec_from_file_location("flat_bridge_engine", Path(__file__).parent / "bridge_engine.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules["flat_bridge_engine"] = module
+    return module
+
+find_bid = load_flat_engine().find_bid
 
 TIMEOUT_SECONDS = 5
 MAX_ATTEMPTS = 50000
 
+def deal_hands(rng=random):
+    deck = list(range(52))
+    rng.shuffle(deck)
+    return {"N": deck[0:13], "E": deck[13:26], "S": deck[26:39], "W": deck[39:52]}
+
+def analyze_hand(cards):
+    """Card numbers (0-51, suit-major from clubs) -> hand stats in the shape find_bid expects."""
+    suits = {0: 'C', 1: 'D', 2: 'H', 3: 'S'}
+    ranks = "23456789TJQKA"
+    hand_data = {'S': [], 'H': [], 'D': [], 'C': []}
+    hcp = 0
+    for c in cards:
+        suit_idx = c // 13
+        rank_idx = c % 13
+        hand_data[suits[suit_idx]].append(rank_idx)
+        if rank_idx >= 9: hcp += (rank_idx - 8)
+
+    formatted_suits = {}
+    dist_list = []
+    for s in ['S', 'H', 'D', 'C']:
+        ranks_indices = sorted(hand_data[s], reverse=True)
+        cards_str = "".join([ranks[r] for r in ranks_indices])
+        suit_hcp = sum([(r - 8) for r in ranks_indices if r >= 9])
+        formatted_suits[s] = {"cards": cards_str, "hcp": suit_hcp, "count": len(ranks_indices)}
+        dist_list.append(len(ranks_indices))
+
+    return {"total_hcp": hcp, "distribution": "=".join(map(str, dist_list)), "suits": formatted_suits}
+
 class HandFactory:
-    def __init__(self, rules_file_path):
-        self.rules = load_rules(rules_file_path)
-        logger.info(f"🏭 Factory initialized. Loaded {len(self.rules)} rules.")
+    def __init__(self, rules_file_path, stats=None, auto_reload=False):
+        # Shared with every other consumer in this process (see rule_store).
+        # auto_reload: pick up edits to the rules file without restarting (see rule_reloader)
+        self.store = get_store(rules_file_path, auto_reload=auto_reload)
+        self.stats = stats  # Optional RuleStats, forwarded to find_bid
+        logger.info(f"🏭 Factory initialized for {Path(rules_file_path).name} (systems load on first use).")
+
+    @property
+    def rules(self):
+        return self.store.current()
         
     def _deal_hand(self):
-        deck = list(range(52))
-        random.shuffle(deck)
-        return {"N": deck[0:13], "E": deck[13:26], "S": deck[26:39], "W": deck[39:52]}
+        return deal_hands()
 
     def _analyze_hand(self, cards):
-        # ... (Same logic as before, abbreviated for brevity) ...
-        suits = {0: 'C', 1: 'D', 2: 'H', 3: 'S'}
-        ranks = "23456789TJQKA"
-        hand_data = {'S': [], 'H': [], 'D': [], 'C': []}
-        hcp = 0
-        for c in cards:
-            suit_idx = c // 13
-            rank_idx = c % 13
-            hand_data[suits[suit_idx]].append(rank_idx)
-            if rank_idx >= 9: hcp += (rank_idx - 8)
-
-        formatted_suits = {}
-        dist_list = []
-        for s in ['S', 'H', 'D', 'C']:
-            ranks_indices = sorted(hand_data[s], reverse=True)
-            cards_str = "".join([ranks[r] for r in ranks_indices])
-            suit_hcp = sum([(r - 8) for r in ranks_indices if r >= 9])
-            formatted_suits[s] = {"cards": cards_str, "hcp": suit_hcp, "count": len(ranks_indices)}
-            dist_list.append(len(ranks_indices))
-            
-        return {"total_hcp": hcp, "distribution": "=".join(map(str, dist_list)), "suits": formatted_suits}
+        return analyze_hand(cards)
 
     def generate_deal(self, target_auction, target_system="SAYC_2/1_GF"):
         start_time = time.time()
         attempts = 0
         
         logger.info(f"Targeting: {target_auction} [{target_system}]")
+        target_codes = encode_auction(target_auction)
+        rules = self.store.view(target_system)  # One consistent view of the rules for this whole request
 
         while attempts < MAX_ATTEMPTS:
             attempts += 1
@@ -70,28 +102,29 @@ class HandFactory:
             current_bidder_idx = 0 
             directions = ['N', 'E', 'S', 'W']
             
-            for i, target_bid in enumerate(target_auction):
+            for i, target_code in enumerate(target_codes):
                 dir_char = directions[current_bidder_idx % 4]
                 hand_stats = stats[dir_char]
                 
-                rule = find_bid(hand_stats, self.rules, current_auction, target_system)
-                bid_made = rule['bid'] if rule else "Pass"
+                rule = find_bid(hand_stats, rules, current_auction, target_system, self.stats)
+                code_made = rule.bid_code if rule else PASS
                 
-                if bid_made != target_bid:
+                if code_made != target_code:
                     valid_deal = False
                     
                     # LOG REJECTION REASONS (Only for the first 5 attempts to avoid spam)
                     if attempts <= 5:
+                        bid_made = rule.bid if rule else "Pass"
                         reason = "No Rule Found (Default Pass)" if not rule else f"Rule says {bid_made}"
-                        logger.info(f"❌ Attempt {attempts} rejected at step {i+1} ({dir_char}). Wanted {target_bid}, got {bid_made}. Reason: {reason}")
+                        logger.info(f"❌ Attempt {attempts} rejected at step {i+1} ({dir_char}). Wanted {target_auction[i]}, got {bid_made}. Reason: {reason}")
                         if not rule:
-                            logger.info(f"   Context was: {current_auction}")
+                            logger.info(f"   Context was: {decode_auction(current_auction)}")
                             logger.info(f"   Hand: {hand_stats['total_hcp']} HCP, {hand_stats['distribution']}")
 
                     break 
                 
-                current_auction.append(bid_made)
-                if rule: explanations.append(f"{dir_char}: {rule['constraints'].get('explanation')}")
+                current_auction.append(code_made)
+                if rule: explanations.append(f"{dir_char}: {rule.constraints.explanation}")
                 current_bidder_idx += 1
 
             if valid_deal:
@@ -99,7 +132,7 @@ class HandFactory:
                 return {
                     "success": True,
                     "hands": stats,
-                    "auction": current_auction,
+                    "auction": decode_auction(current_auction),
                     "explanations": explanations,
                     "attempts": attempts
                 }
@@ -4,7 +4,7 @@ import time
 from pathlib import Path
 
 # IMPORT OUR TESTED MODULES
-from bridge_model import load_rules, HandData, SuitHolding, SUPPORTED_SYSTEMS
+from bridge_model import load_rule_records, HandData, SuitHolding, SUPPORTED_SYSTEMS
 from bridge_engine import find_bid
 
 # --- CONFIGURATION ---
@@ -13,7 +13,8 @@ MAX_ATTEMPTS = 50000
 
 class HandFactory:
     def __init__(self, rules_file_path):
-        self.rules = load_rules(rules_file_path)
+        # Rule records, compiled once: find_bid would otherwise convert raw dicts on every call
+        self.rules = load_rule_records(rules_file_path)
         
     def _deal_hand(self):
         """Creates a random bridge deal."""
@@ -1,8 +1,137 @@
+import sys
 import json
 import os
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
-def merge_all_systems():
+sys.path.append(str(Path(__file__).parent))
+from tree_flattener import clean_bid_key
+
+# --- DEEP MERGE ---
+# Chunks are merged node by node instead of with dict.update(): two chunks that both define
+# "1H" combine their responses, and only a field defined twice with different values is a
+# conflict (the later chunk wins, as before, and the conflict is reported with both files).
+# Every input value is visited once, so the merge is linear in the size of the chunks.
+
+def _origin(origins, path):
+    """The chunk a merged value came from: recorded where it was inserted, so look upwards."""
+    while path:
+        if path in origins:
+            return origins[path]
+        path = path[:-1]
+    return None
+
+def _auction_and_field(path):
+    # ("1H", "responses", "2NT", "logic", "min_hcp") -> (["1H", "2NT"], "logic.min_hcp")
+    auction, i = [path[0]], 1
+    while i + 1 < len(path) and path[i] == "responses":
+        auction.append(path[i + 1])
+        i += 2
+    return auction, ".".join(path[i:])
+
+def deep_merge(target, source, file_name, origins, conflicts, labels=None):
+    """
+    Merges one chunk's tree into `target` in place, appending conflicts (see merge_chunks).
+    `origins` (path -> file) and `labels` (tree level -> {bid: key}) carry over between chunks.
+    """
+    labels = {} if labels is None else labels
+    stack = [(target, source, ())]
+    while stack:
+        into, data, path = stack.pop()
+        # Tree levels (the top and every "responses") hold bids; keys are labels like "2C (Stayman)"
+        level = not path or path[-1] == "responses"
+        bids = None
+        if level:
+            bids = labels.get(id(into))
+            if bids is None:
+                bids = labels[id(into)] = {clean_bid_key(k): k for k in into}
+
+        for key, value in data.items():
+            here = path + (key,)
+            if key not in into:
+                bid = clean_bid_key(key) if level else None
+                if bid and bids.get(bid, key) != key:
+                    # Same call, different label: both are kept (as before), but it is one auction node
+                    auction, _ = _auction_and_field(here)
+                    conflicts.append({"auction": auction[:-1] + [bid], "field": "label",
+                                      "first": (_origin(origins, path + (bids[bid],)), bids[bid]),
+                                      "second": (file_name, key)})
+                elif bid:
+                    bids[bid] = key
+                into[key] = value
+                origins[here] = file_name
+            elif isinstance(into[key], dict) and isinstance(value, dict):
+                stack.append((into[key], value, here))
+            elif into[key] != value:
+                auction, field = _auction_and_field(here)
+                conflicts.append({"auction": auction, "field": field,
+                                  "first": (_origin(origins, here), into[key]),
+                                  "second": (file_name, value)})
+                into[key] = value
+                origins[here] = file_name
+
+def merge_chunks(chunk_files, verbose=True, log=print, conflicts=None):
+    """
+    Deep-merges chunk files (in the given order) into one tree.
+    Returns (merged tree, number of chunks used). Conflicts are logged and, if a list is
+    given, appended to it as {"auction", "field", "first": (file, value), "second": (file, value)}.
+    """
+    merged_tree = {}
+    files_count = 0
+    origins, labels = {}, {}
+    found = [] if conflicts is None else conflicts
+    for file_path in chunk_files:
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            log(f"   ❌ Error in {file_path.name}: {e}")
+            continue
+        if not isinstance(data, dict):
+            log(f"   ⚠️  Skipping {file_path.name}: Root not a dict.")
+            continue
+        seen = len(found)
+        deep_merge(merged_tree, data, file_path.name, origins, found, labels)
+        files_count += 1
+        if verbose: log(f"   + Merged chunk: {file_path.name}")
+        for c in found[seen:]:
+            log(f"   ⚠️  Conflict at {' - '.join(c['auction'])} {c['field']}: "
+                f"{c['first'][0]}={c['first'][1]!r} vs {c['second'][0]}={c['second'][1]!r} ({c['second'][0]} wins)")
+    return merged_tree, files_count
+
+def chunk_files_for(system_folder):
+    # Sorted, so the merge order (and so the result) doesn't depend on the filesystem
+    return sorted(Path(system_folder).glob("*.json"))
+
+def write_tree(output_file, tree):
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(tree, f, indent=2)
+
+def merge_system(system_folder, output_dir):
+    """
+    Merges one system folder into <output_dir>/<system>_tree.json.
+    Runs in a worker process, so its messages are returned (and printed in order by the caller).
+    """
+    system_folder = Path(system_folder)
+    output_file = Path(output_dir) / f"{system_folder.name}_tree.json"
+    lines = [f"📂 Processing System: {system_folder.name}"]
+
+    conflicts = []
+    merged_tree, files_count = merge_chunks(chunk_files_for(system_folder), log=lines.append, conflicts=conflicts)
+
+    if files_count > 0:
+        write_tree(output_file, merged_tree)
+        note = f" ({len(conflicts)} conflicts, see above)" if conflicts else ""
+        lines.append(f"   ✅ Created '{output_file.name}' from {files_count} chunks{note}.")
+    else:
+        lines.append(f"   ⚠️  No files found for {system_folder.name}.")
+    return lines
+
+def merge_all_systems(workers=None):
+    """
+    Merges every system folder, one process per system (workers=0 merges in this process).
+    Output is printed in folder-name order, whatever order the workers finish in.
+    """
     # Base directory containing the system subfolders
     base_chunks_dir = Path("systems/chunks")
     output_dir = Path("systems")
@@ -13,38 +142,18 @@ def merge_all_systems():
 
     print(f"🏭 Starting System Factory Scan in {base_chunks_dir}...\n")
 
-    # Loop through every SUBFOLDER in chunks (e.g., 'sayc', 'audrey_grant_basic')
-    for system_folder in base_chunks_dir.iterdir():
-        if system_folder.is_dir():
-            system_name = system_folder.name
-            output_file = output_dir / f"{system_name}_tree.json"
-            
-            print(f"📂 Processing System: {system_name}")
-            
-            merged_tree = {}
-            files_count = 0
-            
-            # Merge all JSONs in this specific folder
-            for file_path in system_folder.glob("*.json"):
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        if isinstance(data, dict):
-                            merged_tree.update(data)
-                            files_count += 1
-                            print(f"   + Merged chunk: {file_path.name}")
-                        else:
-                            print(f"   ⚠️  Skipping {file_path.name}: Root not a dict.")
-                except Exception as e:
-                    print(f"   ❌ Error in {file_path.name}: {e}")
-            
-            if files_count > 0:
-                with open(output_file, "w", encoding="utf-8") as f:
-                    json.dump(merged_tree, f, indent=2)
-                print(f"   ✅ Created '{output_file.name}' from {files_count} chunks.")
-            else:
-                print(f"   ⚠️  No files found for {system_name}.")
-            print("-" * 30)
+    # Every SUBFOLDER in chunks (e.g., 'sayc', 'audrey_grant_basic') is an independent job
+    folders = sorted(p for p in base_chunks_dir.iterdir() if p.is_dir())
+    if workers == 0 or len(folders) <= 1:
+        results = [merge_system(folder, output_dir) for folder in folders]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(folders))) as pool:
+            results = list(pool.map(merge_system, folders, [output_dir] * len(folders)))
+
+    for lines in results:
+        for line in lines:
+            print(line)
+        print("-" * 30)
 
 if __name__ == "__main__":
-    merge_all_systems()
\ No newline at end of file
+    merge_all_systems()
@@ -0,0 +1,133 @@
+import sys
+import json
+import time
+import sqlite3
+import logging
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from bridge_model import load_rules_fast, save_rules, rule_signature
+
+logger = logging.getLogger("RULE_DB")
+
+# --- SCHEMA ---
+# One row per rule signature (see bridge_model.rule_signature). `id` keeps file order:
+# an upsert rewrites the body in place, so a replaced rule keeps its position, exactly
+# like dedupe_rules' last-writer-wins map. The full rule is stored as JSON in `body`.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rules (
+    id      INTEGER PRIMARY KEY,
+    system  TEXT NOT NULL,
+    auction TEXT NOT NULL,
+    bid     TEXT NOT NULL,
+    body    TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS rules_signature ON rules (system, auction, bid);
+"""
+
+UPSERT = """
+INSERT INTO rules (system, auction, bid, body, updated) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (system, auction, bid) DO UPDATE SET body = excluded.body, updated = excluded.updated
+"""
+
+def _auction_key(auction):
+    return json.dumps(list(auction))
+
+def _row_values(rule, now):
+    system, auction, bid = rule_signature(rule)
+    return (system, _auction_key(auction), bid, json.dumps(rule), now)
+
+class RuleDB:
+    """
+    SQLite home for the flat rules: each change writes only its own rows, and WAL mode lets
+    readers keep working (on the last committed state) while a writer is busy.
+    The YAML file stays the interchange format; see import_yaml / export_yaml.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM rules").fetchone()[0]
+
+    # --- WRITES ---
+    def upsert(self, rules):
+        """Adds or replaces rules by signature in one transaction. Returns the number written."""
+        now = time.time()
+        rows = [_row_values(r, now) for r in rules]
+        with self.conn:
+            self.conn.executemany(UPSERT, rows)
+        return len(rows)
+
+    def delete(self, system, auction, bid):
+        """Removes one rule by signature. Returns True if it existed."""
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM rules WHERE system = ? AND auction = ? AND bid = ?",
+                                    (system, _auction_key(auction), str(bid).strip().upper()))
+        return cur.rowcount > 0
+
+    # --- READS ---
+    def rules(self, system=None, auction=None):
+        """Rules in file order, optionally for one system and/or one auction (both use the index)."""
+        sql, args = "SELECT body FROM rules", []
+        where = []
+        if system is not None:
+            where.append("system = ?"); args.append(system)
+        if auction is not None:
+            where.append("auction = ?"); args.append(_auction_key(auction))
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id"
+        return [json.loads(body) for (body,) in self.conn.execute(sql, args)]
+
+    def systems(self):
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT system FROM rules ORDER BY system")]
+
+    # --- YAML INTERCHANGE ---
+    def import_yaml(self, yaml_path):
+        """Upserts every rule from a flat_rules.yaml (later duplicates win, as in dedupe_rules)."""
+        count = self.upsert(load_rules_fast(yaml_path))
+        logger.info(f"📥 Imported {count} rules from {Path(yaml_path).name} ({len(self)} unique).")
+        return count
+
+    def export_yaml(self, yaml_path):
+        """Writes all rules to YAML via a temp file + rename, so readers never see a partial file."""
+        yaml_path = Path(yaml_path)
+        rules = self.rules()
+        tmp_path = yaml_path.with_suffix(yaml_path.suffix + ".tmp")
+        save_rules(tmp_path, rules)
+        tmp_path.replace(yaml_path)
+        logger.info(f"📤 Exported {len(rules)} rules to {yaml_path.name}.")
+        return len(rules)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    project_root = Path(__file__).resolve().parent.parent
+    default_yaml = project_root / "systems" / "flat_rules.yaml"
+    default_db = project_root / "systems" / "flat_rules.db"
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ("import", "export"):
+        print("Usage: python src/rule_db.py import|export [yaml_path] [db_path]")
+    else:
+        yaml_path = Path(sys.argv[2]) if len(sys.argv) > 2 else default_yaml
+        db_path = Path(sys.argv[3]) if len(sys.argv) > 3 else default_db
+        with RuleDB(db_path) as db:
+            if sys.argv[1] == "import":
+                db.import_yaml(yaml_path)
+            else:
+                db.export_yaml(yaml_path)
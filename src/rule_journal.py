@@ -0,0 +1,171 @@
+import os
+import sys
+import json
+import logging
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from bridge_model import load_rules, save_rules, rule_signature
+
+logger = logging.getLogger("JOURNAL")
+
+COMPACT_THRESHOLD = 500  # Journal entries before maybe_compact() folds them into the snapshot
+
+# --- FILES ---
+#   flat_rules.yaml                 the snapshot
+#   flat_rules.journal              live journal, one JSON entry per line, append only
+#   flat_rules.journal.compacting   journal being folded in by a compaction
+#
+# Entries: {"op": "put", "rule": {...}} or {"op": "del", "sig": [system, auction, bid]}.
+# State = snapshot, then the compacting journal, then the live journal, replayed with
+# dedupe_rules' last-writer-wins rule: a put replaces the rule with the same signature
+# in place, a new signature goes on the end. The engines read that state (see with_journal).
+
+def _replay(state, path):
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return 0
+    count = 0
+    with f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Only the last line can be torn (a crash mid-append); anything after it is lost anyway
+                logger.warning(f"⚠️ Skipping unreadable journal line {line_no} in {path.name}")
+                continue
+            if entry.get("op") == "put":
+                rule = entry["rule"]
+                state[rule_signature(rule)] = rule
+            elif entry.get("op") == "del":
+                system, auction, bid = entry["sig"]
+                state.pop((system, tuple(auction), bid), None)
+            count += 1
+    return count
+
+def journal_paths(rules_path):
+    """The journals beside a rules file, in replay order (the compacting one first)."""
+    rules_path = Path(rules_path)
+    return [rules_path.with_suffix(".journal.compacting"), rules_path.with_suffix(".journal")]
+
+def with_journal(rules_path, rules):
+    """
+    `rules` (the snapshot's) with the journals replayed on top, i.e. what compaction would write.
+    The engines read rules through this, so appended rules count before compaction.
+    Returns `rules` itself when there is no journal.
+    """
+    paths = [p for p in journal_paths(rules_path) if p.exists()]
+    if not paths:
+        return rules
+    state = {}
+    for r in rules:
+        state[rule_signature(r)] = r
+    for path in paths:
+        _replay(state, path)
+    return list(state.values())
+
+def _count_lines(path):
+    if not path.exists():
+        return 0
+    with open(path, "r", encoding="utf-8") as f:
+        return sum(1 for line in f if line.strip())
+
+class RuleJournal:
+    """
+    Rule edits as an append-only log next to the YAML snapshot.
+    append() costs one line per rule however big the rule set is; compact() folds the journal
+    into a new snapshot and drops superseded duplicates, replacing a separate dedupe pass.
+    """
+
+    def __init__(self, rules_path):
+        self.rules_path = Path(rules_path)
+        self.compacting_path, self.journal_path = journal_paths(self.rules_path)
+        self._lock = threading.Lock()
+        self._compactor = None
+        self.pending = _count_lines(self.compacting_path) + _count_lines(self.journal_path)
+
+    def _write(self, entries):
+        with self._lock:
+            with open(self.journal_path, "a+", encoding="utf-8") as f:
+                if f.tell() > 0:
+                    # Don't glue a new entry onto a line torn by a crash
+                    f.seek(f.tell() - 1)
+                    if f.read(1) != "\n": f.write("\n")
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.pending += len(entries)
+
+    # --- WRITES ---
+    def append(self, rules):
+        """Records new or replacement rules. Returns the number appended."""
+        rules = list(rules)
+        self._write([{"op": "put", "rule": r} for r in rules])
+        return len(rules)
+
+    def delete(self, system, auction, bid):
+        self._write([{"op": "del", "sig": [system, list(auction), str(bid).strip().upper()]}])
+
+    # --- READS ---
+    def load(self):
+        """The current rules: snapshot plus journal, one rule per signature, in file order."""
+        with self._lock:
+            state = {}
+            for r in load_rules(self.rules_path):
+                state[rule_signature(r)] = r
+            _replay(state, self.compacting_path)
+            _replay(state, self.journal_path)
+        return list(state.values())
+
+    # --- COMPACTION ---
+    def compact(self):
+        """
+        Folds the journal into a new snapshot. Appends made while this runs go to a fresh
+        journal and are kept. Returns the number of rules in the new snapshot.
+        """
+        with self._lock:
+            # Rotate: the live journal becomes the one being compacted (unless a crashed
+            # compaction left one behind, which is simply folded in again).
+            if self.journal_path.exists() and not self.compacting_path.exists():
+                self.journal_path.replace(self.compacting_path)
+
+        state = {}
+        for r in load_rules(self.rules_path):
+            state[rule_signature(r)] = r
+        folded = _replay(state, self.compacting_path)
+        rules = list(state.values())
+
+        tmp_path = self.rules_path.with_suffix(self.rules_path.suffix + ".tmp")
+        save_rules(tmp_path, rules)
+        tmp_path.replace(self.rules_path)  # Readers see the old snapshot or the new one
+        with self._lock:
+            self.compacting_path.unlink(missing_ok=True)
+            self.pending = _count_lines(self.journal_path)
+        logger.info(f"🗜️ Compacted {folded} journal entries into {self.rules_path.name} ({len(rules)} rules, {self.pending} appended meanwhile).")
+        return len(rules)
+
+    def maybe_compact(self, threshold=COMPACT_THRESHOLD):
+        """Starts a background compaction once the journal holds `threshold` entries."""
+        if self.pending < threshold or (self._compactor and self._compactor.is_alive()):
+            return None
+        self._compactor = threading.Thread(target=self.compact, name="rule-journal-compactor", daemon=True)
+        self._compactor.start()
+        return self._compactor
+
+    def wait(self):
+        """Blocks until a background compaction (if any) has finished."""
+        if self._compactor:
+            self._compactor.join()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    rules_path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).resolve().parent.parent / "systems" / "flat_rules.yaml"
+    journal = RuleJournal(rules_path)
+    print(f"📒 {journal.pending} journal entries pending for {rules_path.name}.")
+    journal.compact()
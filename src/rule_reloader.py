@@ -0,0 +1,94 @@
+import os
+import sys
+import time
+import logging
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from bridge_model import RuleIndex, load_yaml_fast
+from system_compiler import load_rule_index
+from rule_journal import journal_paths, with_journal
+
+logger = logging.getLogger("RELOADER")
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return None
+
+def _rules_stamp(rules_path):
+    """Stamp of the rules file and its journals; None if the rules file itself is missing."""
+    stamp = _file_stamp(rules_path)
+    if stamp is None:
+        return None
+    return (stamp,) + tuple(_file_stamp(p) for p in journal_paths(rules_path))
+
+class RuleReloader:
+    """
+    Keeps a RuleIndex in step with its YAML file (and its rule journal) for long-running processes.
+
+    - The files are stat'ed at most once per `poll_interval` seconds (inside current()).
+    - On a change only the (system, auction) nodes whose source rules changed are compiled again;
+      every other node reuses the compiled tuple from the previous index.
+    - The new index is swapped in as one reference, so a caller that grabbed current() keeps a
+      consistent view for the rest of its request.
+    - Listeners are called with the set of changed node keys, so caches can drop just those.
+    """
+
+    def __init__(self, rules_path, poll_interval=1.0):
+        self.rules_path = Path(rules_path)
+        self.poll_interval = poll_interval
+        self.index = load_rule_index(self.rules_path)
+        self.version = 0
+        self.listeners = []
+        self._stamp = _rules_stamp(self.rules_path)
+        self._next_check = time.monotonic() + poll_interval
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        """callback(changed_keys) runs after each reload that changed something."""
+        self.listeners.append(callback)
+
+    def current(self):
+        """Returns the live RuleIndex, reloading first if the file has changed."""
+        if time.monotonic() >= self._next_check:
+            self.check()
+        return self.index
+
+    def check(self):
+        """Stats the file now and reloads if it changed. Returns the set of changed node keys."""
+        self._next_check = time.monotonic() + self.poll_interval
+        stamp = _rules_stamp(self.rules_path)
+        if stamp == self._stamp or stamp is None:
+            return set()
+        return self.reload(stamp)
+
+    def reload(self, stamp=None):
+        with self._lock:
+            stamp = stamp or _rules_stamp(self.rules_path)
+            start = time.perf_counter()
+            try:
+                raw = with_journal(self.rules_path, load_yaml_fast(self.rules_path) or [])
+            except Exception as e:
+                # Half-written file (an editor mid-save): keep serving the old index, retry next poll
+                logger.warning(f"Reload of {self.rules_path.name} failed, keeping previous rules: {e}")
+                return set()
+
+            old = self.index
+            new = RuleIndex.from_rules(raw, previous=old)
+            changed = new.changed_keys(old)
+            self.index = new
+            self._stamp = stamp
+            if not changed:
+                return changed
+
+            self.version += 1
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            logger.info(f"🔄 Reloaded {self.rules_path.name}: {len(changed)} node(s) changed ({elapsed_ms:.1f} ms).")
+
+        for callback in self.listeners:
+            callback(changed)
+        return changed
@@ -0,0 +1,249 @@
+import re
+import sys
+import time
+import logging
+from bisect import bisect_left
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from bid_codec import encode_bid, decode_auction
+from system_compiler import (DEFAULT_RULES, compiled_dir_for, source_digest, load_rule_index,
+                             write_artifact, read_artifact_any)
+
+logger = logging.getLogger("SEARCH")
+
+# --- CONVENTIONS ---
+# Rules don't carry a convention field, so conventions are recognised from the rule text.
+# Name -> phrases (lower case); a rule belongs to a convention if any phrase appears.
+CONVENTIONS = {
+    "Stayman": ["stayman"],
+    "Jacoby Transfer": ["jacoby transfer", "transfer to"],
+    "Jacoby 2NT": ["jacoby 2nt"],
+    "Texas Transfer": ["texas"],
+    "Blackwood": ["blackwood"],
+    "Gerber": ["gerber"],
+    "Splinter": ["splinter"],
+    "Dustbin": ["dustbin"],
+    "Weak Two": ["weak two", "weak 2"],
+    "Strong 2C": ["strong artificial", "strong 2c", "2c opening"],
+    "Inverted Minors": ["inverted"],
+    "Limit Raise": ["limit raise"],
+    "Jump Shift": ["jump shift"],
+    "2/1 Game Forcing": ["2/1", "game forcing", "game-forcing"],
+    "Reverse": ["reverse"],
+    "New Minor Forcing": ["new minor forcing"],
+    "Fourth Suit Forcing": ["fourth suit"],
+    "Drury": ["drury"],
+}
+
+TEXT_FIELDS = ("explanation", "nuance", "source")
+STOPWORDS = {"a", "an", "and", "the", "of", "to", "in", "is", "it", "or", "for", "on", "with", "at", "be", "by", "as"}
+_TOKEN = re.compile(r"[a-z0-9/+]+")
+
+def tokenize(text):
+    return [t for t in _TOKEN.findall(str(text).lower()) if t not in STOPWORDS]
+
+# --- THE INDEX ---
+class RuleSearch:
+    """
+    Reverse and full-text indexes over a RuleIndex:
+      - bid code -> rules making that bid (so: every auction where 2D is bid)
+      - convention name -> rules (see CONVENTIONS)
+      - token -> rules whose explanation/nuance/source contain it
+      - system -> its rules
+    Every posting is a set of doc ids; a query intersects the smallest sets first.
+    Docs are grouped by RuleIndex node, so update() only re-indexes nodes whose fingerprint changed
+    (a RuleReloader listener can simply call search.update(reloader.index)).
+    """
+
+    VERSION = 2  # Bump when the postings change; a stored index of another version is rebuilt
+
+    def __init__(self):
+        self.version = self.VERSION
+        self.docs = {}          # doc id -> (system, auction codes, bid, explanation)
+        self.node_docs = {}     # (system, auction codes) -> [doc ids]
+        self.fingerprints = {}  # (system, auction codes) -> fingerprint the node was indexed at
+        self.by_bid = {}        # bid code -> {doc ids}
+        self.by_convention = {} # convention name -> {doc ids}
+        self.by_system = {}     # system -> {doc ids}
+        self.tokens = {}        # token -> {doc ids}
+        self._doc_tokens = {}   # doc id -> (bid code, conventions, tokens), for removal
+        self._vocabulary = None # sorted tokens, rebuilt lazily for prefix queries
+        self._next_id = 0
+
+    @classmethod
+    def build(cls, index):
+        search = cls()
+        search.update(index)
+        return search
+
+    def __len__(self):
+        return len(self.docs)
+
+    # --- MAINTENANCE ---
+    def update(self, index):
+        """Brings the indexes in line with a RuleIndex. Returns the set of node keys re-indexed."""
+        keys = set(self.fingerprints) | set(index.fingerprints)
+        changed = {k for k in keys if self.fingerprints.get(k) != index.fingerprints.get(k)}
+        for key in changed:
+            self._remove_node(key)
+            if key in index.nodes:
+                self._add_node(key, index.nodes[key], index.fingerprints[key])
+        if changed:
+            self._vocabulary = None
+        return changed
+
+    def _add_node(self, key, rules, fingerprint):
+        system, auction = key
+        ids = []
+        for rule in rules:
+            doc_id = self._next_id
+            self._next_id += 1
+            c = rule.constraints
+            text = " ".join(getattr(c, field) for field in TEXT_FIELDS)
+            lowered = text.lower()
+            conventions = tuple(name for name, phrases in CONVENTIONS.items() if any(p in lowered for p in phrases))
+            tokens = set(tokenize(text))
+
+            self.docs[doc_id] = (system, auction, rule.bid, c.explanation)
+            self.by_bid.setdefault(rule.bid_code, set()).add(doc_id)
+            self.by_system.setdefault(system, set()).add(doc_id)
+            for name in conventions:
+                self.by_convention.setdefault(name, set()).add(doc_id)
+            for token in tokens:
+                self.tokens.setdefault(token, set()).add(doc_id)
+            self._doc_tokens[doc_id] = (rule.bid_code, conventions, tokens)
+            ids.append(doc_id)
+        self.node_docs[key] = ids
+        self.fingerprints[key] = fingerprint
+
+    def _remove_node(self, key):
+        for doc_id in self.node_docs.pop(key, ()):
+            bid_code, conventions, tokens = self._doc_tokens.pop(doc_id)
+            _discard(self.by_bid, bid_code, doc_id)
+            _discard(self.by_system, self.docs[doc_id][0], doc_id)
+            for name in conventions:
+                _discard(self.by_convention, name, doc_id)
+            for token in tokens:
+                _discard(self.tokens, token, doc_id)
+            del self.docs[doc_id]
+        self.fingerprints.pop(key, None)
+
+    # --- QUERIES ---
+    def _token_postings(self, token):
+        if not token.endswith("*"):
+            return self.tokens.get(token, set())
+        # Prefix query: "dust*" matches dustbin
+        prefix = token[:-1]
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.tokens)
+        found = set()
+        for i in range(bisect_left(self._vocabulary, prefix), len(self._vocabulary)):
+            word = self._vocabulary[i]
+            if not word.startswith(prefix):
+                break
+            found |= self.tokens[word]
+        return found
+
+    def search(self, text="", system=None, bid=None, convention=None, stats=None):
+        """
+        Doc ids matching every given filter: all words of `text` (a trailing * makes a prefix),
+        the bid, the convention and the system. Returned in index order.
+        `stats`, if given, receives the number of doc ids the intersections went through ("scanned").
+        """
+        postings = []
+        if system is not None:
+            postings.append(self.by_system.get(system, set()))
+        if bid is not None:
+            postings.append(self.by_bid.get(encode_bid(bid), set()))
+        if convention is not None:
+            postings.append(self.by_convention.get(convention, set()))
+        for word in str(text).lower().split():
+            if word.endswith("*") and len(word) > 1:
+                postings.append(self._token_postings(word))
+            else:
+                postings.extend(self._token_postings(token) for token in tokenize(word))
+
+        if postings:
+            postings.sort(key=len)
+            hits = set(postings[0])
+            scanned = len(hits)
+            for other in postings[1:]:
+                scanned += min(len(hits), len(other))  # set & walks the smaller side
+                hits &= other
+                if not hits:
+                    break
+        else:
+            hits = set(self.docs)
+            scanned = len(hits)
+        if stats is not None:
+            stats["scanned"] = scanned
+        return sorted(hits)
+
+    def rules(self, doc_ids):
+        """Readable rows for doc ids: dicts with system, auction (strings), bid and explanation."""
+        rows = []
+        for doc_id in doc_ids:
+            system, auction, bid, explanation = self.docs[doc_id]
+            rows.append({"system": system, "auction": decode_auction(auction), "bid": bid, "explanation": explanation})
+        return rows
+
+    def auctions_for_bid(self, bid, text="", system=None, convention=None):
+        """Distinct auctions where `bid` is a rule's call, e.g. auctions_for_bid('2D', 'stayman')."""
+        seen = {}
+        for doc_id in self.search(text, system=system, bid=bid, convention=convention):
+            doc_system, auction = self.docs[doc_id][:2]
+            seen.setdefault((doc_system, auction), None)
+        return [(s, decode_auction(a)) for s, a in seen]
+
+    def conventions(self):
+        return {name: len(ids) for name, ids in sorted(self.by_convention.items())}
+
+def _discard(postings, key, doc_id):
+    ids = postings.get(key)
+    if ids is None:
+        return
+    ids.discard(doc_id)
+    if not ids:
+        del postings[key]
+
+# --- PERSISTENCE ---
+# Stored in systems/compiled/ next to the rule artifacts. A stale file is not thrown away:
+# it is updated node by node against the current RuleIndex and written back.
+
+def _search_artifact_path(rules_path):
+    rules_path = Path(rules_path)
+    return compiled_dir_for(rules_path) / f"{rules_path.stem}.search.bmc"
+
+def load_search_index(rules_path=DEFAULT_RULES, index=None):
+    """The RuleSearch for a rules file: from disk when current, else incrementally refreshed and saved."""
+    rules_path = Path(rules_path)
+    digest = source_digest(rules_path)
+    path = _search_artifact_path(rules_path)
+    stored_digest, search = read_artifact_any(path)
+    if getattr(search, "version", None) != RuleSearch.VERSION:
+        search = None  # Written by an older RuleSearch: rebuilt from scratch
+    if search is not None and stored_digest == digest and index is None:
+        return search
+
+    start = time.perf_counter()
+    index = index if index is not None else load_rule_index(rules_path)
+    search = search if search is not None else RuleSearch()
+    changed = search.update(index)
+    write_artifact(path, digest, search)
+    logger.info(f"🔎 Search index for {rules_path.name}: {len(changed)} node(s) re-indexed "
+                f"in {(time.perf_counter() - start) * 1000:.1f} ms ({len(search)} rules).")
+    return search
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    search = load_search_index()
+    query = " ".join(a for a in sys.argv[1:] if not a.startswith("--"))
+    bid = next((a.split("=", 1)[1] for a in sys.argv[1:] if a.startswith("--bid=")), None)
+
+    start = time.perf_counter()
+    hits = search.search(query, bid=bid)
+    elapsed_us = (time.perf_counter() - start) * 1e6
+    print(f"✅ {len(hits)} rule(s) for {query!r}{f' bidding {bid}' if bid else ''} ({elapsed_us:.0f} µs)")
+    for row in search.rules(hits)[:25]:
+        print(f"   [{row['system']}] {' - '.join(row['auction']) or 'Opening'} : {row['bid']}  {row['explanation']}")
@@ -0,0 +1,76 @@
+import csv
+import json
+import threading
+from pathlib import Path
+
+class RuleStats:
+    """
+    Opt-in per-rule counters for the bidding engines.
+    Pass an instance as `stats=` to an engine; leave it as None to skip all bookkeeping.
+    Entries are keyed by (system, auction, bid).
+    """
+    FIELDS = ["system", "auction", "bid", "evaluations", "matches", "total_ms"]
+
+    def __init__(self):
+        # Key -> [evaluations, matches, cumulative seconds]
+        self._counts = {}
+        self._lock = threading.Lock()  # Engines may record from several threads
+
+    def record(self, system, auction, bid, matched, elapsed):
+        key = (system, tuple(auction), bid)
+        with self._lock:
+            entry = self._counts.get(key)
+            if entry is None:
+                entry = self._counts[key] = [0, 0, 0.0]
+            entry[0] += 1
+            if matched: entry[1] += 1
+            entry[2] += elapsed
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+    def __len__(self):
+        return len(self._counts)
+
+    def rows(self, rules=None):
+        """
+        Returns one dict per rule, hottest first.
+        If `rules` is given, rules that were never evaluated are included with zero counts.
+        """
+        with self._lock:
+            counts = {key: list(entry) for key, entry in self._counts.items()}
+        for r in rules or []:
+            key = (r.get('system', 'ALL'), tuple(r.get('auction', [])), r.get('bid'))
+            counts.setdefault(key, [0, 0, 0.0])
+
+        rows = []
+        for (system, auction, bid), (evals, matches, seconds) in counts.items():
+            rows.append({
+                "system": system,
+                "auction": " - ".join(auction),
+                "bid": bid,
+                "evaluations": evals,
+                "matches": matches,
+                "total_ms": round(seconds * 1000, 3)
+            })
+        rows.sort(key=lambda row: (-row["evaluations"], row["system"], row["auction"], str(row["bid"])))
+        return rows
+
+    def dead_rules(self, rules):
+        """Rules that never matched a hand (including ones never evaluated)."""
+        return [row for row in self.rows(rules) if row["matches"] == 0]
+
+    def export_json(self, file_path, rules=None):
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(self.rows(rules), f, indent=2)
+
+    def export_csv(self, file_path, rules=None):
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+            writer.writeheader()
+            writer.writerows(self.rows(rules))
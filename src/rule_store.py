@@ -0,0 +1,157 @@
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from bridge_model import Constraints
+from system_compiler import load_rule_index
+from rule_reloader import RuleReloader
+
+# --- INTERNING ---
+# The systems share most of their vocabulary: the same explanation text, the same
+# auction contexts, often identical constraint blocks. Interning makes every copy
+# point at one object.
+
+class Interner:
+    def __init__(self):
+        self._auctions = {}
+        self._constraints = {}
+
+    def auction(self, auction):
+        return self._auctions.setdefault(auction, auction)
+
+    def constraints(self, c):
+        key = tuple(getattr(c, field) for field in Constraints.FIELDS)
+        shared = self._constraints.get(key)
+        if shared is None:
+            for field in ("shape_requirements", "explanation", "nuance", "source"):
+                setattr(c, field, sys.intern(getattr(c, field)))
+            shared = self._constraints[key] = c
+        return shared
+
+    def rule(self, r):
+        """Interns a Rule's fields in place (keeps its identity, so reload reuse still works)."""
+        r.system = sys.intern(r.system)
+        r.bid = sys.intern(r.bid)
+        if isinstance(r.type, str): r.type = sys.intern(r.type)
+        r.auction = self.auction(r.auction)
+        r.constraints = self.constraints(r.constraints)
+        return r
+
+    def index(self, index, keys=None):
+        """Interns every rule of `index` (or only the nodes in `keys`)."""
+        for key in (index.nodes if keys is None else keys):
+            group = index.nodes.get(key)
+            if group is None:
+                continue
+            for r in group:
+                self.rule(r)
+        return index
+
+    def stats(self):
+        return {"auctions": len(self._auctions), "constraints": len(self._constraints)}
+
+# --- PROCESS-WIDE STORE ---
+
+class RuleStore:
+    """
+    One copy of every system's rules per process, shared by every consumer.
+    Use get_store() rather than constructing this directly.
+
+    Without auto_reload nothing is read up front: view(system) loads just that system's
+    compiled artifact on first use, and current() loads the rest only when asked.
+    """
+
+    def __init__(self, rules_path, auto_reload=False, poll_interval=1.0):
+        self.rules_path = Path(rules_path)
+        self.interner = Interner()
+        self.reloader = None
+        self._index = None
+        self._views = {}
+        self._lock = threading.Lock()
+        if auto_reload:
+            self.enable_auto_reload(poll_interval)
+
+    def enable_auto_reload(self, poll_interval=1.0):
+        """Starts watching the rules file (a no-op if already on). Views loaded so far are rebuilt."""
+        with self._lock:
+            if self.reloader is not None:
+                return
+            reloader = RuleReloader(self.rules_path, poll_interval)
+            self._index = self.interner.index(reloader.index)
+            self._views = {}
+            reloader.add_listener(self._on_reload)
+            self.reloader = reloader
+
+    def _on_reload(self, changed_keys):
+        # Only the recompiled nodes need interning; the rest were interned already
+        self._index = self.interner.index(self.reloader.index, changed_keys)
+
+    def _load_all(self):
+        index = load_rule_index(self.rules_path)
+        # Systems already loaded by view() keep their tuples, so views and the full index agree
+        for key in index.nodes:
+            cached = self._views.get(key[0])
+            if cached is not None and key in cached[1].nodes:
+                index.nodes[key] = cached[1].nodes[key]
+        return self.interner.index(index)
+
+    def current(self):
+        """The full RuleIndex (all systems), reloaded first if auto_reload is on."""
+        if self.reloader:
+            self.reloader.current()
+            return self._index
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._load_all()
+        return self._index
+
+    def view(self, system):
+        """
+        A per-system RuleIndex. It shares the store's rule tuples, so it only costs a small dict.
+        Views are rebuilt lazily after a reload.
+        """
+        if self.reloader is None:
+            with self._lock:
+                cached = self._views.get(system)
+                if cached is None:
+                    if self._index is not None:
+                        part = self._index.subset((system,))
+                    else:
+                        part = self.interner.index(load_rule_index(self.rules_path, systems=(system,)))
+                    cached = self._views[system] = (None, part)
+                return cached[1]
+
+        index = self.current()
+        with self._lock:
+            cached = self._views.get(system)
+            if cached is None or cached[0] is not index:
+                cached = self._views[system] = (index, index.subset((system,)))
+            return cached[1]
+
+    def loaded_systems(self):
+        """Systems whose rules are in memory so far."""
+        if self._index is not None:
+            return self._index.systems()
+        return sorted(self._views)
+
+    def systems(self):
+        return self.current().systems()
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+def get_store(rules_path, auto_reload=False):
+    """
+    Returns the process-wide RuleStore for a rules file, loading it on first use.
+    Asking for auto_reload turns it on for the shared store even if an earlier caller didn't.
+    """
+    key = Path(rules_path).resolve()
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = RuleStore(key, auto_reload=auto_reload)
+        elif auto_reload:
+            store.enable_auto_reload()
+        return store
@@ -1,6 +1,7 @@
 import os
 import sys
 import json
+import asyncio
 import re
 import logging
 from pathlib import Path
@@ -12,6 +13,9 @@ logger = logging.getLogger("ARCHITECT")
 
 sys.path.append(str(Path(__file__).parent))
 from bridge_model import load_rules, save_rules, SUPPORTED_SYSTEMS
+from rule_db import RuleDB
+from rule_journal import RuleJournal
+from bid_codec import PASS, try_encode_bid, encode_bid, is_contract, is_sufficient, last_contract, decode_bid
 
 try:
     from google import genai
@@ -21,10 +25,22 @@ except ImportError:
     sys.exit(1)
 
 class SystemArchitect:
-    def __init__(self, api_key, rules_file):
+    def __init__(self, api_key, rules_file, db_path=None, use_journal=False):
         self.client = genai.Client(api_key=api_key)
         self.rules_file = rules_file
-        self.current_rules = load_rules(rules_file)
+        # Optional SQLite backend (see rule_db): new rules are upserted row by row instead of
+        # rewriting the whole YAML file. Export with `python src/rule_db.py export`.
+        self.db = RuleDB(db_path) if db_path else None
+        # Or an append-only journal beside the YAML (see rule_journal); call journal.compact() when done
+        self.journal = RuleJournal(rules_file) if use_journal and self.db is None else None
+        if self.journal is not None:
+            self.current_rules = self.journal.load()
+        elif self.db is not None:
+            if len(self.db) == 0 and Path(rules_file).exists():
+                self.db.import_yaml(rules_file)
+            self.current_rules = self.db.rules()
+        else:
+            self.current_rules = load_rules(rules_file)
         
         self.definitions = {}
         def_path = rules_file.parent / "system_definitions.json"
@@ -45,36 +61,14 @@ class SystemArchitect:
             text = re.sub(r"\s*```$", "", text)
         return text
 
-    def _get_bid_value(self, bid_str):
-        """Converts a bid (e.g., '1H') into an integer for comparison."""
-        if bid_str.upper() == "PASS": return -1
-        
-        suits = {'C': 0, 'D': 1, 'H': 2, 'S': 3, 'NT': 4}
-        # Parse regex: Level (1-7) + Suit (C/D/H/S/NT)
-        match = re.match(r"^([1-7])(C|D|H|S|NT)$", bid_str, re.IGNORECASE)
-        if not match:
-            return -999
-        
-        level = int(match.group(1))
-        suit_val = suits[match.group(2).upper()]
-        
-        # Formula: Level * 5 + Suit (so 1C=5, 1D=6... 1NT=9, 2C=10)
-        return (level * 5) + suit_val
-
     def _is_valid_bid(self, bid_str):
-        if bid_str.upper() == "PASS": return True
-        pattern = r"^[1-7](C|D|H|S|NT)$"
-        return bool(re.match(pattern, bid_str, re.IGNORECASE))
-
-    def _is_sufficient(self, last_bid, new_bid):
-        """Checks if new_bid is higher than last_bid."""
-        if new_bid.upper() == "PASS": return True # You can always pass
-        if not last_bid: return True # Opening bid is always sufficient
-        
-        val_last = self._get_bid_value(last_bid)
-        val_new = self._get_bid_value(new_bid)
-        
-        return val_new > val_last
+        """Pass or a contract bid (1C..7NT). Doubles are not rule bids."""
+        code = try_encode_bid(bid_str)
+        return code is not None and (code == PASS or is_contract(code))
+
+    def _is_sufficient(self, last_code, new_bid):
+        """Checks if new_bid is higher than the last contract bid (a code, or None for an opening)."""
+        return is_sufficient(last_code, encode_bid(new_bid))
 
     def _safe_int(self, val, default=0):
         if val is None: return default
@@ -83,12 +77,20 @@ class SystemArchitect:
         except (ValueError, TypeError):
             return default
 
-    def generate_system_rules(self, auction_path, target_system):
+    # --- GENERATION ---
+    # generate_system_rules() = build_prompt -> request_rules -> parse_rules -> commit_rules.
+    # The steps are separate so bulk_builder can run many requests concurrently
+    # (request_rules_async) and still commit the results one by one, in order.
+
+    def build_prompt(self, auction_path, target_system):
+        """The prompt for one auction, or None if the system or auction is not valid."""
         if target_system not in SUPPORTED_SYSTEMS:
             logger.error(f"System '{target_system}' is not supported.")
-            return
+            return None
 
-        last_bid = auction_path[-1] if auction_path else None
+        if None in (try_encode_bid(b) for b in auction_path):
+            logger.error(f"Auction {auction_path} contains an unknown call.")
+            return None
 
         if not auction_path:
             auction_str = "No Prior Bids (Opening Seat)"
@@ -100,7 +102,7 @@ class SystemArchitect:
         sys_config = self.definitions.get(target_system, {})
         sys_config_str = json.dumps(sys_config, indent=2)
 
-        prompt = f"""
+        return f"""
         Act as a Bridge System Expert.
         Generate the standard set of bidding rules for:
         - Context: {auction_str}
@@ -128,55 +130,90 @@ class SystemArchitect:
           }}
         """
 
-        try:
-            response = self.client.models.generate_content(
-                model="gemini-2.0-flash", 
-                contents=prompt,
-                config=types.GenerateContentConfig(response_mime_type="application/json")
-            )
-            
-            raw_text = response.text
-            clean_text = self._clean_json_response(raw_text)
-            data = json.loads(clean_text)
+    def request_rules(self, prompt):
+        """One model call. Returns the raw response text (errors propagate)."""
+        response = self.client.models.generate_content(
+            model="gemini-2.0-flash", 
+            contents=prompt,
+            config=types.GenerateContentConfig(response_mime_type="application/json")
+        )
+        return response.text
+
+    async def request_rules_async(self, prompt):
+        """request_rules() without blocking the event loop (the client's async API when it has one)."""
+        aio = getattr(self.client, "aio", None)
+        if aio is None:
+            return await asyncio.to_thread(self.request_rules, prompt)
+        response = await aio.models.generate_content(
+            model="gemini-2.0-flash",
+            contents=prompt,
+            config=types.GenerateContentConfig(response_mime_type="application/json")
+        )
+        return response.text
+
+    def parse_rules(self, raw_text, auction_path, target_system):
+        """Validated rules from a model response. Raises json.JSONDecodeError on a malformed reply."""
+        last_code = last_contract([encode_bid(b) for b in auction_path])
+        data = json.loads(self._clean_json_response(raw_text))
+        
+        new_rules = []
+        for r in data.get('rules', []):
+            bid_clean = r['bid'].strip().upper()
+
+            # CHECK 1: Format
+            if not self._is_valid_bid(bid_clean):
+                logger.warning(f"⚠️ REJECTED invalid format: '{bid_clean}'")
+                continue
+            bid_clean = decode_bid(encode_bid(bid_clean))  # Canonical spelling ('1N' -> '1NT', 'PASS' -> 'Pass')
+
+            # CHECK 2: Sufficiency (The Fix!)
+            if not self._is_sufficient(last_code, bid_clean):
+                logger.warning(f"⚠️ REJECTED insufficient bid: '{bid_clean}' over '{decode_bid(last_code)}'")
+                continue
+
+            rule_type = "Opening" if not auction_path else r.get('type', "Response")
             
-            new_rules = []
-            for r in data.get('rules', []):
-                bid_clean = r['bid'].strip().upper()
-
-                # CHECK 1: Format
-                if not self._is_valid_bid(bid_clean):
-                    logger.warning(f"⚠️ REJECTED invalid format: '{bid_clean}'")
-                    continue
-
-                # CHECK 2: Sufficiency (The Fix!)
-                if not self._is_sufficient(last_bid, bid_clean):
-                    logger.warning(f"⚠️ REJECTED insufficient bid: '{bid_clean}' over '{last_bid}'")
-                    continue
-
-                rule_type = "Opening" if not auction_path else r.get('type', "Response")
-                
-                clean_rule = {
-                    "auction": auction_path, 
-                    "bid": bid_clean,
-                    "system": target_system, 
-                    "type": rule_type,
-                    "constraints": {
-                        "min_hcp": self._safe_int(r['constraints'].get('min_hcp')),
-                        "max_hcp": self._safe_int(r['constraints'].get('max_hcp'), 37),
-                        "shape_requirements": r['constraints'].get('shape_requirements', ""),
-                        "explanation": r['constraints'].get('explanation', ""),
-                        "nuance": r['constraints'].get('nuance', "")
-                    }
+            clean_rule = {
+                "auction": auction_path, 
+                "bid": bid_clean,
+                "system": target_system, 
+                "type": rule_type,
+                "constraints": {
+                    "min_hcp": self._safe_int(r['constraints'].get('min_hcp')),
+                    "max_hcp": self._safe_int(r['constraints'].get('max_hcp'), 37),
+                    "shape_requirements": r['constraints'].get('shape_requirements', ""),
+                    "explanation": r['constraints'].get('explanation', ""),
+                    "nuance": r['constraints'].get('nuance', "")
                 }
-                new_rules.append(clean_rule)
-            
-            if not new_rules:
-                logger.warning("⚠️ AI returned valid JSON but 0 usable rules found inside.")
-            else:
-                self.current_rules.extend(new_rules)
-                save_rules(self.rules_file, self.current_rules)
-                logger.info(f"✅ SAVED {len(new_rules)} new rules for {target_system}.")
+            }
+            new_rules.append(clean_rule)
+        return new_rules
+
+    def commit_rules(self, new_rules, target_system):
+        """Adds rules to the in-memory list and the configured store. Returns the number saved."""
+        if not new_rules:
+            logger.warning("⚠️ AI returned valid JSON but 0 usable rules found inside.")
+            return 0
+        self.current_rules.extend(new_rules)
+        if self.journal is not None:
+            self.journal.append(new_rules)
+            self.journal.maybe_compact()
+        elif self.db is not None:
+            self.db.upsert(new_rules)
+        else:
+            save_rules(self.rules_file, self.current_rules)
+        logger.info(f"✅ SAVED {len(new_rules)} new rules for {target_system}.")
+        return len(new_rules)
 
+    def generate_system_rules(self, auction_path, target_system):
+        prompt = self.build_prompt(auction_path, target_system)
+        if prompt is None:
+            return
+
+        raw_text = ""
+        try:
+            raw_text = self.request_rules(prompt)
+            self.commit_rules(self.parse_rules(raw_text, auction_path, target_system), target_system)
         except json.JSONDecodeError:
             logger.error(f"❌ JSON Parse Failed. Raw text was: {raw_text[:100]}...")
         except Exception as e:
@@ -189,11 +226,12 @@ if __name__ == "__main__":
     rules_path = project_root / "systems" / "flat_rules.yaml"
 
     if len(sys.argv) < 3:
-        print("Usage: python -m src.system_architect [Auction] [System]")
+        print("Usage: python -m src.system_architect [Auction] [System] [--db path]")
     else:
         auc_arg = sys.argv[1]
         sys_arg = sys.argv[2]
         auction_list = [] if auc_arg.lower() == "opening" else [x.strip() for x in auc_arg.split(',')]
+        db_arg = sys.argv[sys.argv.index("--db") + 1] if "--db" in sys.argv[3:-1] else None
         
-        architect = SystemArchitect(key, rules_path)
+        architect = SystemArchitect(key, rules_path, db_path=db_arg)
         architect.generate_system_rules(auction_list, sys_arg)
\ No newline at end of file
@@ -0,0 +1,257 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from json_merger import merge_chunks, chunk_files_for, write_tree
+from derive_basic import derive_tree, VARIANTS
+from tree_flattener import flatten_tree_file, system_name_for, concat_fragments
+
+logger = logging.getLogger("BUILD")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SYSTEMS_DIR = PROJECT_ROOT / "systems"
+
+# --- THE GRAPH ---
+#   merge:<system>    systems/chunks/<system>/*.json  -> systems/<system>_tree.json
+#   derive:<variant>  <source>_tree.json              -> <variant>_tree.json (derive_basic.VARIANTS)
+#   flatten:<system>  systems/<system>_tree.json      -> systems/build/<system>.rules.yaml (a fragment)
+#   assemble          every build/*.rules.yaml        -> systems/flat_rules.yaml (fragments joined)
+#   compile           flat_rules.yaml                 -> compiled artifacts
+#
+# A step runs only when the sha256 of one of its inputs or outputs differs from what was recorded
+# after its last successful run. Hashes are content hashes, so a step whose output comes out
+# byte-identical stops the rebuild there (editing one SAYC chunk never re-flattens Audrey Grant).
+# File hashes are cached by (size, mtime_ns): a no-op build only stats the files.
+
+class Step:
+    __slots__ = ("name", "system", "source", "inputs", "outputs", "action")
+
+    def __init__(self, name, inputs, outputs, action, system=None, source=None):
+        self.name = name
+        self.system = system      # None for the steps every system shares
+        self.source = source      # The system a derive step is derived from
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.action = action
+
+    def __repr__(self):
+        return f"Step({self.name})"
+
+# --- ACTIONS ---
+def _read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _merge_action(chunk_files, output):
+    def run():
+        tree, count = merge_chunks(chunk_files, verbose=False)
+        if count == 0:
+            # Same as json_merger: no tree is written, so the system simply has no rules
+            logger.warning(f"⚠️  No valid JSON chunks for {output.name}; skipped.")
+            return
+        write_tree(output, tree)
+    return run
+
+def _derive_action(variant, source_path, output):
+    def run():
+        write_tree(output, derive_tree(_read_json(source_path), variant))
+    return run
+
+def _flatten_action(tree_path, output):
+    def run():
+        output.parent.mkdir(parents=True, exist_ok=True)
+        if not tree_path.exists():
+            output.write_text("", encoding="utf-8")  # No tree (e.g. its merge had no valid chunks): no rules
+            return
+        _, _, error = flatten_tree_file(tree_path, output)
+        if error:
+            raise ValueError(error)
+    return run
+
+def _assemble_action(partials, output):
+    def run():
+        tmp_path = output.with_suffix(output.suffix + ".tmp")
+        concat_fragments(partials, tmp_path)
+        tmp_path.replace(output)  # Engines reloading mid-build see the old file or the new one
+    return run
+
+def _compile_action(rules_path):
+    def run():
+        # Imported here: a build that has nothing to compile never pays for the compiler
+        from system_compiler import compile_rules_file
+        compile_rules_file(rules_path)
+    return run
+
+# --- THE BUILDER ---
+class SystemBuild:
+    """
+    The system pipeline (merge -> derive -> flatten -> compile) as a dependency graph.
+    run() executes only the steps that are out of date, in dependency order.
+    """
+
+    def __init__(self, systems_dir=SYSTEMS_DIR):
+        self.systems_dir = Path(systems_dir)
+        self.build_dir = self.systems_dir / "build"
+        self.state_path = self.build_dir / "state.json"
+        self.rules_path = self.systems_dir / "flat_rules.yaml"
+
+    # --- PLANNING ---
+    def plan(self):
+        """All steps in dependency order (every step comes after the steps producing its inputs)."""
+        steps = []
+        trees = {p.name: p for p in self.systems_dir.glob("*_tree.json")}
+
+        chunks_dir = self.systems_dir / "chunks"
+        folders = sorted(p for p in chunks_dir.iterdir() if p.is_dir()) if chunks_dir.exists() else []
+        for folder in folders:
+            chunk_files = chunk_files_for(folder)
+            if not chunk_files:
+                continue
+            output = self.systems_dir / f"{folder.name}_tree.json"
+            trees[output.name] = output
+            steps.append(Step(f"merge:{folder.name}", chunk_files, [output],
+                              _merge_action(chunk_files, output), system=folder.name))
+
+        for variant in VARIANTS:
+            source = trees.get(f"{variant.source}_tree.json")
+            if source is None:
+                continue
+            output = self.systems_dir / f"{variant.name}_tree.json"
+            trees[output.name] = output
+            steps.append(Step(f"derive:{variant.name}", [source], [output],
+                              _derive_action(variant, source, output), system=variant.name, source=variant.source))
+
+        partials = []
+        # Stable system order, so flat_rules.yaml never reshuffles between builds
+        for name in sorted(trees, key=str.lower):
+            system = system_name_for(name)
+            partial = self.build_dir / f"{system}.rules.yaml"
+            partials.append(partial)
+            steps.append(Step(f"flatten:{system}", [trees[name]], [partial],
+                              _flatten_action(trees[name], partial), system=system))
+
+        if partials:
+            steps.append(Step("assemble", partials, [self.rules_path], _assemble_action(partials, self.rules_path)))
+            compiled = self.systems_dir / "compiled" / f"{self.rules_path.stem}.manifest.json"
+            steps.append(Step("compile", [self.rules_path], [compiled], _compile_action(self.rules_path)))
+        return steps
+
+    # --- STATE ---
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"files": {}, "steps": {}}
+        state.setdefault("files", {})
+        state.setdefault("steps", {})
+        return state
+
+    def _save_state(self, state):
+        self.build_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=1, sort_keys=True)
+        tmp_path.replace(self.state_path)
+
+    def _key(self, path):
+        return os.path.relpath(path, self.systems_dir)
+
+    def _hash(self, path, files):
+        """sha256 of a file (None if missing); re-read only when its size or mtime changed."""
+        key = self._key(path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            files.pop(key, None)
+            return None
+        cached = files.get(key)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        files[key] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def _hashes(self, paths, files):
+        return {self._key(p): self._hash(p, files) for p in paths}
+
+    # --- RUNNING ---
+    def run(self, systems=None, force=False):
+        """
+        Brings every output up to date. `systems` limits the per-system steps to those systems,
+        the variants derived from them and the steps reading their outputs; the shared
+        assemble/compile steps still run if their inputs changed. force reruns all.
+        Returns {"ran": [...], "skipped": [...], "failed": [...], "written": [paths], "seconds": float}.
+        """
+        start = time.perf_counter()
+        state = self._load_state()
+        before = json.dumps(state, sort_keys=True)
+        files, records = state["files"], state["steps"]
+        report = {"ran": [], "skipped": [], "failed": [], "written": []}
+        broken = set()  # Outputs of failed steps: anything reading them waits for the next build
+        selected = set()  # Outputs of the selected systems' steps (with `systems`)
+
+        steps = self.plan()
+        for step in steps:
+            if systems is not None and step.system is not None:
+                if (step.system not in systems and step.source not in systems
+                        and not selected.intersection(step.inputs)):
+                    report["skipped"].append(step.name)
+                    continue
+                selected.update(step.outputs)
+            if broken.intersection(step.inputs):
+                report["failed"].append(step.name)
+                broken.update(step.outputs)
+                continue
+
+            inputs = self._hashes(step.inputs, files)
+            record = records.get(step.name)
+            # A deleted or hand-edited output no longer matches its recorded hash, so it is rebuilt
+            if (not force and record and record["inputs"] == inputs
+                    and record["outputs"] == self._hashes(step.outputs, files)):
+                report["skipped"].append(step.name)
+                continue
+
+            try:
+                step.action()
+            except Exception as e:
+                logger.error(f"❌ {step.name} failed: {e}")
+                records.pop(step.name, None)
+                report["failed"].append(step.name)
+                broken.update(step.outputs)
+                continue
+            records[step.name] = {"inputs": inputs, "outputs": self._hashes(step.outputs, files)}
+            report["ran"].append(step.name)
+            report["written"].extend(step.outputs)
+            logger.info(f"🔨 {step.name}")
+
+        # Drop records of steps that no longer exist (e.g. a removed chunk folder)
+        planned = {s.name for s in steps}
+        for name in list(records):
+            if name not in planned:
+                del records[name]
+        if json.dumps(state, sort_keys=True) != before:
+            self._save_state(state)
+
+        report["seconds"] = time.perf_counter() - start
+        return report
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    force = "--force" in sys.argv
+    only = [a for a in sys.argv[1:] if not a.startswith("--")] or None
+
+    report = SystemBuild().run(systems=only, force=force)
+    if not report["ran"] and not report["failed"]:
+        print(f"✅ Everything up to date ({report['seconds'] * 1000:.1f} ms).")
+    else:
+        print(f"✅ Ran {len(report['ran'])} step(s), skipped {len(report['skipped'])} "
+              f"in {report['seconds']:.2f}s: {', '.join(report['ran']) or '-'}")
+    if report["failed"]:
+        print(f"❌ Failed: {', '.join(report['failed'])}")
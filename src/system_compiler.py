@@ -0,0 +1,230 @@
+import sys
+import json
+import pickle
+import hashlib
+import logging
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from bridge_model import load_rules_fast, load_yaml_fast, RuleIndex
+from bid_codec import decode_bid
+from auction_trie import build_tree_index
+from rule_journal import journal_paths, with_journal
+
+logger = logging.getLogger("COMPILER")
+
+# --- ARTIFACT FORMAT ---
+# [4 bytes MAGIC][2 bytes format version][32 bytes sha256 of the sources][pickle payload]
+# The header is checked before the payload is touched, so a stale artifact costs one small read.
+# Bump ARTIFACT_VERSION whenever Rule/Constraints or the payload layout changes.
+MAGIC = b"BMSC"
+ARTIFACT_VERSION = 4
+HEADER_SIZE = 4 + 2 + 32
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_RULES = PROJECT_ROOT / "systems" / "flat_rules.yaml"
+DEFAULT_TREE = PROJECT_ROOT / "systems" / "bidding_tree.yaml"
+
+def compiled_dir_for(source_path):
+    return Path(source_path).parent / "compiled"
+
+def source_digest(source_path):
+    """sha256 over the source bytes, its rule journals (if any) and the artifact version."""
+    h = hashlib.sha256(ARTIFACT_VERSION.to_bytes(2, "big"))
+    h.update(Path(source_path).read_bytes())
+    for path in journal_paths(source_path):
+        if path.exists():
+            h.update(b"\0" + path.name.encode("utf-8") + b"\0" + path.read_bytes())
+    return h.digest()
+
+# --- LOW LEVEL READ/WRITE ---
+def write_artifact(path, digest, payload):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + ARTIFACT_VERSION.to_bytes(2, "big") + digest)
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(path)  # Atomic: readers see the old file or the new one
+
+def read_artifact(path, digest):
+    """Returns the payload, or None if the artifact is missing, stale or unreadable."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+            if header != MAGIC + ARTIFACT_VERSION.to_bytes(2, "big") + digest:
+                return None
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable artifact {path}: {e}")
+        return None
+
+def read_artifact_any(path):
+    """(digest, payload) of an artifact whatever sources it was built from, or (None, None)."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+            if header[:6] != MAGIC + ARTIFACT_VERSION.to_bytes(2, "big"):
+                return None, None
+            return header[6:], pickle.load(f)
+    except FileNotFoundError:
+        return None, None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable artifact {path}: {e}")
+        return None, None
+
+# --- FLAT RULES (one artifact per system) ---
+# With by_opening, each system is split further: the system artifact keeps the opening bids
+# (auction []) and every opening gets its own artifact holding the nodes whose auction starts
+# with it, so a caller that only wants the 1NT structure never unpickles the rest.
+def _safe_name(text):
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in str(text))
+
+def _artifact_path(source_path, system, opening=None):
+    source_path = Path(source_path)
+    name = ".".join(_safe_name(part) for part in (system, opening) if part is not None)
+    return compiled_dir_for(source_path) / f"{source_path.stem}.{name}.bmc"
+
+def _manifest_path(source_path):
+    source_path = Path(source_path)
+    return compiled_dir_for(source_path) / f"{source_path.stem}.manifest.json"
+
+def _read_manifest(source_path):
+    try:
+        with open(_manifest_path(source_path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _opening_of(auction):
+    """The first call of an auction (codes), or None for the opening bids themselves."""
+    return decode_bid(auction[0]) if auction else None
+
+def _part(index, keys):
+    nodes = {key: index.nodes[key] for key in keys}
+    fingerprints = {key: index.fingerprints[key] for key in nodes if key in index.fingerprints}
+    return RuleIndex(nodes, len({id(r) for group in nodes.values() for r in group}), fingerprints)
+
+def _for_openings(index, openings):
+    """The opening bids plus the nodes under the given openings."""
+    return _part(index, [key for key in index.nodes if not key[1] or _opening_of(key[1]) in openings])
+
+def compile_rules_file(rules_path=DEFAULT_RULES, digest=None, by_opening=None):
+    """
+    Parses the YAML once (plus its rule journal) and writes one artifact per system plus a manifest.
+    by_opening=None keeps whatever split the previous compile used.
+    Returns the full RuleIndex that was compiled.
+    """
+    rules_path = Path(rules_path)
+    digest = digest or source_digest(rules_path)
+    if by_opening is None:
+        by_opening = bool((_read_manifest(rules_path) or {}).get("by_opening"))
+    index = RuleIndex.from_rules(with_journal(rules_path, load_rules_fast(rules_path)))
+
+    manifest = {"version": ARTIFACT_VERSION, "source_hash": digest.hex(), "by_opening": by_opening,
+                "systems": {}, "openings": {}}
+    for system in index.systems():
+        keys = [key for key in index.nodes if key[0] == system]
+        by_first_call = {}
+        for key in keys:
+            by_first_call.setdefault(_opening_of(key[1]) if by_opening else None, []).append(key)
+
+        artifact = _artifact_path(rules_path, system)
+        write_artifact(artifact, digest, _part(index, by_first_call.pop(None, [])))
+        manifest["systems"][system] = artifact.name
+        for opening, opening_keys in by_first_call.items():
+            artifact = _artifact_path(rules_path, system, opening)
+            write_artifact(artifact, digest, _part(index, opening_keys))
+            manifest["openings"].setdefault(system, {})[opening] = artifact.name
+
+    manifest_path = _manifest_path(rules_path)
+    tmp_path = manifest_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    tmp_path.replace(manifest_path)
+
+    logger.info(f"Compiled {len(index)} rules from {rules_path.name} into {len(manifest['systems'])} system artifacts.")
+    return index
+
+def load_rule_index(rules_path=DEFAULT_RULES, systems=None, openings=None):
+    """
+    Loads a RuleIndex for the given systems (all of them if None) from the compiled artifacts.
+    With `openings`, only the opening bids and the auctions starting with those calls are kept,
+    and a by_opening compile only reads their artifacts.
+    Falls back to parsing the YAML, and recompiling, only when an artifact is stale or missing.
+    """
+    rules_path = Path(rules_path)
+    if not rules_path.exists():
+        return RuleIndex({}, 0)
+    openings = None if openings is None else {str(o) for o in openings}
+
+    digest = source_digest(rules_path)
+    manifest = _read_manifest(rules_path)
+    index = None
+    if manifest and manifest.get("version") == ARTIFACT_VERSION and manifest.get("source_hash") == digest.hex():
+        # 'ALL' comes along with any system, so a system missing from the file still gets its fallback
+        wanted = manifest["systems"] if systems is None else [s for s in manifest["systems"] if s in systems or s == 'ALL']
+        names = []
+        for system in wanted:
+            names.append(manifest["systems"][system])
+            names += [name for opening, name in manifest["openings"].get(system, {}).items()
+                      if openings is None or opening in openings]
+        nodes, fingerprints, count = {}, {}, 0
+        for name in names:
+            part = read_artifact(compiled_dir_for(rules_path) / name, digest)
+            if part is None:
+                break
+            nodes.update(part.nodes)
+            fingerprints.update(part.fingerprints)
+            count += len(part)
+        else:
+            index = RuleIndex(nodes, count, fingerprints)
+
+    if index is None:
+        logger.info(f"Compiled artifacts for {rules_path.name} are stale. Recompiling from YAML...")
+        index = compile_rules_file(rules_path, digest)
+        if systems is not None:
+            index = index.subset(systems)
+    return index if openings is None else _for_openings(index, openings)
+
+# --- BIDDING TREE (root bridge_engine.BiddingEngine) ---
+def _tree_artifact_path(tree_path):
+    tree_path = Path(tree_path)
+    return compiled_dir_for(tree_path) / f"{tree_path.stem}.tree.bmc"
+
+def compile_tree_file(tree_path=DEFAULT_TREE, digest=None):
+    tree_path = Path(tree_path)
+    digest = digest or source_digest(tree_path)
+    system = load_yaml_fast(tree_path) or {}
+    payload = {"system": system, "index": build_tree_index(system)}
+    write_artifact(_tree_artifact_path(tree_path), digest, payload)
+    return payload
+
+def load_tree(tree_path=DEFAULT_TREE):
+    """
+    Returns {'system': plain dict tree, 'index': {auction codes: candidates}} for a bidding tree.
+    The index covers every auction in the nested tree (see auction_trie.build_tree_index).
+    """
+    digest = source_digest(tree_path)
+    payload = read_artifact(_tree_artifact_path(tree_path), digest)
+    if payload is None:
+        payload = compile_tree_file(tree_path, digest)
+    return payload
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    by_opening = "--by-opening" in sys.argv  # One artifact per (system, opening)
+    targets = [Path(p) for p in sys.argv[1:] if not p.startswith("--")] or [DEFAULT_RULES, DEFAULT_TREE]
+
+    for target in targets:
+        if not target.exists():
+            print(f"❌ Not found: {target}")
+            continue
+        if target.name.endswith("_tree.yaml"):
+            compile_tree_file(target)
+            print(f"✅ Compiled tree {target.name} -> {_tree_artifact_path(target)}")
+        else:
+            index = compile_rules_file(target, by_opening=by_opening)
+            print(f"✅ Compiled {len(index)} rules ({', '.join(index.systems())}) -> {compiled_dir_for(target)}")
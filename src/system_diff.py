@@ -0,0 +1,249 @@
+import sys
+import json
+import hashlib
+import logging
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from ruamel.yaml import YAML
+from bid_codec import try_encode_bid, decode_auction
+from bridge_model import load_yaml_fast
+from auction_trie import build_tree_index, child_lists
+from tree_flattener import clean_bid_key
+import backup_store
+
+logger = logging.getLogger("DIFF")
+
+# --- VERSIONS ---
+# Every supported file is first reduced to the same shape:
+#   {auction (tuple of bid strings): {rule key: rule body}}
+# The rule key is the bid, plus the node's systems when it has them: "2NT [Grant_Basic]".
+# A bidding tree can hold one 2NT per system at the same auction, and keying them by system
+# keeps each node's key the same when its siblings are swapped, added or deleted. Rules still
+# sharing a key are told apart by convention, and only nodes that carry neither fall back to
+# their position, "2NT #2". Bodies are the node without its nested responses.
+#
+#   *_tree.json          nested "responses" trees (json_merger / derive_basic output, backups)
+#   bidding_tree.yaml    the "Dealer" tree of the tree engine (and its backups)
+#   flat_rules.yaml      flat rules; pass system= to diff one system
+#   backups              a manifest in backups/store/manifests/, or just its name (see backup_store)
+
+def _systems_tag(body):
+    systems = body.get("systems") or ([body["system"]] if body.get("system") else [])
+    return ",".join(sorted(str(s) for s in systems))
+
+def _keyed(bodies, by_system=True):
+    """{rule key: body}; by_system=False leaves systems out of the keys (one system's flat rules)."""
+    keys = []
+    for bid, body in bodies:
+        tag = _systems_tag(body) if by_system else ""
+        keys.append(f"{bid} [{tag}]" if tag else bid)
+    counts = {}
+    for key in keys:
+        counts[key] = counts.get(key, 0) + 1
+
+    rules = {}
+    for key, (bid, body) in zip(keys, bodies):
+        if counts[key] > 1 and body.get("convention"):
+            key = f"{key[:-1]} / {body['convention']}]" if key.endswith("]") else f"{bid} [{body['convention']}]"
+        unique, n = key, 1
+        while unique in rules:
+            n += 1
+            unique = f"{key} #{n}"
+        rules[unique] = body
+    return rules
+
+def _from_response_tree(tree):
+    version = {}
+    stack = [((), tree)]
+    while stack:
+        auction, responses = stack.pop()
+        bodies = []
+        for key, node in responses.items():
+            bid = clean_bid_key(key)
+            if not bid or not isinstance(node, dict):
+                continue
+            bodies.append((bid, {k: v for k, v in node.items() if k != "responses"}))
+            if node.get("responses"):
+                stack.append((auction + (bid,), node["responses"]))
+        if bodies:
+            version.setdefault(auction, {}).update(_keyed(bodies))
+    return version
+
+def _from_bidding_tree(data):
+    version = {}
+    for codes, candidates in build_tree_index(data).items():
+        bodies = []
+        for node in candidates:
+            nested = {id(l) for l in child_lists(node)}  # Answered at the longer auctions
+            bodies.append((str(node.get("bid")), {k: v for k, v in node.items() if id(v) not in nested}))
+        if bodies:
+            version[tuple(decode_auction(codes))] = _keyed(bodies)
+    return version
+
+def _from_flat_rules(rules, system=None):
+    grouped = {}
+    for rule in rules:
+        if not isinstance(rule, dict) or (system is not None and rule.get("system") != system):
+            continue
+        auction = tuple(str(b) for b in (rule.get("auction") or []))
+        body = {k: v for k, v in rule.items() if k != "auction"}
+        grouped.setdefault(auction, []).append((str(rule.get("bid")), body))
+    return {auction: _keyed(bodies, by_system=system is None) for auction, bodies in grouped.items()}
+
+def _backup_for(path):
+    """(name, store) if `path` is a backup manifest or the name of one in the backup store, else None."""
+    if path.suffix == ".json" and path.parent.name == "manifests":
+        return path.stem, str(path.parent.parent)
+    if not path.exists() and str(path) in backup_store.list_backups():
+        return str(path), backup_store.STORE_DIR
+    return None
+
+def _read(path):
+    stored = _backup_for(path)
+    if stored is not None:
+        # Rebuilt from its chunks; parsed by the format of the file it was taken from
+        name, store = stored
+        data = backup_store.read_backup(name, store)
+        if backup_store.load_manifest(name, store)["source"].endswith(".json"):
+            return json.loads(data)
+        return YAML(typ='safe', pure=False).load(data)
+    if path.suffix == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return load_yaml_fast(path)
+
+def load_version(path, system=None):
+    """Reads any supported file (see above) as {auction: {rule key: body}}."""
+    path = Path(path)
+    data = _read(path)
+    if isinstance(data, list):
+        return _from_flat_rules(data, system)
+    if isinstance(data, dict) and "Dealer" in data:
+        return _from_bidding_tree(data)
+    if isinstance(data, dict):
+        return _from_response_tree(data)
+    raise ValueError(f"{path.name}: not a system tree or rules file")
+
+# --- MERKLE TREE ---
+# One node per auction prefix. A node's hash covers its own rules and its children's hashes,
+# both sorted by key, so reordering nodes in the file changes nothing. Two subtrees with the
+# same hash are identical and the diff never looks inside them.
+
+def rule_digest(body):
+    return hashlib.sha256(json.dumps(body, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")).digest()
+
+def _bid_order(bid):
+    code = try_encode_bid(bid.split(" ")[0])
+    return (code if code is not None else 1 << 16, bid)
+
+class MerkleNode:
+    __slots__ = ("rules", "digests", "own", "children", "hash")
+
+    def __init__(self):
+        self.rules = {}       # rule key -> body
+        self.digests = {}     # rule key -> digest of the body
+        self.own = b""        # hash of this node's rules only
+        self.children = {}    # next bid -> MerkleNode
+        self.hash = b""
+
+def build_merkle(version):
+    """The Merkle tree of a version (see load_version); hashes are computed bottom-up."""
+    root = MerkleNode()
+    for auction, rules in version.items():
+        node = root
+        for bid in auction:
+            node = node.children.setdefault(bid, MerkleNode())
+        node.rules = rules
+
+    # Post-order without recursion: children are always hashed before their parent
+    order, stack = [], [root]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(node.children.values())
+    for node in reversed(order):
+        node.digests = {key: rule_digest(body) for key, body in node.rules.items()}
+        own = hashlib.sha256()
+        for key in sorted(node.digests):
+            own.update(key.encode("utf-8") + b"\0" + node.digests[key])
+        node.own = own.digest()
+        h = hashlib.sha256(b"R" + node.own)
+        for bid in sorted(node.children):
+            h.update(b"C" + bid.encode("utf-8") + b"\0" + node.children[bid].hash)
+        node.hash = h.digest()
+    return root
+
+# --- DIFF ---
+def _walk(node, auction):
+    """Every (auction, node) of a subtree, in bid order."""
+    stack = [(auction, node)]
+    while stack:
+        auction, node = stack.pop()
+        yield auction, node
+        for bid in sorted(node.children, key=_bid_order, reverse=True):
+            stack.append((auction + (bid,), node.children[bid]))
+
+def diff(old, new, stats=None):
+    """
+    Changes between two Merkle trees, one entry per auction that changed:
+      {"auction": [...], "added": [keys], "removed": [keys], "changed": [keys]}
+    Only subtrees whose hashes differ are entered, so the work follows the size of the change.
+    `stats`, if given, receives the number of node pairs compared ("visited").
+    """
+    changes = []
+    visited = 0
+    stack = [((), old, new)]
+    while stack:
+        auction, a, b = stack.pop()
+        visited += 1
+        if a is not None and b is not None and a.hash == b.hash:
+            continue
+        if a is None or b is None:
+            # A whole subtree appeared or disappeared: list its rules without comparing
+            side = "added" if a is None else "removed"
+            for sub_auction, node in _walk(b if a is None else a, auction):
+                if node.rules:
+                    entry = {"auction": list(sub_auction), "added": [], "removed": [], "changed": []}
+                    entry[side] = sorted(node.rules, key=_bid_order)
+                    changes.append(entry)
+            continue
+
+        if a.own != b.own:
+            a_digests, b_digests = a.digests, b.digests
+            entry = {
+                "auction": list(auction),
+                "added": sorted((k for k in b_digests if k not in a_digests), key=_bid_order),
+                "removed": sorted((k for k in a_digests if k not in b_digests), key=_bid_order),
+                "changed": sorted((k for k in a_digests if k in b_digests and a_digests[k] != b_digests[k]), key=_bid_order),
+            }
+            changes.append(entry)
+        for bid in sorted(a.children.keys() | b.children.keys(), key=_bid_order, reverse=True):
+            stack.append((auction + (bid,), a.children.get(bid), b.children.get(bid)))
+
+    if stats is not None:
+        stats["visited"] = visited
+    return changes
+
+def diff_files(old_path, new_path, system=None, stats=None):
+    return diff(build_merkle(load_version(old_path, system)), build_merkle(load_version(new_path, system)), stats)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    system = next((a.split("=", 1)[1] for a in sys.argv[1:] if a.startswith("--system=")), None)
+    if len(args) != 2:
+        print("Usage: python src/system_diff.py OLD NEW [--system=SAYC]   (OLD/NEW: files or backup names)")
+        print("   e.g. python src/system_diff.py backups/2025-12-29_23-09__Before_updating_1S_2NT_section.yaml systems/bidding_tree.yaml")
+        sys.exit(1)
+
+    stats = {}
+    changes = diff_files(args[0], args[1], system, stats)
+    if not changes:
+        print(f"✅ No differences ({stats['visited']} node(s) compared).")
+    for entry in changes:
+        context = " - ".join(entry["auction"]) or "Opening"
+        parts = [f"{sign}{key}" for sign, keys in (("+", entry["added"]), ("-", entry["removed"]), ("~", entry["changed"])) for key in keys]
+        print(f"   [{context}] {'  '.join(parts)}")
+    if changes:
+        print(f"📝 {len(changes)} auction(s) changed ({stats['visited']} node(s) compared).")
@@ -0,0 +1,124 @@
+import os
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from system_build import SystemBuild, SYSTEMS_DIR
+from derive_basic import VARIANTS
+
+logger = logging.getLogger("WATCH")
+
+# --- WATCHED FILES ---
+#   systems/chunks/<system>/*.json  -> system <system>
+#   systems/<system>_tree.json      -> system <system>, plus every variant derived from it
+# Polling only (the standard library has no portable inotify); a poll is one stat per file.
+# Trees that come out of a merge step are regenerated from their chunks, so edit those chunks.
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return None
+
+class SystemWatcher:
+    """
+    Rebuilds systems while their sources are being edited.
+    Changes are collected until the files have been quiet for `debounce` seconds (an editor's
+    save, or a burst of saves, becomes one build), then SystemBuild.run() rebuilds just the
+    affected systems and the shared flat_rules.yaml / compiled artifacts.
+    """
+
+    def __init__(self, build=None, poll_interval=0.5, debounce=0.3):
+        self.build = build or SystemBuild(SYSTEMS_DIR)
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.pending = set()      # Changed paths not built yet
+        self.last_change = None   # monotonic time of the latest change seen
+        self.builds = 0
+        self.stamps = self.snapshot()
+
+    def snapshot(self):
+        systems_dir = self.build.systems_dir
+        paths = list(systems_dir.glob("*_tree.json")) + list(systems_dir.glob("chunks/*/*.json"))
+        return {p: _stamp(p) for p in paths}
+
+    def system_for(self, path):
+        path = Path(path)
+        if path.parent.parent.name == "chunks":
+            return path.parent.name
+        return path.name[:-len("_tree.json")]
+
+    def affected_systems(self, paths):
+        systems = {self.system_for(p) for p in paths}
+        for variant in VARIANTS:
+            if variant.source in systems:
+                systems.add(variant.name)
+        return systems
+
+    def poll(self):
+        """Stats every watched file once. Returns the paths added, removed or modified since the last poll."""
+        stamps = self.snapshot()
+        changed = {p for p in stamps.keys() | self.stamps.keys() if stamps.get(p) != self.stamps.get(p)}
+        self.stamps = stamps
+        if changed:
+            self.pending |= changed
+            self.last_change = time.monotonic()
+        return changed
+
+    def tick(self, now=None):
+        """One poll plus, once the edits have settled, one build. Returns the build report or None."""
+        self.poll()
+        now = time.monotonic() if now is None else now
+        if not self.pending or now - self.last_change < self.debounce:
+            return None
+
+        changed, self.pending = self.pending, set()
+        systems = self.affected_systems(changed)
+        report = self.build.run(systems=systems)
+        self.builds += 1
+
+        # The build's own writes (e.g. a merged tree) are not edits; anything else that
+        # changed while it ran is, and goes into the next build.
+        written = set(report["written"])
+        stamps = self.snapshot()
+        for path in stamps.keys() | self.stamps.keys():
+            if stamps.get(path) != self.stamps.get(path) and path not in written:
+                self.pending.add(path)
+                self.last_change = time.monotonic()
+        self.stamps = stamps
+
+        if report["failed"]:
+            logger.error(f"❌ Build for {', '.join(sorted(systems))} failed at: {', '.join(report['failed'])}")
+        else:
+            logger.info(f"✅ Rebuilt {', '.join(sorted(systems))}: {len(report['ran'])} step(s) "
+                        f"in {report['seconds'] * 1000:.0f} ms")
+        return report
+
+    def run(self, max_builds=None):
+        """Polls until interrupted (or until `max_builds` builds have run)."""
+        logger.info(f"👀 Watching {self.build.systems_dir} ({len(self.stamps)} files)...")
+        try:
+            while max_builds is None or self.builds < max_builds:
+                self.tick()
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            logger.info("👋 Stopped watching.")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description="Rebuild systems whenever their chunks or trees change.")
+    parser.add_argument("--interval", type=float, default=0.5, help="Seconds between polls")
+    parser.add_argument("--debounce", type=float, default=0.3, help="Quiet seconds before building")
+    args = parser.parse_args()
+
+    watcher = SystemWatcher(poll_interval=args.interval, debounce=args.debounce)
+    # Catch up on anything edited while nobody was watching
+    report = watcher.build.run()
+    if report["ran"]:
+        logger.info(f"✅ Initial build: {', '.join(report['ran'])}")
+    watcher.stamps = watcher.snapshot()
+    watcher.run()
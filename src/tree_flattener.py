@@ -1,7 +1,10 @@
 import json
 import re
 import os
+import shutil
+import tempfile
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from ruamel.yaml import YAML
 
 def clean_bid_key(key):
@@ -15,83 +18,163 @@ def clean_bid_key(key):
         return match.group(1).upper()
     return None
 
-def flatten_node(node, current_auction, gathered_rules, system_name):
-    """
-    Recursive function to walk the tree and build flat rules.
-    """
-    # 1. Process the current node (The Bid itself)
-    if current_auction: # Skip the empty root
-        last_bid = current_auction[-1]
-        
-        # Build the rule object
-        rule = {
-            "system": system_name, # Keeps the systems separated in the DB
-            "auction": current_auction[:-1], # The context (everything before this bid)
-            "bid": last_bid,
-            "type": node.get("type", "Response"),
-            "constraints": {
-                "min_hcp": node.get("logic", {}).get("min_hcp", 0),
-                "max_hcp": node.get("logic", {}).get("max_hcp", 37),
-                "shape_requirements": node.get("logic", {}).get("shape"),
-                "explanation": node.get("teaching", {}).get("nuance"), # Short explanation
-                "nuance": node.get("teaching", {}).get("deep_dive"),   # The rich content
-                "source": node.get("meta", {}).get("source")           # The Citation
-            }
+def make_rule(node, path, system_name):
+    """The flat rule for `node`, reached by the bids in `path` (its own bid last)."""
+    logic = node.get("logic", {})
+    teaching = node.get("teaching", {})
+    return {
+        "system": system_name, # Keeps the systems separated in the DB
+        "auction": path[:-1], # The context (everything before this bid)
+        "bid": path[-1],
+        "type": node.get("type", "Response"),
+        "constraints": {
+            "min_hcp": logic.get("min_hcp", 0),
+            "max_hcp": logic.get("max_hcp", 37),
+            "shape_requirements": logic.get("shape"),
+            "explanation": teaching.get("nuance"), # Short explanation
+            "nuance": teaching.get("deep_dive"),   # The rich content
+            "source": node.get("meta", {}).get("source")           # The Citation
         }
-        gathered_rules.append(rule)
+    }
 
-    # 2. Process children (Responses)
-    responses = node.get("responses", {})
-    for key, child_node in responses.items():
+def iter_rules(tree_data, system_name):
+    """
+    Yields the flat rules of one system tree, in tree order (each bid, then its responses).
+    Iterative: a stack of child iterators plus ONE auction list that is pushed and popped on the
+    way down and up, so siblings share their prefix and only an emitted rule copies it.
+    Depth is limited by memory, not by the recursion limit.
+    """
+    path = []
+    stack = [iter(tree_data.items())]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            if stack:
+                path.pop()  # Done with this bid's responses
+            continue
+        key, node = item
         clean_key = clean_bid_key(key)
-        
-        if clean_key:
-            # Recursion: Go deeper into the tree
-            new_auction = current_auction + [clean_key]
-            flatten_node(child_node, new_auction, gathered_rules, system_name)
+        if not clean_key:
+            continue
+        path.append(clean_key)
+        yield make_rule(node, path, system_name)
+        stack.append(iter(node.get("responses", {}).items()))
+
+def flatten_tree(tree_data, system_name):
+    """All flat rules of one system tree, in tree order (as a list; see iter_rules to stream)."""
+    return list(iter_rules(tree_data, system_name))
+
+def system_name_for(tree_file):
+    # "sayc_tree.json" -> "sayc"
+    return Path(tree_file).stem.replace("_tree", "")
+
+# --- STREAMING OUTPUT ---
+# Rules are dumped STREAM_BATCH at a time. Each batch is a block-style YAML list, and consecutive
+# lists in one stream read back as a single list, so fragments can be written separately (one per
+# system, even by different processes) and simply concatenated into flat_rules.yaml.
+STREAM_BATCH = 256
+
+def _rules_yaml():
+    # Configure Ruamel YAML for clean output
+    yaml = YAML()
+    yaml.default_flow_style = False  # Block style
+    yaml.width = 4096                # Prevent line wrapping
+    return yaml
+
+def dump_rules(rules, stream):
+    """Streams any iterable of rules to an open text file. Returns the number written."""
+    yaml = _rules_yaml()
+    batch, count = [], 0
+    for rule in rules:
+        batch.append(rule)
+        if len(batch) == STREAM_BATCH:
+            yaml.dump(batch, stream)
+            count += len(batch)
+            batch = []
+    if batch:
+        yaml.dump(batch, stream)
+        count += len(batch)
+    return count
 
-def main():
+def write_rules(output_path, rules):
+    """Writes a complete rules file from any iterable of rules. Returns the number written."""
+    with open(output_path, "w", encoding="utf-8") as f:
+        count = dump_rules(rules, f)
+        if count == 0:
+            f.write("[]\n")
+    return count
+
+def concat_fragments(fragments, output_path):
+    """Joins rule fragments (see flatten_tree_file) into one rules file, in the given order."""
+    empty = True
+    with open(output_path, "w", encoding="utf-8") as out:
+        for fragment in fragments:
+            with open(fragment, "r", encoding="utf-8") as f:
+                if f.read(1):
+                    f.seek(0)
+                    shutil.copyfileobj(f, out)
+                    empty = False
+        if empty:
+            out.write("[]\n")
+
+def flatten_tree_file(tree_file, fragment_path):
+    """
+    Streams the rules of one *_tree.json into a YAML fragment.
+    Returns (system name, rules written, error message or None).
+    """
+    tree_file = Path(tree_file)
+    system_name = system_name_for(tree_file)
+    try:
+        with open(tree_file, "r", encoding="utf-8") as f:
+            tree_data = json.load(f)
+        with open(fragment_path, "w", encoding="utf-8") as f:
+            return system_name, dump_rules(iter_rules(tree_data, system_name), f), None
+    except Exception as e:
+        return system_name, 0, str(e)
+
+def main(workers=None):
     systems_dir = Path("systems")
     output_path = Path("systems/flat_rules.yaml")
     
-    all_rules = []
+    total = 0
     
     print("🌳 Flattening All System Trees...")
 
     # Find any file that looks like "*_tree.json"
-    # This automatically picks up SAYC, Basic, and Standard
-    for tree_file in systems_dir.glob("*_tree.json"):
-        # Extract system name from filename (e.g. "sayc_tree.json" -> "sayc")
-        system_name = tree_file.stem.replace("_tree", "")
-        print(f"   Processing System: {system_name}...")
-        
-        try:
-            with open(tree_file, "r", encoding="utf-8") as f:
-                tree_data = json.load(f)
-                
-            # Walk the tree for this system
-            for key, node in tree_data.items():
-                clean_key = clean_bid_key(key)
-                if clean_key:
-                    flatten_node(node, [clean_key], all_rules, system_name)
-            
+    # This automatically picks up SAYC, Basic, and Standard.
+    # Sorted (case-insensitively), so the database keeps the same system order on every run.
+    tree_files = sorted(systems_dir.glob("*_tree.json"), key=lambda p: p.name.lower())
+
+    # Each system is streamed to its own fragment, in its own process (workers=0: all in this
+    # process); map() hands the results back in tree_files order.
+    fragment_dir = Path(tempfile.mkdtemp(prefix="flatten_"))
+    fragments = [fragment_dir / f"{i}.yaml" for i in range(len(tree_files))]
+    try:
+        if workers == 0 or len(tree_files) <= 1:
+            results = [flatten_tree_file(t, frag) for t, frag in zip(tree_files, fragments)]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(tree_files))) as pool:
+                results = list(pool.map(flatten_tree_file, tree_files, fragments))
+
+        good = []
+        for tree_file, fragment, (system_name, count, error) in zip(tree_files, fragments, results):
+            print(f"   Processing System: {system_name}...")
+            if error:
+                print(f"   ❌ Error reading {tree_file.name}: {error}")
+                continue
+            good.append(fragment)
+            total += count
             print(f"     -> Added rules from {tree_file.name}")
-                    
-        except Exception as e:
-            print(f"   ❌ Error reading {tree_file.name}: {e}")
 
-    # Configure Ruamel YAML for clean output
-    yaml = YAML()
-    yaml.default_flow_style = False  # Block style
-    yaml.width = 4096                # Prevent line wrapping
-    
-    # Save Master Database
-    with open(output_path, "w", encoding="utf-8") as f:
-        yaml.dump(all_rules, f)
+        # Save Master Database
+        concat_fragments(good, output_path)
+    finally:
+        shutil.rmtree(fragment_dir, ignore_errors=True)
         
     print("-" * 30)
-    print(f"✅ Database Updated! Contains {len(all_rules)} rules.")
+    print(f"✅ Database Updated! Contains {total} rules.")
     print(f"📄 Saved to: {output_path}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
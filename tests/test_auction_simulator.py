@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+# auction_simulator loads the flat engine (src/bridge_engine.py) by path itself
+from auction_simulator import AuctionSimulator, hand_key
+from bid_codec import encode_auction, is_complete
+
+RULES_YAML = """\
+- system: sayc
+  auction: []
+  bid: 1NT
+  constraints:
+    min_hcp: 15
+    max_hcp: 17
+- system: sayc
+  auction:
+  - 1NT
+  bid: 3NT
+  constraints:
+    min_hcp: 10
+    max_hcp: 15
+"""
+
+def _hand(hcp, s=3, h=3, d=4, c=3):
+    return {"total_hcp": hcp, "suits": {"S": {"count": s}, "H": {"count": h}, "D": {"count": d}, "C": {"count": c}}}
+
+class TestAuctionSimulator(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.rules_path = self.tmp / "flat_rules.yaml"
+        self.rules_path.write_text(RULES_YAML, encoding="utf-8")
+        self.sim = AuctionSimulator(self.rules_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_bids_to_three_passes(self):
+        hands = {"N": _hand(16), "E": _hand(12), "S": _hand(11), "W": _hand(1)}
+        result = self.sim.simulate(hands, "sayc", dealer="N")
+        self.assertEqual(result["auction"], ["1NT", "Pass", "3NT", "Pass", "Pass", "Pass"])
+        self.assertEqual([c["seat"] for c in result["calls"]][:3], ["N", "E", "S"])
+        self.assertEqual(len(result["explanations"]), 2)
+
+    def test_defenders_pass_and_partner_sees_own_sequence(self):
+        # East opens in second seat; North's 16 count must not "respond" to the opponents
+        hands = {"N": _hand(0), "E": _hand(16), "S": _hand(16), "W": _hand(12)}
+        result = self.sim.simulate(hands, "sayc", dealer="N")
+        self.assertEqual(result["auction"], ["Pass", "1NT", "Pass", "3NT", "Pass", "Pass", "Pass"])
+
+    def test_passed_out(self):
+        hands = {seat: _hand(5) for seat in "NESW"}
+        self.assertEqual(self.sim.simulate(hands, "sayc")["auction"], ["Pass"] * 4)
+
+    def test_uncodable_bid_is_a_pass(self):
+        with open(self.rules_path, "a", encoding="utf-8") as f:
+            f.write("- system: sayc\n  auction: []\n  bid: Splinter\n  constraints: {min_hcp: 0, max_hcp: 5}\n")
+        hands = {seat: _hand(5) for seat in "NESW"}
+        self.assertEqual(AuctionSimulator(self.rules_path).simulate(hands, "sayc")["auction"], ["Pass"] * 4)
+
+    def test_shared_prefixes_hit_the_cache(self):
+        hands = {"N": _hand(16), "E": _hand(12), "S": _hand(11), "W": _hand(1)}
+        self.sim.simulate(hands, "sayc")
+        misses = self.sim.misses
+        self.sim.simulate(hands, "sayc")
+        self.assertEqual(self.sim.misses, misses)
+        self.assertGreater(self.sim.hits, 0)
+
+    def test_reload_invalidates_changed_contexts(self):
+        sim = AuctionSimulator(self.rules_path)
+        sim._cache[("sayc", ())] = {hand_key(_hand(16)): None}
+        sim._cache[("sayc", encode_auction(["1NT"]))] = {}
+        sim._on_reload({("sayc", ())})
+        self.assertNotIn(("sayc", ()), sim._cache)
+        self.assertIn(("sayc", encode_auction(["1NT"])), sim._cache)
+
+    def test_batch_auctions_are_complete(self):
+        results = list(self.sim.run_batch(50, "sayc", seed=7))
+        self.assertEqual(len(results), 50)
+        for result in results:
+            self.assertTrue(is_complete(encode_auction(result["auction"])))
+            self.assertEqual(sum(hand_key(h)[0] for h in result["hands"].values()), 40)
+
+    def test_seed_repeats_without_touching_global_random(self):
+        state = random.getstate()
+        first = [r["auction"] for r in self.sim.run_batch(20, "sayc", seed=3)]
+        self.assertEqual(random.getstate(), state)
+        self.assertEqual([r["auction"] for r in self.sim.run_batch(20, "sayc", seed=3)], first)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
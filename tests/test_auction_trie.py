@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+from bridge_engine import BiddingEngine, BridgeHand
+from auction_trie import AuctionTrie, BidPriority, build_tree_index
+from bid_codec import encode_auction
+
+SMALL_TREE = {
+    "Dealer": [
+        {"bid": "1S", "constraints": {}, "Responder": [
+            {"bid": "2NT", "systems": ["Grant_Basic"], "constraints": {}},
+            {"bid": "2NT", "systems": ["Grant_Standard"], "constraints": {},
+             "Opener_Rebid": [{"bid": "3C", "constraints": {}}]},
+        ]},
+        {"bid": "Pass", "constraints": {}},
+    ],
+    "1S - 2NT - 3C": [{"bid": "3H", "constraints": {}}],
+}
+
+class TestAuctionTrie(unittest.TestCase):
+
+    def test_nested_lists_become_paths(self):
+        index = build_tree_index(SMALL_TREE)
+        self.assertEqual([n["bid"] for n in index[encode_auction(["1S"])]], ["2NT", "2NT"])
+        self.assertEqual([n["bid"] for n in index[encode_auction(["1S", "2NT"])]], ["3C"])
+        self.assertEqual([n["bid"] for n in index[encode_auction(["1S", "2NT", "3C"])]], ["3H"])
+
+    def test_lookup_skips_passes_and_misses_cleanly(self):
+        trie = AuctionTrie(build_tree_index(SMALL_TREE))
+        self.assertIs(trie.lookup(["Pass", "1S", "Pass"]), trie.lookup(["1S"]))
+        self.assertEqual(trie.lookup(["1H"]).candidates, ())
+        self.assertEqual(trie.lookup(["1S", "4S"]).candidates, ())
+
+    def test_cursor_matches_lookup(self):
+        trie = AuctionTrie(build_tree_index(SMALL_TREE))
+        cursor = trie.cursor()
+        for bid in ["1S", "Pass", "2NT"]:
+            cursor = cursor.advance(bid)
+        self.assertIs(cursor.node, trie.lookup(["1S", "2NT"]))
+        self.assertFalse(cursor.advance("7NT").on_tree)
+
+class TestBidPriority(unittest.TestCase):
+
+    def test_ranks_follow_the_declared_order(self):
+        tree = {"Dealer": [{"bid": "1NT", "constraints": {}}, {"bid": "2C", "constraints": {}},
+                           {"bid": "4S", "constraints": {}}, {"bid": "1C", "constraints": {}}]}
+        root = AuctionTrie(build_tree_index(tree)).root
+        best = min(range(len(root.ranks)), key=root.ranks.__getitem__)
+        self.assertEqual(root.candidates[best]["bid"], "4S")
+        # Unlisted bids keep file order behind the listed ones
+        self.assertLess(root.ranks[0], root.ranks[1])
+        self.assertLess(root.ranks[1], root.ranks[3])
+        self.assertEqual(root.minors, (None, None, None, 'C'))
+
+    def test_convention_entries_need_the_convention(self):
+        priority = BidPriority({"order": [{"bid": "2NT", "convention": "Jacoby"}, "3S"]})
+        self.assertLess(priority.rank({"bid": "2NT", "convention": "Jacoby 2NT"}, 5), priority.rank({"bid": "3S"}, 0))
+        self.assertGreater(priority.rank({"bid": "2NT", "convention": "Natural"}, 5), priority.rank({"bid": "3S"}, 0))
+
+    def test_unchanged_nodes_keep_their_ranks(self):
+        index = build_tree_index(SMALL_TREE)
+        old = AuctionTrie(index)
+        new = AuctionTrie(dict(index), previous=old)
+        self.assertIs(new.lookup(["1S"]).ranks, old.lookup(["1S"]).ranks)
+        reordered = AuctionTrie(dict(index), BidPriority({"order": ["3C"]}), previous=old)
+        self.assertIsNot(reordered.lookup(["1S"]).ranks, old.lookup(["1S"]).ranks)
+
+class TestEngineTrie(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = BiddingEngine(os.path.join(PROJECT_ROOT, "systems", "bidding_tree.yaml"))
+
+    def test_off_tree_auction_passes(self):
+        # Used to fall back to the candidates for the last bid alone
+        hand = BridgeHand("KQ42", "KJ3", "QJ3", "K32")
+        self.assertEqual(self.engine.find_bid(hand, ["3C", "3D", "3H"]).bid, "Pass")
+
+    def test_cursor_walk_matches_find_bid(self):
+        hand = BridgeHand("AK2", "KJ42", "A432", "32")
+        cursor = self.engine.cursor().advance("1H").advance("Pass")
+        self.assertEqual(self.engine.find_bid_at(hand, cursor), self.engine.find_bid(hand, ["1H", "Pass"]))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
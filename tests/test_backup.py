@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+import backup_store
+
+TREE = """\
+Dealer:
+  - bid: "1NT"
+    constraints: {min_hcp: 15}
+    Responder:
+      - bid: "2C"
+        convention: "Stayman"
+      - bid: "2D"
+        convention: "Transfer"
+  - bid: "1H"
+    constraints: {min_hcp: 12}
+"""
+
+class TestBackupStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = os.path.join(self.tmp, "store")
+        self.source = os.path.join(self.tmp, "bidding_tree.yaml")
+        self._write(TREE)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _write(self, text):
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _backup(self, label, **kw):
+        return backup_store.backup(label, self.source, self.store, **kw)
+
+    def test_one_chunk_per_node(self):
+        chunks = backup_store.split_chunks(TREE.encode("utf-8"))
+        self.assertEqual(len(chunks), 5)  # Header + 4 nodes
+        self.assertEqual(b"".join(chunks), TREE.encode("utf-8"))
+
+    def test_unchanged_nodes_are_stored_once(self):
+        self._backup("first")
+        _, again = self._backup("same again")
+        self.assertEqual(again, 0)
+        self._write(TREE.replace('"Transfer"', '"Jacoby Transfer"'))
+        _, edited = self._backup("edited", compress=False)
+        # Only the 2D node is new
+        self.assertEqual(edited, 1 + len(b'      - bid: "2D"\n        convention: "Jacoby Transfer"\n'))
+        self.assertEqual(len(backup_store.list_backups(self.store)), 3)
+
+    def test_restore_any_version(self):
+        first, _ = self._backup("first")
+        self._write(TREE + "  - bid: \"1S\"\n")
+        second, _ = self._backup("second")
+        backup_store.restore(first, store=self.store, dest=self.source)
+        with open(self.source, encoding="utf-8") as f:
+            self.assertEqual(f.read(), TREE)
+        self.assertTrue(backup_store.read_backup(second, self.store).endswith(b'- bid: "1S"\n'))
+
+    def test_damaged_blob_is_detected(self):
+        name, _ = self._backup("first", compress=False)
+        digest = backup_store.load_manifest(name, self.store)["blobs"][1]
+        with open(backup_store._blob_path(self.store, digest), "ab") as f:
+            f.write(b"junk")
+        with self.assertRaises(ValueError):
+            backup_store.read_backup(name, self.store)
+
+    def test_gc_removes_only_unreferenced_blobs(self):
+        first, _ = self._backup("first")
+        self._write(TREE.replace("15", "14"))
+        second, _ = self._backup("second")
+        os.remove(os.path.join(self.store, "manifests", f"{first}.json"))
+        # Young blobs are protected by the grace period
+        self.assertEqual(backup_store.gc(self.store)[0], 0)
+        removed, _ = backup_store.gc(self.store, grace=-1)
+        self.assertEqual(removed, 1)  # The old 1NT node
+        self.assertEqual(backup_store.read_backup(second, self.store), TREE.replace("15", "14").encode("utf-8"))
+
+    def test_reused_blob_is_freshened(self):
+        name, _ = self._backup("first")
+        old = time.time() - 2 * backup_store.GC_GRACE_SECONDS
+        for digest in backup_store.load_manifest(name, self.store)["blobs"]:
+            os.utime(backup_store._blob_path(self.store, digest), (old, old))
+        # A new backup reusing the blobs makes them young again, so gc leaves them alone
+        # even before the new manifest exists
+        os.remove(os.path.join(self.store, "manifests", f"{name}.json"))
+        for chunk in backup_store.split_chunks(TREE.encode("utf-8")):
+            backup_store._put_blob(self.store, chunk, True)
+        self.assertEqual(backup_store.gc(self.store)[0], 0)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+import bid_codec
+from bid_codec import PASS, DOUBLE, REDOUBLE, encode_bid, decode_bid, encode_auction, decode_auction
+
+class TestBidCodec(unittest.TestCase):
+
+    def test_round_trip_every_call(self):
+        for code, bid in enumerate(bid_codec.BIDS):
+            self.assertEqual(encode_bid(bid), code)
+            self.assertEqual(decode_bid(code), bid)
+        self.assertEqual(len(bid_codec.BIDS), 38)
+
+    def test_rank_order(self):
+        self.assertEqual(encode_bid("1C"), 3)
+        self.assertEqual(encode_bid("1NT"), 7)
+        self.assertEqual(encode_bid("7NT"), 37)
+        self.assertLess(encode_bid("1NT"), encode_bid("2C"))
+        self.assertLess(encode_bid("2H"), encode_bid("2S"))
+
+    def test_aliases_and_errors(self):
+        self.assertEqual(encode_bid("pass"), PASS)
+        self.assertEqual(encode_bid(" 1n "), encode_bid("1NT"))
+        self.assertEqual(encode_bid(8), 8)
+        self.assertIsNone(bid_codec.try_encode_bid("1NT_AG"))
+        with self.assertRaises(ValueError):
+            encode_bid("8C")
+
+    def test_auctions(self):
+        codes = encode_auction(["1NT", "Pass", "2C", "Pass"])
+        self.assertEqual(codes, (7, 0, 8, 0))
+        self.assertEqual(decode_auction(codes), ["1NT", "Pass", "2C", "Pass"])
+        self.assertEqual(bid_codec.strip_passes(codes), (7, 8))
+        self.assertEqual(bid_codec.last_contract(codes), 8)
+
+    def test_sufficiency(self):
+        self.assertTrue(bid_codec.is_sufficient(None, encode_bid("1C")))
+        self.assertTrue(bid_codec.is_sufficient(encode_bid("1S"), encode_bid("1NT")))
+        self.assertFalse(bid_codec.is_sufficient(encode_bid("1NT"), encode_bid("1S")))
+        self.assertTrue(bid_codec.is_sufficient(encode_bid("7NT"), PASS))
+
+    def test_legal_calls(self):
+        auction = encode_auction(["1H"])
+        self.assertTrue(bid_codec.is_legal_call(auction, DOUBLE))
+        self.assertFalse(bid_codec.is_legal_call(auction, REDOUBLE))
+        self.assertFalse(bid_codec.is_legal_call(encode_auction(["1H", "Pass"]), DOUBLE))
+        self.assertTrue(bid_codec.is_legal_call(encode_auction(["1H", "X"]), REDOUBLE))
+        self.assertFalse(bid_codec.is_legal_call((), DOUBLE))
+
+    def test_completion(self):
+        self.assertFalse(bid_codec.is_complete(encode_auction(["Pass", "Pass", "Pass"])))
+        self.assertTrue(bid_codec.is_complete(encode_auction(["Pass"] * 4)))
+        self.assertTrue(bid_codec.is_complete(encode_auction(["1NT", "Pass", "Pass", "Pass"])))
+        self.assertFalse(bid_codec.is_complete(encode_auction(["1NT", "Pass", "2C", "Pass"])))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
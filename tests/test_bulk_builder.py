@@ -0,0 +1,103 @@
+import unittest
+import sys
+import os
+import asyncio
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+from bulk_builder import TokenBucket, build_all
+
+class FakeArchitect:
+    """Stands in for SystemArchitect: replies after `latency[auction]` seconds, failing `failures[auction]` times first."""
+
+    def __init__(self, latency, failures=None):
+        self.latency = latency
+        self.failures = dict(failures or {})
+        self.committed = []
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+
+    def build_prompt(self, auction_list, system):
+        return auction_list[0]
+
+    async def request_rules_async(self, prompt):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency[prompt])
+            if self.failures.get(prompt):
+                self.failures[prompt] -= 1
+                raise RuntimeError("429 Too Many Requests")
+            return prompt
+        finally:
+            self.in_flight -= 1
+
+    def parse_rules(self, raw_text, auction_list, system):
+        return [{"auction": auction_list, "bid": "Pass", "system": system}]
+
+    def commit_rules(self, rules, system):
+        self.committed.append(rules[0]["auction"][0])
+        return len(rules)
+
+def _run(architect, batch, **kw):
+    kw.setdefault("requests_per_minute", 60 * 1000)
+    kw.setdefault("burst", 100)
+    kw.setdefault("backoff", 0.001)
+    return asyncio.run(build_all(architect, batch, "sayc", **kw))
+
+class TestBulkBuilder(unittest.TestCase):
+
+    def test_commits_in_batch_order(self):
+        batch = ["1C", "1D", "1H", "1S"]
+        architect = FakeArchitect({"1C": 0.04, "1D": 0.0, "1H": 0.02, "1S": 0.01})
+        added = _run(architect, batch, concurrency=4)
+        self.assertEqual(architect.committed, batch)
+        self.assertEqual(added, {a: 1 for a in batch})
+
+    def test_concurrency_cap(self):
+        batch = [f"{level}{strain}" for level in "12" for strain in ("C", "D", "H", "S")]
+        architect = FakeArchitect({a: 0.01 for a in batch})
+        _run(architect, batch, concurrency=4)
+        self.assertEqual(architect.peak, 4)  # Requests overlapped, but never more than the cap
+        self.assertEqual(architect.committed, batch)
+
+    def test_retries_then_succeeds_or_gives_up(self):
+        architect = FakeArchitect({"1C": 0.0, "1D": 0.0}, failures={"1C": 2, "1D": 9})
+        added = _run(architect, ["1C", "1D"], retries=3)
+        self.assertEqual(added, {"1C": 1, "1D": 0})
+        self.assertEqual(architect.committed, ["1C"])
+        self.assertEqual(architect.calls, 3 + 4)
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_rate_limit(self):
+        now = [0.0]
+        async def fake_sleep(seconds):
+            now[0] += seconds
+        bucket = TokenBucket(rate=20, capacity=1, clock=lambda: now[0], sleep=fake_sleep)
+        granted = []
+        async def take(n):
+            for _ in range(n):
+                await bucket.acquire()
+                granted.append(now[0])
+        asyncio.run(take(4))
+        # 1 immediately, then 3 more at 20/s
+        self.assertEqual([round(t, 6) for t in granted], [0.0, 0.05, 0.1, 0.15])
+
+    def test_refill_is_capped(self):
+        now = [0.0]
+        bucket = TokenBucket(rate=2, capacity=3, clock=lambda: now[0])
+        for _ in range(3):
+            asyncio.run(bucket.acquire())
+        self.assertLess(bucket.tokens, 1)
+        now[0] = 100.0
+        bucket._refill()
+        self.assertEqual(bucket.tokens, 3)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+import random
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(PROJECT_ROOT)
+
+from bridge_engine import BiddingEngine, BridgeHand, BidResult
+
+def random_hand(rng):
+    deck = [(s, r) for s in "SHDC" for r in "AKQJT98765432"]
+    cards = rng.sample(deck, 13)
+    return BridgeHand(*["".join(r for s2, r in cards if s2 == s) for s in "SHDC"])
+
+class TestConcurrentEngine(unittest.TestCase):
+
+    def setUp(self):
+        system_file = os.path.join(PROJECT_ROOT, "systems", "bidding_tree.yaml")
+        self.engine = BiddingEngine(system_file)
+        rng = random.Random(7)
+        self.requests = [(random_hand(rng), auction) for auction in ([], ["1H"], ["1S"], ["1NT"]) for _ in range(50)]
+
+    def test_find_bid_does_not_touch_the_system(self):
+        hand = BridgeHand("AQ2", "K43", "Q432", "432")
+        self.engine.find_bid(hand, [])
+        for candidates in self.engine.index.values():
+            for node in candidates:
+                self.assertNotIn("_temp_alert", node)
+
+    def test_result_is_immutable(self):
+        result = self.engine.find_bid(BridgeHand("KQ42", "KJ3", "QJ3", "K32"), [])
+        with self.assertRaises(AttributeError):
+            result.bid = "7NT"
+
+    def test_unknown_call_bids_pass(self):
+        result = self.engine.find_bid(BridgeHand("KQ42", "KJ3", "QJ3", "K32"), ["1H", "XX2"])
+        self.assertEqual(result.bid, "Pass")
+        self.assertEqual(result.explanation, "No suitable bid.")
+        self.assertFalse(self.engine.cursor().advance("XX2").on_tree)
+
+    def test_alert_stays_with_its_call(self):
+        # 11 HCP upgraded on quality; a plain 1S hand right after must not inherit the alert
+        upgraded = BridgeHand("AKT98", "KJT", "T32", "32")
+        plain = BridgeHand("AKJ42", "K32", "432", "Q2")
+        first = self.engine.find_bid(upgraded, [])
+        second = self.engine.find_bid(plain, [])
+        self.assertEqual(first.bid, "1S")
+        self.assertIn("Upgraded", first.alert)
+        self.assertEqual(second.bid, "1S")
+        self.assertIsNone(second.alert)
+
+    def test_threads_match_serial(self):
+        serial = [self.engine.find_bid(h, a) for h, a in self.requests]
+        threaded = self.engine.find_bids_concurrent(self.requests, max_workers=8)
+        self.assertEqual(threaded, serial)
+
+    def test_processes_match_serial(self):
+        batch = self.requests[:40]
+        serial = [self.engine.find_bid(h, a) for h, a in batch]
+        self.assertEqual(self.engine.find_bids_concurrent(batch, max_workers=2, use_processes=True, chunksize=8), serial)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
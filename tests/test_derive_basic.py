@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+import copy
+import json
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+from derive_basic import derive_tree, derive_basic_tree, Variant
+
+STANDARD = {
+    "1H": {
+        "teaching": {"nuance": "Five hearts"},
+        "responses": {
+            "2H": {"teaching": {"nuance": "Simple raise"}},
+            "2NT (Jacoby)": {"responses": {"3C": {}}},
+            "1NT": {"teaching": {"nuance": "Semi-Forcing Dustbin"}, "responses": {"2C": {}}}
+        }
+    },
+    "1NT": {"responses": {"2NT": {"teaching": {"nuance": "Invitational"}}, "2C": {"responses": {"2D": {}}}}}
+}
+
+class TestDeriveBasic(unittest.TestCase):
+
+    def setUp(self):
+        self.standard = copy.deepcopy(STANDARD)
+        self.before = copy.deepcopy(STANDARD)
+        self.basic = derive_basic_tree(self.standard)
+
+    def test_prunes_and_rewrites(self):
+        responses = self.basic["1H"]["responses"]
+        self.assertEqual(list(responses), ["2H", "1NT"])
+        self.assertEqual(responses["1NT"]["teaching"]["nuance"], "Weak Response (6-9 HCP).")
+        # 2NT survives as a response to 1NT
+        self.assertIn("2NT", self.basic["1NT"]["responses"])
+
+    def test_source_is_untouched(self):
+        self.assertEqual(self.standard, self.before)
+
+    def test_unchanged_subtrees_are_shared(self):
+        self.assertIs(self.basic["1NT"], self.standard["1NT"])
+        self.assertIs(self.basic["1H"]["responses"]["2H"], self.standard["1H"]["responses"]["2H"])
+        # Only the path to an edit is copied, and the edited node's children are still shared
+        self.assertIsNot(self.basic["1H"], self.standard["1H"])
+        self.assertIs(self.basic["1H"]["responses"]["1NT"]["responses"], self.standard["1H"]["responses"]["1NT"]["responses"])
+
+    def test_other_variants(self):
+        no_stayman = Variant("no_stayman", "sayc", prune=lambda parent, key: parent == "1NT" and key == "2C")
+        derived = derive_tree(self.standard, no_stayman)
+        self.assertEqual(list(derived["1NT"]["responses"]), ["2NT"])
+        # 1H - 1NT - 2C is a "2C after 1NT" too; its siblings stay shared
+        self.assertEqual(derived["1H"]["responses"]["1NT"]["responses"], {})
+        self.assertIs(derived["1H"]["responses"]["2H"], self.standard["1H"]["responses"]["2H"])
+
+    def test_matches_committed_basic_tree(self):
+        systems = os.path.join(PROJECT_ROOT, "systems")
+        with open(os.path.join(systems, "audrey_grant_standard_tree.json"), encoding="utf-8") as f:
+            standard = json.load(f)
+        with open(os.path.join(systems, "audrey_grant_basic_tree.json"), encoding="utf-8") as f:
+            basic = json.load(f)
+        self.assertEqual(derive_basic_tree(standard), basic)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.join(PROJECT_ROOT, "tools"))
+
+import engine_diff
+from bid_codec import encode_auction
+
+class TestEngineDiff(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.report = engine_diff.run(200, "SAYC", workers=0, chunk_size=50, seed=3)
+
+    def test_report_accounts_for_every_decision(self):
+        report = self.report
+        self.assertEqual(report["decisions"], 200 * len(report["contexts"]))
+        disagreements = sum(b["count"] for b in report["buckets"])
+        self.assertAlmostEqual(report["agreement"], 1 - disagreements / report["decisions"], places=3)
+
+    def test_runs_are_reproducible(self):
+        again = engine_diff.run(200, "SAYC", workers=0, chunk_size=50, seed=3)
+        strip = lambda r: [(b["auction"], b["tree_bid"], b["flat_bid"], b["count"]) for b in r["buckets"]]
+        self.assertEqual(strip(again), strip(self.report))
+
+    def test_reproducer_stays_in_its_bucket(self):
+        pair = engine_diff.EnginePair("SAYC")
+        hcp = lambda cs: sum(c % 13 - 8 for c in cs if c % 13 >= 9)
+        shape = lambda cs: sorted(c // 13 for c in cs)
+        tried = 0
+        for seed in range(20):
+            cards = engine_diff.deal_cards(engine_diff.random.Random(seed))
+            for auction in pair.contexts:
+                bucket = pair.bucket(engine_diff.both_hands(cards), auction)
+                if bucket is None:
+                    continue
+                small = engine_diff.minimize(pair, cards, auction, bucket)
+                self.assertEqual(pair.bucket(engine_diff.both_hands(small), auction), bucket)
+                self.assertEqual(shape(small), shape(cards))
+                self.assertLessEqual(hcp(small), hcp(cards))
+                tried += 1
+        self.assertGreater(tried, 0)
+
+    def test_shared_contexts_include_the_opening(self):
+        self.assertIn(encode_auction([]), engine_diff.EnginePair("SAYC").contexts)
+
+    def test_tree_side_is_filtered_to_the_same_system(self):
+        pair = engine_diff.EnginePair("audrey_grant_basic")
+        self.assertEqual(pair.tree_system, "Grant_Basic")
+        for candidates in pair.tree.index.values():
+            for node in candidates:
+                tags = node.get("systems") or ["All"]
+                self.assertTrue("All" in tags or "Grant_Basic" in tags, node.get("bid"))
+        # Jacoby transfers are Standard / 2/1 only
+        conventions = lambda p: {n.get("convention") for n in p.tree.index[encode_auction(["1NT"])]}
+        self.assertNotIn("Jacoby Transfer", conventions(pair))
+        self.assertIn("Jacoby Transfer", conventions(engine_diff.EnginePair("audrey_grant_standard")))
+
+    def test_unknown_system_needs_a_tree_tag(self):
+        with self.assertRaises(ValueError):
+            engine_diff.EnginePair("acol")
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,98 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+from rule_reloader import RuleReloader
+from bid_codec import encode_auction
+from bridge_engine import BiddingEngine, BridgeHand
+
+RULES_YAML = """\
+- system: sayc
+  auction: []
+  bid: 1NT
+  constraints:
+    min_hcp: 15
+    max_hcp: 17
+- system: sayc
+  auction:
+  - 1NT
+  bid: 2C
+  constraints:
+    min_hcp: 8
+"""
+
+def _touch_forward(path):
+    # Make sure the mtime moves even on coarse-grained filesystems
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+class TestRuleReloader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.rules_path = self.tmp / "flat_rules.yaml"
+        self.rules_path.write_text(RULES_YAML, encoding="utf-8")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_no_change_no_reload(self):
+        reloader = RuleReloader(self.rules_path, poll_interval=0)
+        self.assertEqual(reloader.check(), set())
+        self.assertEqual(reloader.version, 0)
+
+    def test_only_changed_node_is_recompiled(self):
+        reloader = RuleReloader(self.rules_path, poll_interval=0)
+        seen = []
+        reloader.add_listener(seen.append)
+        old = reloader.current()
+        opening_key = ("sayc", ())
+        stayman_key = ("sayc", encode_auction(["1NT"]))
+
+        self.rules_path.write_text(RULES_YAML.replace("min_hcp: 8", "min_hcp: 9"), encoding="utf-8")
+        _touch_forward(self.rules_path)
+        new = reloader.current()
+
+        self.assertEqual(seen, [{stayman_key}])
+        self.assertIs(new.nodes[opening_key], old.nodes[opening_key])
+        self.assertEqual(new.nodes[stayman_key][0].constraints.min_hcp, 9)
+        # The snapshot taken before the edit is untouched
+        self.assertEqual(old.nodes[stayman_key][0].constraints.min_hcp, 8)
+
+    def test_broken_file_keeps_old_rules(self):
+        reloader = RuleReloader(self.rules_path, poll_interval=0)
+        self.rules_path.write_text("- system: [unclosed\n", encoding="utf-8")
+        _touch_forward(self.rules_path)
+        self.assertEqual(reloader.check(), set())
+        self.assertEqual(len(reloader.current()), 2)
+
+class TestTreeEngineReload(unittest.TestCase):
+
+    def test_reload_if_changed(self):
+        tmp = Path(tempfile.mkdtemp())
+        try:
+            tree_path = tmp / "bidding_tree.yaml"
+            shutil.copy(Path(PROJECT_ROOT) / "systems" / "bidding_tree.yaml", tree_path)
+            engine = BiddingEngine(str(tree_path), watch=True, poll_interval=0)
+            hand = BridgeHand("KQ42", "KJ3", "QJ3", "K32")  # 16 HCP balanced
+            self.assertEqual(engine.find_bid(hand, []).bid, "1NT")
+
+            text = tree_path.read_text(encoding="utf-8")
+            tree_path.write_text(text + '\n"1NT - 2C":\n  - bid: "2D"\n    constraints: {}\n', encoding="utf-8")
+            _touch_forward(tree_path)
+            self.assertEqual(engine.reload_if_changed(), {encode_auction(["1NT", "2C"])})
+            self.assertEqual(engine.find_bid(hand, ["1NT", "Pass", "2C", "Pass"]).bid, "2D")
+        finally:
+            shutil.rmtree(tmp)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
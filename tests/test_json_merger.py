@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+from json_merger import merge_chunks
+
+class TestDeepMerge(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _chunks(self, *trees):
+        paths = []
+        for i, tree in enumerate(trees):
+            path = self.tmp / f"chunk{i}.json"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(tree, f)
+            paths.append(path)
+        return paths
+
+    def _merge(self, *trees):
+        conflicts, log = [], []
+        tree, count = merge_chunks(self._chunks(*trees), log=log.append, conflicts=conflicts)
+        return tree, conflicts, log
+
+    def test_responses_are_combined(self):
+        tree, conflicts, _ = self._merge(
+            {"1H": {"logic": {"min_hcp": 12}, "responses": {"2H": {"type": "Response"}}}},
+            {"1H": {"logic": {"min_hcp": 12}, "responses": {"2NT (Jacoby)": {"type": "Response"}}}, "1S": {}})
+        self.assertEqual(list(tree["1H"]["responses"]), ["2H", "2NT (Jacoby)"])
+        self.assertIn("1S", tree)
+        self.assertEqual(conflicts, [])
+
+    def test_conflicting_field_reports_both_files(self):
+        tree, conflicts, log = self._merge(
+            {"1H": {"responses": {"2NT": {"logic": {"min_hcp": 13}}}}},
+            {"1H": {"responses": {"2NT": {"logic": {"min_hcp": 12}}}}})
+        self.assertEqual(tree["1H"]["responses"]["2NT"]["logic"]["min_hcp"], 12)  # Later chunk wins
+        self.assertEqual(conflicts, [{"auction": ["1H", "2NT"], "field": "logic.min_hcp",
+                                      "first": ("chunk0.json", 13), "second": ("chunk1.json", 12)}])
+        self.assertTrue(any("Conflict at 1H - 2NT logic.min_hcp" in line for line in log))
+
+    def test_same_bid_under_another_label(self):
+        tree, conflicts, _ = self._merge({"1NT": {"responses": {"2C (Stayman)": {}}}},
+                                         {"1NT": {"responses": {"2C": {}}}})
+        self.assertEqual(len(tree["1NT"]["responses"]), 2)
+        self.assertEqual(conflicts[0]["auction"], ["1NT", "2C"])
+        self.assertEqual(conflicts[0]["field"], "label")
+        self.assertEqual(conflicts[0]["first"], ("chunk0.json", "2C (Stayman)"))
+
+    def test_origin_of_inserted_subtree(self):
+        _, conflicts, _ = self._merge({"1H": {"responses": {"2H": {"teaching": {"nuance": "a"}}}}},
+                                      {"1S": {}},
+                                      {"1H": {"responses": {"2H": {"teaching": {"nuance": "b"}}}}})
+        self.assertEqual(conflicts[0]["first"], ("chunk0.json", "a"))
+        self.assertEqual(conflicts[0]["second"], ("chunk2.json", "b"))
+
+    def test_identical_definitions_are_not_conflicts(self):
+        node = {"1C": {"logic": {"min_hcp": 12}, "responses": {"1D": {"logic": {"min_hcp": 6}}}}}
+        tree, conflicts, _ = self._merge(node, node)
+        self.assertEqual(tree, node)
+        self.assertEqual(conflicts, [])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+from rule_db import RuleDB
+from bridge_model import load_rules, rule_signature
+
+def _rule(system, auction, bid, explanation=""):
+    return {"system": system, "auction": auction, "bid": bid, "type": "Response",
+            "constraints": {"min_hcp": 6, "max_hcp": 10, "explanation": explanation}}
+
+class TestRuleDB(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.db = RuleDB(self.tmp / "rules.db")
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp)
+
+    def test_wal_mode(self):
+        self.assertEqual(self.db.conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_upsert_replaces_in_place(self):
+        self.db.upsert([_rule("sayc", ["1H"], "2H", "old"), _rule("sayc", ["1H"], "1S")])
+        self.db.upsert([_rule("sayc", ["1H"], "2h", "new")])
+        rules = self.db.rules("sayc", ["1H"])
+        self.assertEqual([r["bid"] for r in rules], ["2h", "1S"])  # Same slot, last writer wins
+        self.assertEqual(rules[0]["constraints"]["explanation"], "new")
+        self.assertEqual(len(self.db), 2)
+
+    def test_filters_and_delete(self):
+        self.db.upsert([_rule("sayc", [], "1NT"), _rule("audrey_grant_basic", [], "1NT"), _rule("sayc", ["1NT"], "2C")])
+        self.assertEqual(len(self.db.rules(system="sayc")), 2)
+        self.assertEqual(len(self.db.rules(auction=[])), 2)
+        self.assertTrue(self.db.delete("sayc", [], "1nt"))
+        self.assertFalse(self.db.delete("sayc", [], "1NT"))
+        self.assertEqual(self.db.systems(), ["audrey_grant_basic", "sayc"])
+
+    def test_yaml_round_trip_matches_dedupe(self):
+        source = Path(PROJECT_ROOT) / "systems" / "flat_rules.yaml"
+        self.db.import_yaml(source)
+        out = self.tmp / "out.yaml"
+        self.db.export_yaml(out)
+
+        expected = {}
+        for r in load_rules(source):
+            expected[rule_signature(r)] = r
+        exported = load_rules(out)
+        self.assertEqual([rule_signature(r) for r in exported], list(expected))
+        self.assertFalse(out.with_suffix(".yaml.tmp").exists())
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,103 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+from rule_journal import RuleJournal
+from bridge_model import load_rules, save_rules
+from system_compiler import load_rule_index
+from rule_reloader import RuleReloader
+from hand_factory import load_flat_engine
+
+find_bid = load_flat_engine().find_bid
+HAND = {"total_hcp": 10, "suits": {s: {"count": n} for s, n in zip("SHDC", (3, 3, 4, 3))}}
+
+def _rule(auction, bid, explanation=""):
+    return {"system": "sayc", "auction": auction, "bid": bid,
+            "constraints": {"min_hcp": 6, "explanation": explanation}}
+
+class TestRuleJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.rules_path = self.tmp / "flat_rules.yaml"
+        save_rules(self.rules_path, [_rule([], "1NT"), _rule(["1NT"], "2C", "stayman")])
+        self.journal = RuleJournal(self.rules_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_append_does_not_touch_the_snapshot(self):
+        before = self.rules_path.read_bytes()
+        self.journal.append([_rule(["1NT"], "2D")])
+        self.assertEqual(self.rules_path.read_bytes(), before)
+        self.assertEqual([r["bid"] for r in self.journal.load()], ["1NT", "2C", "2D"])
+
+    def test_last_writer_wins_in_place(self):
+        self.journal.append([_rule(["1NT"], "2c", "puppet"), _rule(["1NT"], "2D")])
+        rules = self.journal.load()
+        self.assertEqual([r["bid"] for r in rules], ["1NT", "2c", "2D"])
+        self.assertEqual(rules[1]["constraints"]["explanation"], "puppet")
+
+    def test_delete(self):
+        self.journal.delete("sayc", [], "1nt")
+        self.assertEqual([r["bid"] for r in self.journal.load()], ["2C"])
+
+    def test_compact_folds_and_clears_the_journal(self):
+        self.journal.append([_rule(["1NT"], "2C", "new"), _rule(["1NT"], "2H")])
+        self.assertEqual(self.journal.compact(), 3)
+        self.assertFalse(self.journal.journal_path.exists())
+        self.assertEqual(self.journal.pending, 0)
+        snapshot = load_rules(self.rules_path)
+        self.assertEqual([r["bid"] for r in snapshot], ["1NT", "2C", "2H"])
+        self.assertEqual(snapshot[1]["constraints"]["explanation"], "new")
+
+    def test_leftover_compacting_journal_is_folded(self):
+        # A compaction that crashed after rotating the journal
+        self.journal.append([_rule(["1NT"], "2S")])
+        self.journal.journal_path.replace(self.journal.compacting_path)
+        self.journal.append([_rule(["1NT"], "3NT")])
+        self.assertEqual([r["bid"] for r in RuleJournal(self.rules_path).load()], ["1NT", "2C", "2S", "3NT"])
+        self.journal.compact()
+        self.assertEqual([r["bid"] for r in self.journal.load()], ["1NT", "2C", "2S", "3NT"])
+        self.assertEqual(len(load_rules(self.rules_path)), 3)  # 3NT stays in the live journal
+        self.assertEqual(self.journal.pending, 1)
+
+    def test_background_compaction(self):
+        self.journal.append([_rule(["1NT"], "2S")])
+        self.assertIsNone(self.journal.maybe_compact(threshold=5))
+        thread = self.journal.maybe_compact(threshold=1)
+        self.assertIsNotNone(thread)
+        self.journal.wait()
+        self.assertEqual(len(load_rules(self.rules_path)), 3)
+
+    def test_torn_last_line_is_skipped(self):
+        self.journal.append([_rule(["1NT"], "2S")])
+        with open(self.journal.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "put", "rule": {"bi')
+        self.assertEqual([r["bid"] for r in self.journal.load()], ["1NT", "2C", "2S"])
+        self.journal.append([_rule(["1NT"], "2H")])
+        self.assertEqual([r["bid"] for r in self.journal.load()], ["1NT", "2C", "2S", "2H"])
+
+    def test_engines_see_appended_rules_before_compaction(self):
+        self.assertIsNone(find_bid(HAND, load_rule_index(self.rules_path), ["1NT", "2C"], "sayc"))
+        reloader = RuleReloader(self.rules_path, poll_interval=0)
+
+        self.journal.append([_rule(["1NT", "2C"], "2D", "no major")])
+        rule = find_bid(HAND, load_rule_index(self.rules_path), ["1NT", "2C"], "sayc")
+        self.assertEqual(rule.bid, "2D")
+        self.assertEqual(find_bid(HAND, reloader.current(), ["1NT", "2C"], "sayc").bid, "2D")
+
+        # Compaction doesn't change what the engines see
+        self.journal.compact()
+        self.assertEqual(find_bid(HAND, load_rule_index(self.rules_path), ["1NT", "2C"], "sayc").bid, "2D")
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
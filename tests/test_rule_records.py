@@ -0,0 +1,108 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import importlib.util
+from unittest import mock
+from pathlib import Path
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+from bridge_model import load_rules, load_rules_fast, load_yaml_fast, load_rule_records, compile_rules, Rule, Constraints
+from bid_codec import encode_auction
+
+# The root folder also has a 'bridge_engine' module, so load the flat-rule one by path
+_spec = importlib.util.spec_from_file_location("flat_bridge_engine", os.path.join(PROJECT_ROOT, "src", "bridge_engine.py"))
+flat_engine = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(flat_engine)
+
+RULES_FILE = os.path.join(PROJECT_ROOT, "systems", "flat_rules.yaml")
+
+class TestRuleRecords(unittest.TestCase):
+
+    def test_records_match_yaml(self):
+        raw = load_rules(RULES_FILE)
+        records = load_rule_records(RULES_FILE)
+        self.assertEqual(len(raw), len(records))
+        for r, rec in zip(raw, records):
+            self.assertIsInstance(rec, Rule)
+            self.assertEqual(rec.bid, r['bid'])
+            self.assertEqual(rec.auction, encode_auction(r['auction']))
+            self.assertEqual(rec.auction_bids, list(r['auction']))
+            self.assertEqual(rec.constraints.min_hcp, r['constraints'].get('min_hcp', 0))
+
+    def test_defaults_resolved(self):
+        rec = Rule.from_mapping({"bid": "Pass", "constraints": {"shape_requirements": None}})
+        self.assertEqual(rec.system, "ALL")
+        self.assertEqual(rec.auction, ())
+        self.assertEqual(rec.constraints.min_hcp, 0)
+        self.assertEqual(rec.constraints.max_hcp, 37)
+        self.assertEqual(rec.constraints.shape_requirements, "")
+
+    def test_slots_and_dict_access(self):
+        rec = compile_rules([{"system": "sayc", "auction": ["1NT"], "bid": "2C", "constraints": {"min_hcp": 8}}])[0]
+        self.assertFalse(hasattr(rec, "__dict__"))
+        self.assertEqual(rec["bid"], "2C")
+        self.assertEqual(rec["constraints"].get("min_hcp"), 8)
+        self.assertIsNone(rec.constraints.get("unknown"))
+        self.assertEqual(rec["auction"], ["1NT"])
+        self.assertEqual(rec.to_dict()["auction"], ["1NT"])
+
+    def test_engine_accepts_records_and_dicts(self):
+        hand = {"total_hcp": 16, "suits": {"S": {"count": 4}, "H": {"count": 3}, "D": {"count": 3}, "C": {"count": 3}}}
+        raw = [{"system": "sayc", "auction": [], "bid": "1NT",
+                "constraints": {"min_hcp": 15, "max_hcp": 17, "shape_requirements": "Balanced"}}]
+        self.assertEqual(flat_engine.find_bid(hand, raw, [], "sayc").bid, "1NT")
+        self.assertEqual(flat_engine.find_bid(hand, compile_rules(raw), [], "sayc").bid, "1NT")
+
+    def test_raw_dicts_are_compiled_once(self):
+        hand = {"total_hcp": 10, "suits": {"S": {"count": 4}, "H": {"count": 3}, "D": {"count": 3}, "C": {"count": 3}}}
+        raw = load_rules_fast(RULES_FILE)
+        with mock.patch.object(flat_engine, "compile_rules", wraps=compile_rules) as spy:
+            for _ in range(50):
+                flat_engine.find_bid(hand, raw, ["1NT"], "SAYC")
+            self.assertEqual(spy.call_count, 1)
+            flat_engine.find_bid(hand, list(raw), ["1NT"], "SAYC")  # Another list: compiled again
+            self.assertEqual(spy.call_count, 2)
+
+class TestFastLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.path = self.tmp / "flat_rules.yaml"
+        shutil.copy(RULES_FILE, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_same_data_as_round_trip(self):
+        fast, slow = load_rules_fast(self.path), load_rules(self.path)
+        self.assertEqual(len(fast), len(slow))
+        self.assertEqual([(r["bid"], r.get("auction")) for r in fast], [(r["bid"], list(r.get("auction") or [])) for r in slow])
+        self.assertIs(type(fast[0]), dict)
+
+    def test_unchanged_file_is_not_parsed_again(self):
+        first = load_yaml_fast(self.path)
+        self.assertIs(load_yaml_fast(self.path), first)
+        # Touched but identical: the hash matches, so still no parse
+        st = os.stat(self.path)
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        self.assertIs(load_yaml_fast(self.path), first)
+
+    def test_edit_is_picked_up(self):
+        first = load_yaml_fast(self.path)
+        self.path.write_text("- system: sayc\n  auction: []\n  bid: 1NT\n", encoding="utf-8")
+        self.assertEqual(load_yaml_fast(self.path), [{"system": "sayc", "auction": [], "bid": "1NT"}])
+        self.assertIsNot(load_yaml_fast(self.path), first)
+
+    def test_forgiving_variant(self):
+        self.assertEqual(load_rules_fast(self.tmp / "missing.yaml"), [])
+        with self.assertRaises(FileNotFoundError):
+            load_yaml_fast(self.tmp / "missing.yaml")
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+from rule_search import RuleSearch, load_search_index, tokenize
+from bridge_model import RuleIndex
+from bid_codec import encode_auction, encode_bid
+
+def _rule(system, auction, bid, explanation, nuance=""):
+    return {"system": system, "auction": auction, "bid": bid,
+            "constraints": {"explanation": explanation, "nuance": nuance}}
+
+RULES = [
+    _rule("sayc", ["1NT"], "2C", "Stayman.", "Asks opener for a 4-card major."),
+    _rule("sayc", ["1NT", "2C"], "2D", "Denies a major.", "Reply to Stayman."),
+    _rule("sayc", ["1H"], "1NT", "The Dustbin 1NT.", "Catch-all response."),
+    _rule("grant", ["1NT"], "2C", "Stayman Convention."),
+]
+
+class TestRuleSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.index = RuleIndex.from_rules(RULES)
+        self.search = RuleSearch.build(self.index)
+
+    def _bids(self, hits):
+        return [(row["system"], " - ".join(row["auction"]), row["bid"]) for row in self.search.rules(hits)]
+
+    def test_tokens(self):
+        self.assertEqual(tokenize("The Dustbin 1NT, 4+ Spades"), ["dustbin", "1nt", "4+", "spades"])
+
+    def test_text_bid_and_system_filters(self):
+        self.assertEqual(len(self.search.search("stayman")), 3)
+        self.assertEqual(self._bids(self.search.search("stayman", bid="2D")), [("sayc", "1NT - 2C", "2D")])
+        self.assertEqual(len(self.search.search("stayman", system="grant")), 1)
+        self.assertEqual(self._bids(self.search.search("dust*")), [("sayc", "1H", "1NT")])
+        self.assertEqual(self.search.search("stayman dustbin"), [])
+
+    def test_reverse_indexes(self):
+        self.assertEqual(self.search.auctions_for_bid("2C", system="sayc"), [("sayc", ["1NT"])])
+        self.assertEqual(self.search.conventions(), {"Dustbin": 1, "Stayman": 3})
+        self.assertEqual(len(self.search.search(convention="Stayman", bid="2C")), 2)
+
+    def test_incremental_update(self):
+        edited = RULES[:2] + [_rule("sayc", ["1H"], "1NT", "Forcing 1NT.")] + RULES[3:]
+        new_index = RuleIndex.from_rules(edited, previous=self.index)
+        changed = self.search.update(new_index)
+        self.assertEqual(changed, {("sayc", encode_auction(["1H"]))})
+        self.assertEqual(self.search.search("dustbin"), [])
+        self.assertEqual(len(self.search.search("forcing")), 1)
+        self.assertNotIn("dustbin", self.search.tokens)
+        self.assertEqual(len(self.search), 4)
+
+    def test_system_filter_uses_its_posting(self):
+        stats = {}
+        self.assertEqual(self._bids(self.search.search(system="grant", stats=stats)), [("grant", "1NT", "2C")])
+        self.assertEqual(stats["scanned"], 1)  # Only grant's rules, not every doc
+        self.search.search("stayman", system="grant", stats=stats)
+        self.assertLessEqual(stats["scanned"], 2)
+
+    def test_persisted_and_selective(self):
+        tmp = Path(tempfile.mkdtemp())
+        try:
+            rules_path = tmp / "flat_rules.yaml"
+            shutil.copy(Path(PROJECT_ROOT) / "systems" / "flat_rules.yaml", rules_path)
+            built = load_search_index(rules_path)
+            loaded = load_search_index(rules_path)
+            self.assertEqual(len(loaded), len(built))
+            self.assertEqual(loaded.search("stayman"), built.search("stayman"))
+
+            # The query only walks the postings it intersects, never the whole index
+            stats = {}
+            hits = loaded.search("jacoby transfer", bid="2D", stats=stats)
+            self.assertLessEqual(stats["scanned"], 3 * len(loaded.by_bid[encode_bid("2D")]))
+            self.assertLess(stats["scanned"], len(loaded))
+            self.assertTrue(hits)
+        finally:
+            shutil.rmtree(tmp)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import importlib.util
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+from rule_stats import RuleStats
+
+# The root folder also has a 'bridge_engine' module, so load the flat-rule one by path
+_spec = importlib.util.spec_from_file_location("flat_bridge_engine", os.path.join(PROJECT_ROOT, "src", "bridge_engine.py"))
+flat_engine = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(flat_engine)
+
+MOCK_RULES = [
+    {"auction": [], "bid": "1NT", "system": "sayc",
+     "constraints": {"min_hcp": 15, "max_hcp": 17, "shape_requirements": "Balanced"}},
+    {"auction": [], "bid": "1S", "system": "sayc",
+     "constraints": {"min_hcp": 12, "max_hcp": 21, "shape_requirements": "5+ Spades"}},
+    {"auction": ["1NT"], "bid": "2C", "system": "sayc",
+     "constraints": {"min_hcp": 8, "max_hcp": 37, "shape_requirements": ""}},
+]
+
+HAND_15_BAL = {
+    "total_hcp": 15,
+    "suits": {"S": {"count": 3}, "H": {"count": 4}, "D": {"count": 3}, "C": {"count": 3}}
+}
+
+class TestRuleStats(unittest.TestCase):
+
+    def test_counts_evaluations_and_matches(self):
+        stats = RuleStats()
+        flat_engine.find_bid(HAND_15_BAL, MOCK_RULES, [], "sayc", stats)
+        flat_engine.find_bid(HAND_15_BAL, MOCK_RULES, [], "sayc", stats)
+
+        rows = {row["bid"]: row for row in stats.rows()}
+        self.assertEqual(rows["1NT"]["evaluations"], 2)
+        self.assertEqual(rows["1NT"]["matches"], 2)
+        # First match wins, so 1S is never reached
+        self.assertNotIn("1S", rows)
+
+    def test_dead_rules_include_unevaluated(self):
+        stats = RuleStats()
+        flat_engine.find_bid(HAND_15_BAL, MOCK_RULES, [], "sayc", stats)
+        dead = {row["bid"] for row in stats.dead_rules(MOCK_RULES)}
+        self.assertEqual(dead, {"1S", "2C"})
+
+    def test_disabled_by_default(self):
+        result = flat_engine.find_bid(HAND_15_BAL, MOCK_RULES, [], "sayc")
+        self.assertEqual(result["bid"], "1NT")
+
+    def test_export_json_and_csv(self):
+        stats = RuleStats()
+        flat_engine.find_bid(HAND_15_BAL, MOCK_RULES, ["1NT"], "sayc", stats)
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, "stats.json")
+            csv_path = os.path.join(tmp, "stats.csv")
+            stats.export_json(json_path)
+            stats.export_csv(csv_path, MOCK_RULES)
+
+            with open(json_path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.assertEqual(data[0]["auction"], "1NT")
+            self.assertEqual(data[0]["bid"], "2C")
+
+            with open(csv_path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            self.assertEqual(lines[0], ",".join(RuleStats.FIELDS))
+            self.assertEqual(len(lines), 1 + len(MOCK_RULES))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
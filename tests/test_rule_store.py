@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+from rule_store import get_store, RuleStore
+from bridge_model import load_rules_fast
+from bid_codec import encode_auction
+
+class TestRuleStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.rules_path = self.tmp / "flat_rules.yaml"
+        shutil.copy(Path(PROJECT_ROOT) / "systems" / "flat_rules.yaml", self.rules_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_one_store_per_file(self):
+        self.assertIs(get_store(self.rules_path), get_store(str(self.rules_path)))
+
+    def test_views_share_rule_tuples(self):
+        store = get_store(self.rules_path)
+        view = store.view("audrey_grant_basic")
+        self.assertEqual(view.systems(), ["audrey_grant_basic"])
+        key = ("audrey_grant_basic", encode_auction(["1NT"]))
+        self.assertIs(view.nodes[key], store.current().nodes[key])
+        self.assertIs(store.view("audrey_grant_basic"), view)
+
+    def test_store_loads_systems_on_demand(self):
+        store = RuleStore(self.rules_path)
+        self.assertEqual(store.loaded_systems(), [])
+        store.view("audrey_grant_basic")
+        self.assertEqual(store.loaded_systems(), ["audrey_grant_basic"])
+        self.assertEqual(len(store.current()), len(load_rules_fast(self.rules_path)))
+
+    def test_auto_reload_upgrades_existing_store(self):
+        store = get_store(self.rules_path)
+        self.assertIsNone(store.reloader)
+        self.assertIs(get_store(self.rules_path, auto_reload=True), store)
+        self.assertIsNotNone(store.reloader)
+
+    def test_view_keeps_all_fallback(self):
+        # 'ALL' rules also answer for a system the file never names
+        with open(self.rules_path, "a", encoding="utf-8") as f:
+            f.write("- system: ALL\n  auction: ['7NT']\n  bid: Pass\n  constraints: {min_hcp: 0}\n")
+        auction = encode_auction(["7NT"])
+
+        lazy = RuleStore(self.rules_path).view("acol")  # Read from the per-system artifacts
+        loaded = RuleStore(self.rules_path)
+        loaded.current()
+        for view in (lazy, loaded.view("acol")):
+            self.assertEqual([r.bid for r in view.candidates("acol", auction)], ["Pass"])
+
+    def test_repeated_values_are_interned(self):
+        index = get_store(self.rules_path).current()
+        by_value = {}
+        for rule in index:
+            for value in (rule.auction, rule.constraints.explanation, rule.constraints.source):
+                by_value.setdefault(value, set()).add(id(value))
+        self.assertTrue(all(len(ids) == 1 for ids in by_value.values()))
+
+        # Identical constraint blocks across systems collapse to one object
+        basic = index.candidates("audrey_grant_basic", encode_auction(["1NT"]))
+        standard = index.candidates("audrey_grant_standard", encode_auction(["1NT"]))
+        shared = {id(r.constraints) for r in basic} & {id(r.constraints) for r in standard}
+        self.assertTrue(shared)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
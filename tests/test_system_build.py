@@ -0,0 +1,130 @@
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+from system_build import SystemBuild
+from bridge_model import load_rules
+import json_merger
+import tree_flattener
+
+def _node(hcp_min, hcp_max, nuance, responses=None):
+    node = {"logic": {"min_hcp": hcp_min, "max_hcp": hcp_max}, "teaching": {"nuance": nuance}}
+    if responses:
+        node["responses"] = responses
+    return node
+
+class TestSystemBuild(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        chunks = self.tmp / "chunks" / "SAYC"
+        chunks.mkdir(parents=True)
+        self._write(chunks / "a_nt.json", {"1NT": _node(15, 17, "Balanced", {"2C": _node(8, 40, "Stayman")})})
+        self._write(chunks / "b_majors.json", {"1S": _node(12, 21, "Five spades")})
+        self._write(self.tmp / "audrey_grant_standard_tree.json",
+                    {"1H": _node(12, 21, "Five hearts", {"2NT": _node(13, 40, "Jacoby"), "2H": _node(6, 10, "Raise")})})
+        self.build = SystemBuild(self.tmp)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _write(self, path, data):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    def test_full_build_produces_all_systems(self):
+        report = self.build.run()
+        self.assertEqual(report["failed"], [])
+        self.assertIn("compile", report["ran"])
+        rules = load_rules(self.tmp / "flat_rules.yaml")
+        self.assertEqual([r["system"] for r in rules], ["audrey_grant_basic"] * 2 + ["audrey_grant_standard"] * 3 + ["SAYC"] * 3)
+        # derive pruned the Jacoby 2NT response from Basic
+        basic = [r["bid"] for r in rules if r["system"] == "audrey_grant_basic"]
+        self.assertEqual(basic, ["1H", "2H"])
+
+    def test_noop_build_runs_nothing(self):
+        self.build.run()
+        report = self.build.run()
+        self.assertEqual(report["ran"], [])
+        self.assertLess(report["seconds"], 0.5)
+
+    def test_chunk_edit_rebuilds_only_its_system(self):
+        self.build.run()
+        self._write(self.tmp / "chunks" / "SAYC" / "b_majors.json", {"1S": _node(11, 21, "Five spades")})
+        report = self.build.run()
+        self.assertEqual(report["ran"], ["merge:SAYC", "flatten:SAYC", "assemble", "compile"])
+        self.assertIn("flatten:audrey_grant_standard", report["skipped"])
+        self.assertIn("derive:audrey_grant_basic", report["skipped"])
+
+    def test_identical_output_stops_the_rebuild(self):
+        self.build.run()
+        # Same content, different formatting: the merged tree comes out byte-identical
+        chunk = self.tmp / "chunks" / "SAYC" / "b_majors.json"
+        chunk.write_text(json.dumps({"1S": _node(12, 21, "Five spades")}), encoding="utf-8")
+        self.assertEqual(self.build.run()["ran"], ["merge:SAYC"])
+
+    def test_deleted_output_is_rebuilt(self):
+        self.build.run()
+        (self.tmp / "audrey_grant_basic_tree.json").unlink()
+        self.assertEqual(self.build.run()["ran"], ["derive:audrey_grant_basic"])
+
+    def test_systems_filter(self):
+        self.build.run()
+        self._write(self.tmp / "chunks" / "SAYC" / "b_majors.json", {"1S": _node(11, 21, "Five spades")})
+        self._write(self.tmp / "audrey_grant_standard_tree.json", {"1H": _node(11, 21, "Five hearts")})
+        report = self.build.run(systems=["SAYC"])
+        self.assertNotIn("flatten:audrey_grant_standard", report["ran"])
+        self.assertIn("flatten:SAYC", report["ran"])
+
+    def test_selecting_a_source_rebuilds_its_variants(self):
+        self.build.run()
+        self._write(self.tmp / "audrey_grant_standard_tree.json", {"1H": _node(11, 21, "Five hearts")})
+        report = self.build.run(systems=["audrey_grant_standard"])
+        for name in ("flatten:audrey_grant_standard", "derive:audrey_grant_basic", "flatten:audrey_grant_basic"):
+            self.assertIn(name, report["ran"])
+        self.assertIn("merge:SAYC", report["skipped"])
+        basic = [r for r in load_rules(self.tmp / "flat_rules.yaml") if r["system"] == "audrey_grant_basic"]
+        self.assertEqual([r["constraints"]["min_hcp"] for r in basic], [11])
+
+class TestParallelPipeline(unittest.TestCase):
+    """merge_all_systems / tree_flattener.main use cwd-relative paths, so these run inside a temp dir."""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = Path(tempfile.mkdtemp())
+        for system in ("zeta", "Alpha", "mid"):
+            folder = self.tmp / "systems" / "chunks" / system
+            folder.mkdir(parents=True)
+            for i in range(3):
+                with open(folder / f"part{i}.json", "w", encoding="utf-8") as f:
+                    json.dump({f"{i + 1}C": _node(i, 20, f"{system} {i}", {"1H": _node(6, 9, "Reply")})}, f)
+        os.chdir(self.tmp)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp)
+
+    def _build(self, workers):
+        json_merger.merge_all_systems(workers=workers)
+        tree_flattener.main(workers=workers)
+        return (self.tmp / "systems" / "flat_rules.yaml").read_bytes()
+
+    def test_parallel_matches_serial(self):
+        serial = self._build(0)
+        self.assertEqual(self._build(2), serial)
+        systems = [r["system"] for r in load_rules(self.tmp / "systems" / "flat_rules.yaml")]
+        # Stable, case-insensitive system order
+        self.assertEqual(list(dict.fromkeys(systems)), ["Alpha", "mid", "zeta"])
+        self.assertEqual(len(systems), 18)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+import system_compiler
+from bridge_model import load_rule_records, RuleIndex
+from bid_codec import encode_auction
+
+SYSTEMS_DIR = Path(PROJECT_ROOT) / "systems"
+
+class TestSystemCompiler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.rules_path = self.tmp / "flat_rules.yaml"
+        shutil.copy(SYSTEMS_DIR / "flat_rules.yaml", self.rules_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_compiles_one_artifact_per_system(self):
+        index = system_compiler.compile_rules_file(self.rules_path)
+        compiled = sorted(p.name for p in (self.tmp / "compiled").glob("*.bmc"))
+        self.assertEqual(len(compiled), len(index.systems()))
+        self.assertEqual(len(index), len(load_rule_records(self.rules_path)))
+
+    def test_loads_from_artifact_matching_yaml(self):
+        system_compiler.compile_rules_file(self.rules_path)
+        loaded = system_compiler.load_rule_index(self.rules_path)
+        fresh = RuleIndex.from_rules(load_rule_records(self.rules_path))
+        self.assertEqual(set(loaded.nodes), set(fresh.nodes))
+        for key, group in fresh.nodes.items():
+            self.assertEqual([r.bid for r in loaded.nodes[key]], [r.bid for r in group])
+
+    def test_single_system_load(self):
+        system_compiler.compile_rules_file(self.rules_path)
+        index = system_compiler.load_rule_index(self.rules_path, ["audrey_grant_basic"])
+        self.assertEqual(index.systems(), ["audrey_grant_basic"])
+        bids = [r.bid for r in index.candidates("audrey_grant_basic", encode_auction(["1NT"]))]
+        self.assertIn("2C", bids)
+
+    def test_by_opening_artifacts(self):
+        system_compiler.compile_rules_file(self.rules_path, by_opening=True)
+        self.assertTrue((self.tmp / "compiled" / "flat_rules.SAYC.1NT.bmc").exists())
+        index = system_compiler.load_rule_index(self.rules_path, ["SAYC"], openings=["1NT"])
+        full = system_compiler.load_rule_index(self.rules_path, ["SAYC"])
+        self.assertEqual({auction[:1] for _, auction in index.nodes}, {(), encode_auction(["1NT"])})
+        self.assertIn("1NT", [r.bid for r in index.candidates("SAYC", ())])  # The opening bids come along
+        key = ("SAYC", encode_auction(["1NT"]))
+        self.assertEqual([r.bid for r in index.nodes[key]], [r.bid for r in full.nodes[key]])
+
+    def test_recompile_keeps_the_split(self):
+        system_compiler.compile_rules_file(self.rules_path, by_opening=True)
+        with open(self.rules_path, "a", encoding="utf-8") as f:
+            f.write("- system: SAYC\n  auction: ['1NT']\n  bid: 7NT\n  constraints:\n    min_hcp: 22\n")
+        index = system_compiler.load_rule_index(self.rules_path, ["SAYC"], openings=["1NT"])
+        self.assertIn("7NT", [r.bid for r in index.candidates("SAYC", encode_auction(["1NT"]))])
+        digest = system_compiler.source_digest(self.rules_path)
+        artifact = self.tmp / "compiled" / "flat_rules.SAYC.1NT.bmc"
+        self.assertIsNotNone(system_compiler.read_artifact(artifact, digest))
+
+    def test_openings_without_split(self):
+        system_compiler.compile_rules_file(self.rules_path)
+        index = system_compiler.load_rule_index(self.rules_path, ["SAYC"], openings=["1NT"])
+        self.assertEqual({auction[:1] for _, auction in index.nodes}, {(), encode_auction(["1NT"])})
+
+    def test_stale_artifact_is_rebuilt(self):
+        system_compiler.compile_rules_file(self.rules_path)
+        with open(self.rules_path, "a", encoding="utf-8") as f:
+            f.write("- system: test_sys\n  auction: []\n  bid: 7NT\n  type: Opening\n  constraints:\n    min_hcp: 37\n")
+        index = system_compiler.load_rule_index(self.rules_path)
+        self.assertIn("test_sys", index.systems())
+        # And the rebuilt artifacts are now current
+        digest = system_compiler.source_digest(self.rules_path)
+        artifact = self.tmp / "compiled" / "flat_rules.test_sys.bmc"
+        self.assertIsNotNone(system_compiler.read_artifact(artifact, digest))
+
+    def test_tree_artifact(self):
+        tree_path = self.tmp / "bidding_tree.yaml"
+        shutil.copy(SYSTEMS_DIR / "bidding_tree.yaml", tree_path)
+        first = system_compiler.load_tree(tree_path)
+        second = system_compiler.load_tree(tree_path)
+        self.assertIn((), first["index"])
+        self.assertEqual([n["bid"] for n in first["index"][()]], [n["bid"] for n in second["index"][()]])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
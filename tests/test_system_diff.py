@@ -0,0 +1,133 @@
+import unittest
+import sys
+import os
+import copy
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+from system_diff import load_version, build_merkle, diff, diff_files
+import backup_store
+
+TREE = {
+    "1NT": {"logic": {"min_hcp": 15}, "responses": {
+        "2C (Stayman)": {"logic": {"min_hcp": 8}, "responses": {"2D": {}, "2H": {}}},
+        "2D": {"teaching": {"nuance": "Transfer"}}}},
+    "1H": {"logic": {"min_hcp": 12}, "responses": {"2H": {}}},
+}
+
+BIDDING_TREE = """\
+Dealer:
+  - bid: "1NT"
+    constraints: {min_hcp: 15}
+    Responder:
+      - bid: "2C"
+        convention: "Stayman"
+      - bid: "2NT"
+        systems: ["Grant_Basic"]
+      - bid: "2NT"
+        systems: ["Grant_Standard"]
+"""
+
+def _merkle(tree):
+    from system_diff import _from_response_tree
+    return build_merkle(_from_response_tree(tree))
+
+class TestSystemDiff(unittest.TestCase):
+
+    def test_identical_versions_compare_one_node(self):
+        stats = {}
+        self.assertEqual(diff(_merkle(TREE), _merkle(copy.deepcopy(TREE)), stats), [])
+        self.assertEqual(stats["visited"], 1)
+
+    def test_reordering_is_not_a_change(self):
+        reordered = {"1H": TREE["1H"], "1NT": dict(reversed(list(TREE["1NT"].items())))}
+        self.assertEqual(_merkle(reordered).hash, _merkle(TREE).hash)
+
+    def test_changed_added_removed(self):
+        new = copy.deepcopy(TREE)
+        new["1NT"]["responses"]["2C (Stayman)"]["responses"]["2D"] = {"teaching": {"nuance": "No major"}}
+        del new["1NT"]["responses"]["2D"]
+        new["1NT"]["responses"]["2S"] = {}
+        stats = {}
+        changes = diff(_merkle(TREE), _merkle(new), stats)
+        self.assertEqual(changes, [
+            {"auction": ["1NT"], "added": ["2S"], "removed": ["2D"], "changed": []},
+            {"auction": ["1NT", "2C"], "added": [], "removed": [], "changed": ["2D"]},
+        ])
+        # The untouched 1H subtree was never entered
+        self.assertLess(stats["visited"], 6)
+
+    def test_whole_subtree_added(self):
+        new = copy.deepcopy(TREE)
+        new["1H"]["responses"]["2H"]["responses"] = {"3H": {}, "4H": {}}
+        changes = diff(_merkle(TREE), _merkle(new))
+        # 2H itself is unchanged: its responses are the next auction's rules, not part of the 2H rule
+        self.assertEqual(changes, [{"auction": ["1H", "2H"], "added": ["3H", "4H"], "removed": [], "changed": []}])
+
+    def test_file_formats(self):
+        tmp = Path(tempfile.mkdtemp())
+        try:
+            (tmp / "a.yaml").write_text(BIDDING_TREE, encoding="utf-8")
+            (tmp / "b.yaml").write_text(BIDDING_TREE.replace('convention: "Stayman"', 'convention: "Puppet"'), encoding="utf-8")
+            version = load_version(tmp / "a.yaml")
+            # Two 2NT nodes for different systems stay apart, keyed by their systems
+            self.assertEqual(sorted(version[("1NT",)]), ["2C", "2NT [Grant_Basic]", "2NT [Grant_Standard]"])
+            (tmp / "c.yaml").write_text(BIDDING_TREE + '      - bid: "2NT"\n        convention: "Puppet"\n'
+                                        '      - bid: "2NT"\n      - bid: "2NT"\n', encoding="utf-8")
+            self.assertEqual(sorted(load_version(tmp / "c.yaml")[("1NT",)]),
+                             ["2C", "2NT", "2NT #2", "2NT [Grant_Basic]", "2NT [Grant_Standard]", "2NT [Puppet]"])
+            self.assertEqual(diff_files(tmp / "a.yaml", tmp / "b.yaml"),
+                             [{"auction": ["1NT"], "added": [], "removed": [], "changed": ["2C"]}])
+
+            with open(tmp / "tree.json", "w", encoding="utf-8") as f:
+                json.dump(TREE, f)
+            self.assertIn(("1NT", "2C"), load_version(tmp / "tree.json"))
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_duplicate_bids_are_keyed_by_system(self):
+        tmp = Path(tempfile.mkdtemp())
+        try:
+            basic = '      - bid: "2NT"\n        systems: ["Grant_Basic"]\n'
+            standard = '      - bid: "2NT"\n        systems: ["Grant_Standard"]\n'
+            (tmp / "a.yaml").write_text(BIDDING_TREE, encoding="utf-8")
+            # Swapping the two 2NT nodes is no change at all
+            (tmp / "swapped.yaml").write_text(BIDDING_TREE.replace(basic + standard, standard + basic), encoding="utf-8")
+            self.assertEqual(diff_files(tmp / "a.yaml", tmp / "swapped.yaml"), [])
+            # Deleting the first one removes that one, not "the second 2NT"
+            (tmp / "deleted.yaml").write_text(BIDDING_TREE.replace(basic, ""), encoding="utf-8")
+            self.assertEqual(diff_files(tmp / "a.yaml", tmp / "deleted.yaml"),
+                             [{"auction": ["1NT"], "added": [], "removed": ["2NT [Grant_Basic]"], "changed": []}])
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_backup_manifests(self):
+        tmp = Path(tempfile.mkdtemp())
+        try:
+            source, store = tmp / "bidding_tree.yaml", str(tmp / "store")
+            source.write_text(BIDDING_TREE, encoding="utf-8")
+            first, _ = backup_store.backup("first", str(source), store)
+            source.write_text(BIDDING_TREE.replace('"Stayman"', '"Puppet"'), encoding="utf-8")
+            second, _ = backup_store.backup("second", str(source), store)
+
+            manifests = tmp / "store" / "manifests"
+            self.assertEqual(diff_files(manifests / f"{first}.json", manifests / f"{second}.json"),
+                             [{"auction": ["1NT"], "added": [], "removed": [], "changed": ["2C"]}])
+            self.assertEqual(diff_files(manifests / f"{second}.json", source), [])  # Against the live file
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_flat_rules_per_system(self):
+        path = os.path.join(PROJECT_ROOT, "systems", "flat_rules.yaml")
+        self.assertEqual(diff_files(path, path, system="SAYC"), [])
+        self.assertTrue(load_version(path, system="SAYC"))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+import json
+import time
+import shutil
+import tempfile
+from pathlib import Path
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+from system_build import SystemBuild
+from system_watch import SystemWatcher
+
+def _write(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    # Make sure the stamp moves even on coarse-mtime filesystems
+    stamp = time.time_ns() + 10**9
+    os.utime(path, ns=(stamp, stamp))
+
+class TestSystemWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        (self.tmp / "chunks" / "SAYC").mkdir(parents=True)
+        _write(self.tmp / "chunks" / "SAYC" / "nt.json", {"1NT": {"logic": {"min_hcp": 15}}})
+        _write(self.tmp / "audrey_grant_standard_tree.json", {"1H": {"responses": {"2H": {}}}})
+        build = SystemBuild(self.tmp)
+        build.run()
+        self.watcher = SystemWatcher(build, poll_interval=0, debounce=0.3)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_quiet_tree_does_nothing(self):
+        self.assertIsNone(self.watcher.tick(now=time.monotonic() + 10))
+        self.assertEqual(self.watcher.builds, 0)
+
+    def test_debounced_rebuild_of_one_system(self):
+        _write(self.tmp / "chunks" / "SAYC" / "nt.json", {"1NT": {"logic": {"min_hcp": 14}}})
+        # Still inside the debounce window: nothing built yet
+        self.assertIsNone(self.watcher.tick(now=time.monotonic()))
+        report = self.watcher.tick(now=time.monotonic() + 1)
+        self.assertEqual(report["ran"], ["merge:SAYC", "flatten:SAYC", "assemble", "compile"])
+        # The merged SAYC_tree.json is the build's own write, not a new edit
+        self.assertEqual(self.watcher.pending, set())
+        self.assertIsNone(self.watcher.tick(now=time.monotonic() + 2))
+
+    def test_burst_of_edits_is_one_build(self):
+        for hcp in (12, 13, 14):
+            _write(self.tmp / "chunks" / "SAYC" / "nt.json", {"1NT": {"logic": {"min_hcp": hcp}}})
+            self.watcher.tick(now=time.monotonic())
+        self.watcher.tick(now=time.monotonic() + 1)
+        self.assertEqual(self.watcher.builds, 1)
+
+    def test_source_tree_edit_rebuilds_its_variants(self):
+        _write(self.tmp / "audrey_grant_standard_tree.json", {"1H": {"responses": {"2H": {}, "3C": {}}}})
+        self.assertEqual(self.watcher.affected_systems({self.tmp / "audrey_grant_standard_tree.json"}),
+                         {"audrey_grant_standard", "audrey_grant_basic"})
+        self.watcher.tick(now=time.monotonic())
+        report = self.watcher.tick(now=time.monotonic() + 1)
+        self.assertIn("derive:audrey_grant_basic", report["ran"])
+        self.assertIn("flatten:audrey_grant_standard", report["ran"])
+        self.assertNotIn("merge:SAYC", report["ran"])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
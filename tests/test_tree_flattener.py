@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import io
+import shutil
+import tempfile
+from pathlib import Path
+
+# Path Setup
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+
+from tree_flattener import iter_rules, dump_rules, write_rules, concat_fragments, STREAM_BATCH
+from bridge_model import load_rules
+
+TREE = {
+    "1NT (Strong)": {
+        "logic": {"min_hcp": 15, "max_hcp": 17},
+        "teaching": {"nuance": "Balanced"},
+        "responses": {
+            "2C (Stayman)": {"logic": {"min_hcp": 8}, "responses": {"2D": {}, "2H": {}}},
+            "Pass": {},
+            "2D (Transfer)": {}
+        }
+    },
+    "1S": {"type": "Opening"}
+}
+
+class TestTreeFlattener(unittest.TestCase):
+
+    def test_tree_order_and_auctions(self):
+        rules = list(iter_rules(TREE, "sayc"))
+        self.assertEqual([(r["auction"], r["bid"]) for r in rules], [
+            ([], "1NT"), (["1NT"], "2C"), (["1NT", "2C"], "2D"), (["1NT", "2C"], "2H"),
+            (["1NT"], "2D"), ([], "1S")])
+        self.assertEqual(rules[0]["constraints"]["explanation"], "Balanced")
+        self.assertEqual(rules[1]["constraints"]["max_hcp"], 37)
+        self.assertEqual(rules[-1]["type"], "Opening")
+
+    def test_emitted_auctions_are_independent(self):
+        # The walk reuses one auction list; a yielded rule must not change afterwards
+        gen = iter_rules(TREE, "sayc")
+        next(gen)
+        second = next(gen)
+        list(gen)
+        self.assertEqual(second["auction"], ["1NT"])
+
+    def test_deeper_than_recursion_limit(self):
+        depth = sys.getrecursionlimit() + 500
+        tree = node = {}
+        for _ in range(depth):
+            child = {}
+            node["1C"] = {"responses": child}
+            node = child
+        count = 0
+        for rule in iter_rules(tree, "deep"):
+            count += 1
+        self.assertEqual(count, depth)
+        self.assertEqual(len(rule["auction"]), depth - 1)
+
+    def test_batched_dump_reads_back_as_one_list(self):
+        rules = [{"system": "s", "auction": [], "bid": f"{i % 7 + 1}C"} for i in range(STREAM_BATCH * 2 + 3)]
+        tmp = Path(tempfile.mkdtemp())
+        try:
+            self.assertEqual(write_rules(tmp / "all.yaml", iter(rules)), len(rules))
+            self.assertEqual(load_rules(tmp / "all.yaml"), rules)
+
+            # Fragments (one per system) joined byte-wise give the same file
+            for name, part in (("a", rules[:10]), ("empty", []), ("b", rules[10:])):
+                with open(tmp / f"{name}.yaml", "w", encoding="utf-8") as f:
+                    dump_rules(part, f)
+            concat_fragments([tmp / "a.yaml", tmp / "empty.yaml", tmp / "b.yaml"], tmp / "joined.yaml")
+            self.assertEqual((tmp / "joined.yaml").read_text(), (tmp / "all.yaml").read_text())
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_empty_output_is_an_empty_list(self):
+        stream = io.StringIO()
+        self.assertEqual(dump_rules([], stream), 0)
+        tmp = Path(tempfile.mkdtemp())
+        try:
+            concat_fragments([], tmp / "none.yaml")
+            self.assertEqual((tmp / "none.yaml").read_text(), "[]\n")
+        finally:
+            shutil.rmtree(tmp)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -1,36 +1,62 @@
-import shutil
 import os
+import sys
 import datetime
 
 # CONFIGURATION
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-SOURCE_FILE = os.path.join(PROJECT_ROOT, "systems", "bidding_tree.yaml")
-BACKUP_DIR = os.path.join(PROJECT_ROOT, "backups")
+# The store itself lives in src/backup_store.py; this file is its command line.
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+from backup_store import (PROJECT_ROOT, SOURCE_FILE, BACKUP_DIR, STORE_DIR, GC_GRACE_SECONDS,
+                          backup, list_backups, load_manifest, read_backup, restore, gc, store_size)
 
-def create_backup():
-    # 1. Ensure backup folder exists
-    if not os.path.exists(BACKUP_DIR):
-        os.makedirs(BACKUP_DIR)
+# --- LEGACY BACKUPS ---
+def import_legacy(store=STORE_DIR, backup_dir=BACKUP_DIR):
+    """Adds the old full-copy backups (backups/*.yaml, *.json) to the store. The files are kept."""
+    imported = []
+    known = {load_manifest(n, store)["label"] for n in list_backups(store)}
+    for f in sorted(os.listdir(backup_dir)):
+        path = os.path.join(backup_dir, f)
+        if not os.path.isfile(path) or not f.endswith((".yaml", ".json")):
+            continue
+        stamp, _, label = f.rpartition(".")[0].partition("__")
+        if not label:
+            stamp, label = "", f.rpartition(".")[0]
+        if label in known:
+            continue
+        try:
+            when = datetime.datetime.strptime(stamp, "%Y-%m-%d_%H-%M")
+        except ValueError:
+            when = datetime.datetime.fromtimestamp(os.path.getmtime(path))
+        imported.append(backup(label, path, store, when=when)[0])
+    return imported
 
-    # 2. Get a label from the user
+# --- CLI ---
+def create_backup():
+    # 1. Get a label from the user
     print(f"Current System Size: {os.path.getsize(SOURCE_FILE)} bytes")
     label = input("Enter a label for this backup (e.g. 'Added 1H Opening'): ").strip()
-    
-    # Clean the label to be filename-safe
-    safe_label = "".join([c if c.isalnum() else "_" for c in label])
-
-    # 3. Create the filename
-    # Format: 2025-12-28_14-30__Added_1H_Opening.yaml
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M")
-    filename = f"{timestamp}__{safe_label}.yaml"
-    dest_path = os.path.join(BACKUP_DIR, filename)
 
-    # 4. Copy
+    # 2. Store the new chunks + the manifest
     try:
-        shutil.copy2(SOURCE_FILE, dest_path)
-        print(f"✅ Backup saved to: backups/{filename}")
+        name, new_bytes = backup(label)
+        print(f"✅ Backup saved: {name} ({new_bytes} new bytes stored, store is {store_size()} bytes)")
     except Exception as e:
         print(f"❌ Backup Failed: {e}")
 
 if __name__ == "__main__":
-    create_backup()
\ No newline at end of file
+    command = sys.argv[1] if len(sys.argv) > 1 else "backup"
+    if command == "backup":
+        create_backup()
+    elif command == "list":
+        for name in list_backups():
+            print(f"   {name}")
+    elif command == "restore" and len(sys.argv) > 2:
+        dest = restore(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+        print(f"✅ Restored {sys.argv[2]} -> {dest}")
+    elif command == "gc":
+        removed, freed = gc()
+        print(f"🧹 Removed {removed} unreferenced blob(s), {freed} bytes freed.")
+    elif command == "import":
+        names = import_legacy()
+        print(f"✅ Imported {len(names)} old backup(s); store is {store_size()} bytes.")
+    else:
+        print("Usage: python tools/backup.py [backup | list | restore NAME [DEST] | gc | import]")
@@ -0,0 +1,268 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+
+# CONFIGURATION
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TREE_FILE = os.path.join(PROJECT_ROOT, "systems", "bidding_tree.yaml")
+RULES_FILE = os.path.join(PROJECT_ROOT, "systems", "flat_rules.yaml")
+REPORT_FILE = os.path.join(PROJECT_ROOT, "output", "engine_diff.json")
+
+# The tree engine is the root bridge_engine.py; src/bridge_engine.py has the same module name,
+# so the flat engine is loaded by path.
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+from bridge_engine import BiddingEngine, BridgeHand
+from bid_codec import decode_auction
+from system_compiler import load_rule_index
+from auction_trie import AuctionTrie, build_tree_index
+
+_spec = importlib.util.spec_from_file_location("flat_bridge_engine", os.path.join(PROJECT_ROOT, "src", "bridge_engine.py"))
+flat_engine = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(flat_engine)
+
+RANKS = "23456789TJQKA"
+SUITS = "CDHS"       # Card c is RANKS[c % 13] of SUITS[c // 13], as in hand_factory
+EXAMPLES_PER_BUCKET = 3
+
+# Flat-rule system -> the bidding tree's "systems:" tag for the same system.
+# The tree has no plain SAYC; its nearest system is 2/1 Game Forcing.
+TREE_SYSTEMS = {
+    "audrey_grant_basic": "Grant_Basic",
+    "audrey_grant_standard": "Grant_Standard",
+    "SAYC": "2/1_GF",
+    "sayc": "2/1_GF",
+    "sayc_2_1_gf": "2/1_GF",
+}
+
+# --- HANDS ---
+def deal_cards(rng):
+    return sorted(rng.sample(range(52), 13))
+
+def tree_hand(cards):
+    holding = {s: "" for s in SUITS}
+    for c in sorted(cards, reverse=True):
+        holding[SUITS[c // 13]] += RANKS[c % 13]
+    return BridgeHand(holding['S'], holding['H'], holding['D'], holding['C'])
+
+def flat_hand(cards):
+    suits = {s: {"cards": "", "hcp": 0, "count": 0} for s in "SHDC"}
+    for c in sorted(cards, reverse=True):
+        suit, rank = suits[SUITS[c // 13]], c % 13
+        suit["cards"] += RANKS[rank]
+        suit["count"] += 1
+        if rank >= 9: suit["hcp"] += rank - 8
+    return {
+        "total_hcp": sum(s["hcp"] for s in suits.values()),
+        "distribution": "=".join(str(suits[s]["count"]) for s in "SHDC"),
+        "suits": suits
+    }
+
+def hand_text(cards):
+    holding = {s: "" for s in SUITS}
+    for c in sorted(cards, reverse=True):
+        holding[SUITS[c // 13]] += RANKS[c % 13]
+    return " ".join(f"{s}:{holding[s] or '-'}" for s in "SHDC")
+
+def both_hands(cards):
+    return tree_hand(cards), flat_hand(cards)
+
+def context_text(auction):
+    return " - ".join(decode_auction(auction)) or "(opening)"
+
+# --- THE TWO ENGINES ON ONE SYSTEM ---
+def _in_system(node, tag):
+    tags = node.get("systems")
+    return not tags or "All" in tags or tag in tags
+
+def _is_node_list(value):
+    return isinstance(value, list) and bool(value) and isinstance(value[0], dict) and 'bid' in value[0]
+
+def filter_tree(system, tag):
+    """A copy of a bidding tree without the nodes (and their subtrees) tagged for other systems."""
+    def prune(value):
+        if not _is_node_list(value):
+            return value
+        return [{k: prune(v) for k, v in node.items()} for node in value if _in_system(node, tag)]
+
+    return {key: prune(value) for key, value in system.items()}
+
+class EnginePair:
+    """Both engines loaded once, on the same system, plus the auction contexts they both have rules for."""
+
+    def __init__(self, flat_system, tree_path=TREE_FILE, rules_path=RULES_FILE, tree_system=None):
+        self.flat_system = flat_system
+        self.tree_system = tree_system or TREE_SYSTEMS.get(flat_system)
+        if self.tree_system is None:
+            raise ValueError(f"No bidding tree system known for '{flat_system}'; pass tree_system")
+        self.tree = BiddingEngine(tree_path)
+        # Only the tree nodes for this system (plus "All"), so both engines bid the same system
+        self.tree.index = build_tree_index(filter_tree(self.tree.system, self.tree_system))
+        self.tree.trie = AuctionTrie(self.tree.index, self.tree.priority)
+        self.rules = load_rule_index(rules_path, systems=(flat_system,))
+        flat_contexts = {auction for system, auction in self.rules.nodes if system in (flat_system, 'ALL')}
+        tree_contexts = set(self.tree.index)
+        self.contexts = sorted(flat_contexts & tree_contexts, key=lambda a: (len(a), a))
+        self.flat_only = sorted(flat_contexts - tree_contexts, key=lambda a: (len(a), a))
+        self.tree_only = sorted(tree_contexts - flat_contexts, key=lambda a: (len(a), a))
+
+    def bids(self, hands, auction):
+        """(tree bid, flat bid, flat rule explanation) for one hand, as (tree_hand, flat_hand), at one context."""
+        tree_bid = self.tree.find_bid(hands[0], auction).bid
+        rule = flat_engine.find_bid(hands[1], self.rules, auction, self.flat_system)
+        return tree_bid, (rule.bid if rule else "Pass"), (rule.constraints.explanation if rule else "")
+
+    def bucket(self, hands, auction):
+        """Disagreement bucket (auction, tree bid, flat bid), or None if the engines agree."""
+        tree_bid, flat_bid, _ = self.bids(hands, auction)
+        if tree_bid == flat_bid:
+            return None
+        return (context_text(auction), tree_bid, flat_bid)
+
+# --- MINIMIZATION ---
+def minimize(pair, cards, auction, bucket):
+    """
+    Shrinks a reproducer while it stays in the same bucket: honours are swapped for the lowest
+    spot card free in the same suit (shape unchanged), then lowered one rank at a time.
+    The result is the plainest hand that still shows the disagreement.
+    """
+    cards = sorted(cards)
+    changed = True
+    while changed:
+        changed = False
+        for c in sorted(cards, key=lambda c: -(c % 13)):
+            if c % 13 < 9:
+                continue  # Only honours carry points
+            suit_base = c - c % 13
+            held = set(cards)
+            for replacement in range(suit_base, c):
+                if replacement in held:
+                    continue
+                trial = sorted((held - {c}) | {replacement})
+                if pair.bucket(both_hands(trial), auction) == bucket:
+                    cards, changed = trial, True
+                break  # Only the lowest free card is tried; lowering further happens next pass
+            if changed:
+                break
+    return cards
+
+# --- WORKERS ---
+_PAIR = None
+
+def _init_worker(flat_system, tree_path, rules_path, tree_system):
+    global _PAIR
+    _PAIR = EnginePair(flat_system, tree_path, rules_path, tree_system)
+
+def _run_chunk(task):
+    """Bids `count` hands (seeded per chunk, so runs are reproducible) at every shared context."""
+    seed, count = task
+    rng = random.Random(seed)
+    pair = _PAIR
+    buckets = {}
+    agree = 0
+    for _ in range(count):
+        cards = deal_cards(rng)
+        hands = both_hands(cards)
+        for auction in pair.contexts:
+            key = pair.bucket(hands, auction)
+            if key is None:
+                agree += 1
+                continue
+            entry = buckets.get(key)
+            if entry is None:
+                entry = buckets[key] = {"count": 0, "auction": auction, "examples": []}
+            entry["count"] += 1
+            if len(entry["examples"]) < EXAMPLES_PER_BUCKET:
+                entry["examples"].append(cards)
+    return agree, buckets
+
+def run(hands, flat_system="SAYC", workers=None, chunk_size=2000, seed=0,
+        tree_path=TREE_FILE, rules_path=RULES_FILE, tree_system=None):
+    """
+    Bids `hands` random hands through both engines at every shared auction context and
+    returns the report dict (buckets sorted by size, each with minimized reproducers).
+    workers=0 runs in this process (handy for tests and profiling). The tree is filtered to
+    `tree_system` (default: TREE_SYSTEMS[flat_system]).
+    """
+    pair = EnginePair(flat_system, tree_path, rules_path, tree_system)
+    tasks = []
+    for i, start in enumerate(range(0, hands, chunk_size)):
+        tasks.append((seed * 1_000_003 + i, min(chunk_size, hands - start)))
+
+    started = time.perf_counter()
+    if workers == 0:
+        global _PAIR
+        _PAIR = pair
+        results = [_run_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(flat_system, tree_path, rules_path, pair.tree_system)) as pool:
+            results = list(pool.map(_run_chunk, tasks))  # map keeps chunk order, so merging is deterministic
+    elapsed = time.perf_counter() - started
+
+    agree, merged = 0, {}
+    for chunk_agree, chunk_buckets in results:
+        agree += chunk_agree
+        for key, entry in chunk_buckets.items():
+            total = merged.setdefault(key, {"count": 0, "auction": entry["auction"], "examples": []})
+            total["count"] += entry["count"]
+            total["examples"].extend(entry["examples"][:EXAMPLES_PER_BUCKET - len(total["examples"])])
+
+    decisions = hands * len(pair.contexts)
+    report = {
+        "flat_system": flat_system,
+        "tree_system": pair.tree_system,
+        "hands": hands,
+        "contexts": [context_text(a) for a in pair.contexts],
+        "flat_only_contexts": [context_text(a) for a in pair.flat_only],
+        "tree_only_contexts": [context_text(a) for a in pair.tree_only],
+        "decisions": decisions,
+        "agreement": round(agree / decisions, 4) if decisions else 1.0,
+        "seconds": round(elapsed, 2),
+        "hands_per_second": round(hands / elapsed) if elapsed else 0,
+        "decisions_per_second": round(decisions * 2 / elapsed) if elapsed else 0,  # Both engines bid each one
+        "buckets": []
+    }
+
+    for (auction_text, tree_bid, flat_bid), entry in sorted(merged.items(), key=lambda kv: (-kv[1]["count"], kv[0])):
+        key = (auction_text, tree_bid, flat_bid)
+        reproducer = minimize(pair, entry["examples"][0], entry["auction"], key)
+        _, _, rule_text = pair.bids(both_hands(reproducer), entry["auction"])
+        report["buckets"].append({
+            "auction": auction_text,
+            "tree_bid": tree_bid,
+            "flat_bid": flat_bid,
+            "flat_rule": rule_text,
+            "count": entry["count"],
+            "share": round(entry["count"] / hands, 4),
+            "reproducer": hand_text(reproducer),
+            "examples": [hand_text(cards) for cards in entry["examples"]]
+        })
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bid random hands through both engines and bucket the disagreements.")
+    parser.add_argument("--hands", type=int, default=100000)
+    parser.add_argument("--system", default="SAYC", help="Flat-rule system to compare with the tree")
+    parser.add_argument("--tree-system", default=None, help="The tree's systems: tag to compare it with (default: see TREE_SYSTEMS)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count, 0 = in-process)")
+    parser.add_argument("--chunk", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=REPORT_FILE)
+    args = parser.parse_args()
+
+    report = run(args.hands, args.system, args.workers, args.chunk, args.seed, tree_system=args.tree_system)
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"✅ {report['hands']:,} hands x {len(report['contexts'])} contexts in {report['seconds']}s "
+          f"({report['hands_per_second']:,} hands/s, {report['decisions_per_second']:,} engine calls/s)")
+    print(f"   Agreement: {report['agreement']:.2%}   Buckets: {len(report['buckets'])}   Report: {args.out}")
+    for b in report["buckets"][:15]:
+        print(f"   {b['count']:>8}  [{b['auction']}] tree {b['tree_bid']:<4} flat {b['flat_bid']:<4}  e.g. {b['reproducer']}")